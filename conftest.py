@@ -1,7 +1,28 @@
+import logging
+import os
+import time
 import pytest
 import allure
 from pathlib import Path
 from playwright.sync_api import sync_playwright
+from pages.base_page import validate_page_locators
+from utilities.account_pool_util import AccountPool
+from utilities.attachment_util import attach_artifact, install_linking_logger, new_file
+from utilities.browser_grid_util import BrowserGrid, parse_endpoints, save_video
+from utilities.browser_pool_util import BrowserPool, parse_browser_list
+from utilities.catalog_util import configure_catalog
+from utilities.dataset_util import get_dataset, parse_sample, parse_shard, sample_rows, shard_range
+from utilities.isolation_util import SharedContexts, isolation_level, isolation_report
+from utilities.launch_profile_util import LAUNCH_PROFILES, launch_profile
+from utilities.log_util import get_logger, set_test_context, start_logging, stop_logging
+from utilities.memory_util import MemoryWatchdog, memory_report, write_memory_report
+from utilities.page_events_util import PageEventBuffer, event_bus
+from utilities.report_util import ShardedHtmlReport
+from utilities.screenshot_util import ScreenshotManager
+from utilities.shard_util import load_durations, plan_shards, read_manifest, save_durations, write_manifest
+from utilities.store_state_util import StoreStates, needs_account, store_state
+from utilities.timeout_util import TIMEOUT_MODES, configure_timeouts, drift_report, save_history, timeout_policy
+from utilities.visual_util import VisualChecker
 
 # ========================================================================
 # PYTEST + PLAYWRIGHT TEST CONFIGURATION FILE
@@ -11,8 +32,34 @@ from playwright.sync_api import sync_playwright
 # 2. Hooks to track test results
 # 3. Fixtures for browser setup and teardown
 # 4. Screenshot, video, and trace attachments to Allure reports
+# 5. Optional lightweight sharded HTML report (--sharded-report)
+# 6. Multi-browser matrix (--browser=chromium,firefox,webkit) in one session
+# 7. Lazy, shardable datasets for data-driven tests (@pytest.mark.dataset)
+# 8. Remote browser grid mode (--browser-endpoint=ws://host:port/,...)
+# 9. Duration-balanced CI sharding (--shard=i/N, --shard-manifest)
+# 10. Worker memory watchdog with browser/driver recycling (reports/memory)
+# 11. Bounded console / page error / failed request capture (attached on failure)
+# 12. Buffered structured logging, one JSONL file per test (reports/logs)
+# 13. Visual regression snapshots for page objects (visual_checker fixture)
+# 14. Cached product catalog index for ProductPage.open deep links (--catalog-ttl)
+# 15. Per-test isolation levels with state leak detection (--isolation, @pytest.mark.isolation)
+# 16. Browser launch profiles lean / debug / realistic (--launch-profile, @pytest.mark.launch_profile)
+# 17. Adaptive page object action timeouts learned from earlier runs (--action-timeouts)
+# 18. Zero-copy Allure attachments (hardlinked or moved into reports/allure-results)
+# 19. Pool of pre-registered accounts leased exclusively per test (account fixture)
+# 20. Named store states restored without UI (@pytest.mark.store_state("logged_in_cart"))
 # ========================================================================
 
+logger = get_logger("conftest")
+
+
+# Allure attachment type for each screenshot format
+SCREENSHOT_ATTACHMENT_TYPES = {
+    "png": allure.attachment_type.PNG,
+    "jpeg": allure.attachment_type.JPG,
+    "webp": "image/webp",
+}
+
 
 # ----------------------------------------------------------------------------
 # STEP 1: ADD COMMAND LINE OPTIONS
@@ -22,12 +69,75 @@ def pytest_addoption(parser):
     Adds command line options for test configuration.
     You can override these when running pytest or store defaults in pytest.ini.
     """
-    parser.addoption("--browser", default="chromium", help="Browser: chromium, firefox, webkit")
-    parser.addoption("--headed", action="store_true", help="Run in headed (visible) mode")
+    parser.addoption("--browser", default="chromium",
+                     help="Browser: chromium, firefox, webkit or a comma separated list, e.g. chromium,firefox,webkit")
+    parser.addoption("--headed", action="store_true", help="Run in headed (visible) mode (overrides the launch profile)")
+    parser.addoption("--launch-profile", default="lean", choices=list(LAUNCH_PROFILES),
+                     help="Browser launch profile: lean (CI), debug (headed) or realistic (full browser, full HD)")
+    parser.addoption("--browser-endpoint", default="",
+                     help="Comma separated ws:// endpoints of Playwright browser servers (remote grid mode)")
     parser.addoption("--base-url", default="https://tutorialsninja.com/demo/", help="Base URL for tests")
     parser.addoption("--video", default="retain-on-failure", help="Record video: on, off, retain-on-failure")
     parser.addoption("--screenshot", default="only-on-failure", help="Take screenshot: on, off, only-on-failure")
     parser.addoption("--tracing", default="retain-on-failure", help="Tracing: on, off, retain-on-failure")
+    parser.addoption("--screenshot-mode", default="viewport",
+                     help="Failure screenshot area: viewport, full-page, locator (only the failing element)")
+    parser.addoption("--screenshot-format", default="png", help="Screenshot format: png, jpeg, webp")
+    parser.addoption("--screenshot-quality", type=int, default=80, help="Quality (0-100) for jpeg/webp screenshots")
+    parser.addoption("--allure-move-videos", action="store_true",
+                     help="Move failure videos into the Allure results instead of linking them (not kept in reports/videos)")
+    parser.addoption("--data-shard", default="",
+                     help="Run only a slice of every dataset: i/N, e.g. 2/4 (rows are split into N ranges)")
+    parser.addoption("--data-sample", default="",
+                     help="Dataset sampling: random:N, stratified:N, failed-first[:N]. Empty = all rows")
+    parser.addoption("--data-seed", type=int, default=1234, help="Seed for dataset sampling (same seed = same rows)")
+    parser.addoption("--data-xdist-chunk", type=int, default=0,
+                     help="With '--dist loadgroup', send ranges of this many rows to the same worker (0 = off)")
+    parser.addoption("--shard", default="",
+                     help="Run only shard i of N of the collected tests, balanced by recorded durations: i/N")
+    parser.addoption("--shard-manifest", default="",
+                     help="Replay exactly the tests listed in a shard manifest (reports/shards/shard-i-of-N.json)")
+    parser.addoption("--store-durations", action="store_true",
+                     help="Save the test durations of this run to the durations file (used by --shard)")
+    parser.addoption("--durations-path", default=".test_durations.json", help="File with recorded test durations")
+    parser.addoption("--memory-limit-worker", type=float, default=0,
+                     help="Warn once when the worker's Python RSS exceeds this many MB (0 = off)")
+    parser.addoption("--memory-limit-browser", type=float, default=0,
+                     help="Recycle the browsers (then the driver) when driver + browser processes exceed this many MB (0 = off)")
+    parser.addoption("--page-events-buffer", type=int, default=200,
+                     help="Console/page error/failed request events kept per test, attached on failure (0 = off)")
+    parser.addoption("--framework-log-level", default="INFO",
+                     help="Framework log level: DEBUG, INFO, WARNING, ERROR (DEBUG = verbose diagnostics)")
+    parser.addoption("--framework-log-dir", default="reports/logs",
+                     help="Folder for the per-test JSONL log files. Empty = no log files")
+    parser.addoption("--framework-log-echo", default="WARNING",
+                     help="Framework log records of this level and above are also shown in the terminal")
+    parser.addoption("--visual-update", action="store_true",
+                     help="Store the screenshots of visual checks as new baselines instead of comparing")
+    parser.addoption("--visual-threshold", type=float, default=0.001,
+                     help="Max share of changed pixels for a visual match (0.001 = 0.1%%)")
+    parser.addoption("--isolation", default="context",
+                     help="Default isolation: context (new context per test), storage-reset (reused context, "
+                          "storage cleared) or page (reused context, new page; read-only tests)")
+    parser.addoption("--catalog-ttl", type=float, default=24,
+                     help="Hours the product catalog index (.catalog_cache/) is reused; 0 = rebuild every run")
+    parser.addoption("--action-timeouts", default="adaptive", choices=TIMEOUT_MODES,
+                     help="Page object action timeouts: adaptive (learned from earlier runs), "
+                          "record (only record durations) or off")
+    parser.addoption("--action-timings-path", default=".timings_cache/action_timings.json",
+                     help="File with the recorded page object action durations")
+    parser.addoption("--action-timeout-multiplier", type=float, default=3.0,
+                     help="Adaptive timeout = p99 of the recorded durations x this multiplier")
+    parser.addoption("--action-timeout-floor", type=float, default=2000,
+                     help="Smallest adaptive timeout in milliseconds")
+    parser.addoption("--action-timeout-ceiling", type=float, default=30000,
+                     help="Largest adaptive timeout in milliseconds (actions without history keep their own timeouts)")
+    parser.addoption("--account-pool-size", type=int, default=0,
+                     help="Accounts in the pool for the account fixture (0 = one per xdist worker)")
+    parser.addoption("--sharded-report", default="",
+                     help="Folder for the lightweight sharded HTML report (e.g. reports/sharded). Empty = disabled")
+    parser.addoption("--report-max-output", type=int, default=4000,
+                     help="Max characters of captured output shown per section in the sharded report")
 
 
 # ----------------------------------------------------------------------------
@@ -53,7 +163,322 @@ def get_config_value(config, option_name):
 
 
 # ----------------------------------------------------------------------------
-# STEP 3: HOOK TO TRACK TEST RESULTS (PASS/FAIL)
+# STEP 3: START LOGGING, VALIDATE SELECTORS AND REGISTER OPTIONAL REPORT PLUGINS
+# ----------------------------------------------------------------------------
+def pytest_configure(config):
+    """
+    Starts the framework logging (every process), validates all page object
+    selectors once and registers the sharded HTML report when --sharded-report
+    is given. With pytest-xdist the last two only happen in the controller process.
+    """
+    start_logging(
+        log_dir=config.getoption("framework_log_dir"),
+        level=config.getoption("framework_log_level"),
+        echo_level=config.getoption("framework_log_echo"),
+        worker=getattr(config, "workerinput", {}).get("workerid", "main"),
+    )
+    configure_catalog(ttl_hours=config.getoption("catalog_ttl"))
+    configure_timeouts(
+        config.getoption("action_timings_path"),
+        mode=config.getoption("action_timeouts"),
+        multiplier=config.getoption("action_timeout_multiplier"),
+        floor_ms=config.getoption("action_timeout_floor"),
+        ceiling_ms=config.getoption("action_timeout_ceiling"),
+    )
+
+    if not hasattr(config, "workerinput"):
+        selector_errors = validate_page_locators()
+        if selector_errors:
+            raise pytest.UsageError("[FAIL] Invalid page object selectors:\n  " + "\n  ".join(selector_errors))
+
+    report_dir = config.getoption("sharded_report")
+    if report_dir and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(
+            ShardedHtmlReport(report_dir, config.getoption("report_max_output")),
+            "sharded_html_report"
+        )
+
+
+def pytest_unconfigure(config):
+    """Writes the remaining queued log records."""
+    stop_logging()
+
+
+def pytest_sessionstart(session):
+    """Allure attachments are hardlinked (or moved) into the results instead of copied."""
+    install_linking_logger(session.config)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    """All log records of a test (setup, call, teardown) share one correlation id."""
+    set_test_context(item.nodeid)
+    yield
+    set_test_context(None)
+
+
+# ----------------------------------------------------------------------------
+# STEP 3b: MULTI-BROWSER MATRIX
+# ----------------------------------------------------------------------------
+# Per-browser durations, filled from test reports (works with pytest-xdist too)
+BROWSER_DURATIONS = {}
+# Per-test durations, saved with --store-durations (see STEP 3d)
+TEST_DURATIONS = {}
+# Per-test memory samples from all workers (see STEP 5b)
+MEMORY_SAMPLES = {}
+# Distinct browser errors of the whole run: signature -> [occurrences, tests]
+PAGE_ERRORS = {}
+# Context setup time and leaks per isolation level (see STEP 7)
+ISOLATION_STATS = {}
+# Page object action durations and adaptive timeout hits of this run (see STEP 8)
+ACTION_TIMINGS = {"samples": {}, "timeouts": {}}
+
+
+def pytest_generate_tests(metafunc):
+    """
+    - Runs every browser test once per browser when --browser has several values.
+      With a single browser the test ids stay unchanged.
+    - Parametrizes @pytest.mark.dataset tests with row ids (see STEP 3c).
+    """
+    if "data_row" in metafunc.fixturenames:
+        generate_dataset_rows(metafunc)
+
+    if "browser_name" not in metafunc.fixturenames:
+        return
+    browsers = parse_browser_list(get_config_value(metafunc.config, "browser"))
+    if len(browsers) > 1:
+        metafunc.parametrize("browser_name", browsers)
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Groups tests by browser so each worker does not switch browser types back
+    and forth. With "--dist loadgroup" all tests of one browser go to one worker.
+    Dataset rows can also be grouped in contiguous ranges (--data-xdist-chunk).
+    Finally keeps only the tests of this CI shard (--shard / --shard-manifest, STEP 3d).
+    """
+    group_dataset_rows(config, items)
+    group_browsers(config, items)
+    select_shard(config, items)
+
+
+def group_browsers(config, items):
+    browsers = parse_browser_list(get_config_value(config, "browser"))
+    if len(browsers) < 2:
+        return
+
+    def browser_of(item):
+        callspec = getattr(item, "callspec", None)
+        return callspec.params.get("browser_name") if callspec else None
+
+    for item in items:
+        if browser_of(item):
+            item.add_marker(pytest.mark.xdist_group(name=browser_of(item)))
+    # Stable sort keeps the original test order inside each browser group
+    items.sort(key=lambda item: browsers.index(browser_of(item)) if browser_of(item) else -1)
+
+
+def pytest_runtest_logreport(report):
+    """Sums test durations per browser and per test (setup + call + teardown)."""
+    TEST_DURATIONS[report.nodeid] = TEST_DURATIONS.get(report.nodeid, 0.0) + report.duration
+    memory = dict(report.user_properties).get("memory")
+    if memory:
+        MEMORY_SAMPLES[report.nodeid] = memory
+    for signature, count in dict(report.user_properties).get("page_errors", {}).items():
+        stats = PAGE_ERRORS.setdefault(signature, [0, 0])
+        stats[0] += count
+        stats[1] += 1
+    isolation = dict(report.user_properties).get("isolation")
+    if isolation:
+        stats = ISOLATION_STATS.setdefault(isolation["level"], {"tests": 0, "setup_ms": 0.0, "leaks": []})
+        stats["tests"] += 1
+        stats["setup_ms"] += isolation["setup_ms"]
+        if isolation["leaks"]:
+            stats["leaks"].append((report.nodeid, isolation["leaks"]))
+    timings = dict(report.user_properties).get("action_timings")
+    if timings:
+        for action, samples in timings["samples"].items():
+            ACTION_TIMINGS["samples"].setdefault(action, []).extend(samples)
+        for action, count in timings["timeouts"].items():
+            ACTION_TIMINGS["timeouts"][action] = ACTION_TIMINGS["timeouts"].get(action, 0) + count
+    browser = dict(report.user_properties).get("browser")
+    if browser:
+        stats = BROWSER_DURATIONS.setdefault(browser, {"tests": 0, "seconds": 0.0})
+        stats["seconds"] += report.duration
+        if report.when == "call":
+            stats["tests"] += 1
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Prints the per-browser duration, memory, page error, isolation and action timeout summaries."""
+    if BROWSER_DURATIONS:
+        terminalreporter.section("per-browser durations")
+        for browser, stats in sorted(BROWSER_DURATIONS.items()):
+            average = stats["seconds"] / stats["tests"] if stats["tests"] else 0.0
+            terminalreporter.write_line(
+                f"{browser:<10} {stats['tests']:>5} tests  {stats['seconds']:>8.2f}s total  {average:>6.2f}s avg"
+            )
+
+    if MEMORY_SAMPLES:
+        report = memory_report(MEMORY_SAMPLES)
+        write_memory_report("reports/memory/memory_report.json", report)
+        terminalreporter.section("memory")
+        terminalreporter.write_line(
+            f"peak worker {report['peak_worker_mb']} MB, peak browser {report['peak_browser_mb']} MB, "
+            f"{len(report['recycles'])} recycles (reports/memory/memory_report.json)"
+        )
+        for grower in report["top_growth"][:5]:
+            terminalreporter.write_line(
+                f"{grower['worker_delta_mb']:>+8.1f} MB worker {grower['browser_delta_mb']:>+8.1f} MB browser  "
+                f"{grower['test']}"
+            )
+
+    if PAGE_ERRORS:
+        terminalreporter.section("page errors")
+        ranked = sorted(PAGE_ERRORS.items(), key=lambda item: (-item[1][0], item[0]))
+        for signature, (count, tests) in ranked[:10]:
+            terminalreporter.write_line(f"{count:>6}x in {tests:>4} tests  {signature}")
+        if len(ranked) > 10:
+            terminalreporter.write_line(f"... {len(ranked) - 10} more distinct errors")
+
+    # Only interesting once a cheaper isolation level is in use
+    if set(ISOLATION_STATS) - {"context"}:
+        terminalreporter.section("isolation")
+        for line in isolation_report(ISOLATION_STATS):
+            terminalreporter.write_line(line)
+
+    drifts = drift_report(timeout_policy(), ACTION_TIMINGS["samples"], ACTION_TIMINGS["timeouts"])
+    if drifts:
+        terminalreporter.section("action timeouts")
+        for line in drifts:
+            terminalreporter.write_line(line)
+
+
+# ----------------------------------------------------------------------------
+# STEP 3c: LAZY, SHARDABLE DATASETS
+# ----------------------------------------------------------------------------
+def generate_dataset_rows(metafunc):
+    """
+    Parametrizes a test marked with @pytest.mark.dataset(path, stratify=...)
+    with row ids only. Rows are read from disk by the data_row fixture when
+    the test runs, so no process ever loads the whole dataset.
+    """
+    marker = metafunc.definition.get_closest_marker("dataset")
+    if marker is None:
+        return
+    config = metafunc.config
+    cache = getattr(config, "cache", None)   # missing with -p no:cacheprovider
+    dataset = get_dataset(marker.args[0], stratify=marker.kwargs.get("stratify"), cache=cache)
+    row_ids = range(len(dataset))
+
+    # Slice for this CI machine
+    shard = parse_shard(config.getoption("data_shard"))
+    if shard:
+        row_ids = shard_range(len(dataset), *shard)
+
+    # Optional sampling for fast smoke runs
+    mode, size = parse_sample(config.getoption("data_sample"))
+    failed_ids = set()
+    if mode == "failed-first" and cache is not None:
+        prefix = f"{metafunc.definition.nodeid}[row"
+        for nodeid in cache.get("cache/lastfailed", {}):
+            if nodeid.startswith(prefix):
+                failed_ids.add(int(nodeid[len(prefix):].split("]")[0].split("-")[0]))
+    selected = sample_rows(list(row_ids), mode, size, config.getoption("data_seed"),
+                           strata=dataset.strata, failed_ids=failed_ids)
+
+    metafunc.parametrize("data_row_id", selected, ids=[f"row{row_id}" for row_id in selected])
+
+
+def group_dataset_rows(config, items):
+    """Sends contiguous ranges of dataset rows to the same xdist worker."""
+    chunk = config.getoption("data_xdist_chunk")
+    if chunk <= 0:
+        return
+    for item in items:
+        callspec = getattr(item, "callspec", None)
+        if callspec and "data_row_id" in callspec.params:
+            row_range = callspec.params["data_row_id"] // chunk
+            item.add_marker(pytest.mark.xdist_group(name=f"{item.originalname}-rows-{row_range}"))
+
+
+@pytest.fixture
+def data_row_id():
+    """Placeholder, replaced by the row ids from generate_dataset_rows."""
+    pytest.fail("data_row needs the test to be marked with @pytest.mark.dataset(path)")
+
+
+@pytest.fixture
+def data_row(request, data_row_id):
+    """Reads the current test's row from the dataset file (dict keyed by column)."""
+    marker = request.node.get_closest_marker("dataset")
+    dataset = get_dataset(marker.args[0], stratify=marker.kwargs.get("stratify"),
+                          cache=getattr(request.config, "cache", None))
+    return dataset.get_row(data_row_id)
+
+
+# ----------------------------------------------------------------------------
+# STEP 3d: DURATION-BALANCED CI SHARDING
+# ----------------------------------------------------------------------------
+def select_shard(config, items):
+    """
+    Keeps only the tests of this CI shard.
+    --shard=i/N           split by recorded durations (utilities/shard_util.py)
+                          and write reports/shards/shard-i-of-N.json
+    --shard-manifest=...  run exactly the tests of an earlier shard manifest
+    Tests marked @pytest.mark.shard_group(name) always stay in the same shard.
+    """
+    manifest_path = config.getoption("shard_manifest")
+    shard = parse_shard(config.getoption("shard"))
+    if not manifest_path and not shard:
+        return
+
+    if manifest_path:
+        manifest = read_manifest(manifest_path)
+        wanted = set(manifest["tests"])
+        missing = wanted - {item.nodeid for item in items}
+        if missing:
+            logger.warning("[WARN] %d tests of %s were not collected", len(missing), manifest_path)
+    else:
+        index, count = shard
+        durations_file = config.getoption("durations_path")
+        groups = {}
+        for item in items:
+            marker = item.get_closest_marker("shard_group")
+            if marker:
+                groups[item.nodeid] = marker.args[0]
+        shards = plan_shards([item.nodeid for item in items], load_durations(durations_file), groups, count)
+        wanted = set(shards[index - 1]["tests"])
+
+        # Every xdist worker computes the same split, only one writes the manifest
+        worker = getattr(config, "workerinput", {}).get("workerid", "gw0")
+        if worker == "gw0":
+            manifest_file = Path("reports/shards") / f"shard-{index}-of-{count}.json"
+            manifest = write_manifest(manifest_file, index, count, shards[index - 1], durations_file)
+            logger.info("[OK] Shard %d/%d: %d tests, ~%ss expected, manifest %s",
+                        index, count, len(wanted), manifest["expected_seconds"], manifest_file)
+
+    deselected = [item for item in items if item.nodeid not in wanted]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in wanted]
+
+
+def pytest_sessionfinish(session):
+    """
+    Saves the durations of this run when --store-durations is given and the
+    page object action durations for the adaptive timeouts (controller only).
+    """
+    if hasattr(session.config, "workerinput"):
+        return
+    if session.config.getoption("store_durations"):
+        save_durations(session.config.getoption("durations_path"), TEST_DURATIONS)
+    if ACTION_TIMINGS["samples"]:
+        save_history(session.config.getoption("action_timings_path"), ACTION_TIMINGS["samples"])
+
+
+# ----------------------------------------------------------------------------
+# STEP 4: HOOK TO TRACK TEST RESULTS (PASS/FAIL)
 # ----------------------------------------------------------------------------
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -67,63 +492,234 @@ def pytest_runtest_makereport(item, call):
 
 
 # ----------------------------------------------------------------------------
-# STEP 4: FIXTURE 1 - BROWSER CONTEXT SETUP
+# STEP 5: SESSION FIXTURE - SCREENSHOT MANAGER (ONE PER WORKER)
+# ----------------------------------------------------------------------------
+@pytest.fixture(scope="session")
+def screenshot_manager(request):
+    """
+    Shared screenshot manager.
+    Writes screenshots from a background thread and stores identical
+    screenshots only once (content-hash deduplication).
+    """
+    manager = ScreenshotManager(
+        output_dir="reports/screenshots",
+        mode=get_config_value(request.config, "screenshot_mode"),
+        image_format=get_config_value(request.config, "screenshot_format"),
+        quality=get_config_value(request.config, "screenshot_quality"),
+    )
+    yield manager
+    manager.close()
+    logger.info(manager.summary())
+
+
+# ----------------------------------------------------------------------------
+# STEP 5b: SESSION FIXTURE - MEMORY WATCHDOG (ONE PER WORKER)
+# ----------------------------------------------------------------------------
+@pytest.fixture(scope="session")
+def memory_watchdog(request):
+    """
+    Samples worker and browser memory after each test (see browser_context).
+    Samples go to reports/memory/timeline-<worker>.jsonl.
+    """
+    watchdog = MemoryWatchdog(
+        output_dir="reports/memory",
+        worker_id=os.environ.get("PYTEST_XDIST_WORKER", "main"),
+        worker_limit_mb=get_config_value(request.config, "memory_limit_worker"),
+        browser_limit_mb=get_config_value(request.config, "memory_limit_browser"),
+    )
+    yield watchdog
+    logger.info(watchdog.summary())
+
+
+# ----------------------------------------------------------------------------
+# STEP 5c: SESSION FIXTURE - VISUAL REGRESSION CHECKER
+# ----------------------------------------------------------------------------
+@pytest.fixture(scope="session")
+def visual_checker(request):
+    """
+    Compares page screenshots with baselines in visual_baselines/<browser>/.
+    Use it through the page objects: HomePage(page).assert_visual_match(visual_checker)
+    """
+    checker = VisualChecker(
+        baseline_dir="visual_baselines",
+        output_dir="reports/visual",
+        update=get_config_value(request.config, "visual_update"),
+        max_diff_ratio=get_config_value(request.config, "visual_threshold"),
+    )
+    yield checker
+    if checker.results:
+        logger.info(checker.write_stats(os.environ.get("PYTEST_XDIST_WORKER", "main")))
+
+
+# ----------------------------------------------------------------------------
+# STEP 6: SESSION FIXTURES - ONE PLAYWRIGHT DRIVER AND BROWSER POOL PER WORKER
+# ----------------------------------------------------------------------------
+@pytest.fixture(scope="session")
+def playwright_driver():
+    """Starts Playwright once per worker and stops it at the end of the session."""
+    playwright = sync_playwright().start()
+    yield playwright
+    playwright.stop()
+
+
+@pytest.fixture(scope="session")
+def browser_pool(request, playwright_driver):
+    """
+    Browsers are launched lazily, the first time a test needs a browser type,
+    and are reused by all following tests of that type.
+    With --browser-endpoint the contexts are created on remote browser servers
+    instead (least loaded healthy server first).
+    """
+    headed_flag = get_config_value(request.config, "headed")
+    endpoints = parse_endpoints(get_config_value(request.config, "browser_endpoint"))
+    if endpoints:
+        worker_id = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+        logger.info("[OK] Remote browser grid: %s", ", ".join(endpoints))
+        pool = BrowserGrid(playwright_driver, endpoints, headless=not headed_flag,
+                           worker_index=int(worker_id.lstrip("gw") or 0))
+    else:
+        pool = BrowserPool(playwright_driver, headless=not headed_flag)
+    yield pool
+    logger.info("[CLEANUP] Closing browsers...")
+    pool.close_all()
+    if pool.playwright is not playwright_driver:
+        pool.playwright.stop()      # driver restarted by the memory watchdog
+
+
+@pytest.fixture(scope="session")
+def shared_contexts(request, browser_pool):
+    """Reused contexts for the storage-reset and page isolation levels (see STEP 7)."""
+    contexts = SharedContexts(browser_pool, base_url=get_config_value(request.config, "base_url"))
+    yield contexts
+    contexts.close_all()
+
+
+@pytest.fixture(scope="session")
+def browser_name(request):
+    """
+    Browser used by the test.
+    Overridden by pytest_generate_tests when several browsers are given.
+    """
+    return parse_browser_list(get_config_value(request.config, "browser"))[0]
+
+
+# ----------------------------------------------------------------------------
+# STEP 6b: ACCOUNT POOL - ONE ACCOUNT PER TEST, SAFE WITH PYTEST-XDIST
+# ----------------------------------------------------------------------------
+@pytest.fixture(scope="session")
+def account_pool(request, browser_pool):
+    """
+    Pre-registered accounts (cached in .account_cache/), only set up when a
+    test uses the account fixture. The pool grows to one account per xdist
+    worker unless --account-pool-size is given.
+    """
+    workerinput = getattr(request.config, "workerinput", {})
+    pool = AccountPool(
+        # Looked up per request: the memory watchdog may have restarted the driver
+        lambda: browser_pool.playwright.request,
+        get_config_value(request.config, "base_url"),
+        size=get_config_value(request.config, "account_pool_size") or workerinput.get("workercount", 1),
+        worker=workerinput.get("workerid", "main"),
+    )
+    pool.ensure_size()
+    return pool
+
+
+@pytest.fixture(scope="function")
+def account(request, account_pool):
+    """
+    An account leased to this test only: {"email", "password", "firstName", ...}.
+    Its cart and wishlist are emptied when the test is done.
+    """
+    leased = account_pool.lease(request.node.nodeid)
+    yield leased
+    account_pool.release(leased)
+
+
+@pytest.fixture(scope="session")
+def store_states(request):
+    """Restores the named store states of @pytest.mark.store_state (session snapshots per account)."""
+    return StoreStates(get_config_value(request.config, "base_url"))
+
+
+# ----------------------------------------------------------------------------
+# STEP 7: FIXTURE 1 - BROWSER CONTEXT SETUP
 # ----------------------------------------------------------------------------
 @pytest.fixture(scope="function")
-def browser_context(request):
+def browser_context(request, browser_pool, browser_name, memory_watchdog, shared_contexts):
     """
     Creates and manages the Playwright browser context.
-    - Reads configuration (browser, headed mode, video settings)
-    - Starts the Playwright browser
+    - Reads configuration (headed mode, video settings)
+    - Gets the browser from the shared pool (launched once per worker)
+      or from the remote browser grid
     - Enables video recording if configured
+    - Launch profile (--launch-profile or @pytest.mark.launch_profile): browser
+      launch args, viewport, scale factor, reduced motion, animations
+    - Isolation level (--isolation or @pytest.mark.isolation): a new context
+      (default) or a shared one that is reset / checked for leaked state
+    - Store state (@pytest.mark.store_state): logged in / cart filled without
+      any UI, always in a new context
     - Cleans up automatically after each test
+    - Samples memory and recycles the browsers when a memory limit is crossed
     """
     # Read configuration values
-    browser_name = get_config_value(request.config, "browser")
     headed_flag = get_config_value(request.config, "headed")
     video_option = get_config_value(request.config, "video")
 
-    print(f"[OK] Starting browser: {browser_name}")
-    print(f"[OK] Headless mode: {not headed_flag} (headed={headed_flag})")
+    profile = launch_profile(request.node, get_config_value(request.config, "launch_profile"))
 
-    # Start Playwright
-    playwright = sync_playwright().start()
+    logger.info("[OK] Starting browser: %s (launch profile: %s)", browser_name, profile)
+    logger.info("[OK] Headless mode: %s (headed=%s)", LAUNCH_PROFILES[profile]["headless"] and not headed_flag, headed_flag)
+    request.node.user_properties.append(("browser", browser_name))
 
-    # Launch the specified browser
-    if browser_name.lower() == "chromium":
-        browser = playwright.chromium.launch(headless=not headed_flag)
-    elif browser_name.lower() == "firefox":
-        browser = playwright.firefox.launch(headless=not headed_flag)
-    elif browser_name.lower() == "webkit":
-        browser = playwright.webkit.launch(headless=not headed_flag)
+    # Create a browser context (optionally with video recording), or reuse the shared one.
+    # In grid mode the directory is on the browser server, the page fixture downloads the video
+    context_options = {"record_video_dir": "reports/videos"} if video_option in ["on", "retain-on-failure"] else {}
+    state = store_state(request.node)
+    level = "context" if state else isolation_level(request.node, get_config_value(request.config, "isolation"))
+    start = time.perf_counter()
+    if level == "context":
+        context = browser_pool.new_context(browser_name, profile=profile, **context_options)
     else:
-        raise ValueError(f"[FAIL] Unsupported browser: {browser_name}")
-
-    # Create a browser context (optionally with video recording)
-    if video_option in ["on", "retain-on-failure"]:
-        context = browser.new_context(record_video_dir="reports/videos")
-    else:
-        context = browser.new_context()
+        context = shared_contexts.acquire(browser_name, level, profile=profile, **context_options)
+    if state:
+        account = request.getfixturevalue("account") if needs_account(state) else None
+        request.getfixturevalue("store_states").restore(context, state, account)
+    setup_ms = (time.perf_counter() - start) * 1000
 
     # Yield the context for use in tests
     yield context
 
-    # Clean up after the test
-    print("[CLEANUP] Closing browser context and stopping Playwright...")
-    context.close()
-    browser.close()
-    playwright.stop()
+    # Clean up after the test (the browser itself stays open for the next test)
+    if level == "context":
+        logger.info("[CLEANUP] Closing browser context...")
+        context.close()
+        leaks = []
+    else:
+        logger.info("[CLEANUP] Releasing shared browser context (%s)...", level)
+        leaks = shared_contexts.release(browser_name, level, request.node.nodeid, profile=profile)
+    request.node.user_properties.append(("isolation", {"level": level, "setup_ms": round(setup_ms, 1), "leaks": leaks}))
+
+    # Memory growth of this test (reported to the controller with the teardown report)
+    sample = memory_watchdog.after_test(request.node.nodeid)
+    if sample:
+        if sample["action"]:
+            sample["action"] = memory_watchdog.recycle(browser_pool, sample["action"])
+        request.node.user_properties.append(("memory", sample))
 
 
 # ----------------------------------------------------------------------------
-# STEP 5: FIXTURE 2 - PAGE CREATION AND TEST ARTIFACT MANAGEMENT
+# STEP 8: FIXTURE 2 - PAGE CREATION AND TEST ARTIFACT MANAGEMENT
 # ----------------------------------------------------------------------------
 @pytest.fixture(scope="function")
-def page(request, browser_context):
+def page(request, browser_pool, browser_context, screenshot_manager):
     """
     Creates a new browser page for each test.
     - Navigates to the base URL
     - Starts tracing (if enabled)
+    - Records console messages, page errors and failed requests in a small ring buffer
+    - Creates the page's event bus (page objects subscribe to dialogs etc. there)
+    - Reports the page object action durations of the test (adaptive timeouts)
     - Captures screenshots, traces, and videos for failed tests
     - Attaches all artifacts to Allure report
     """
@@ -132,16 +728,20 @@ def page(request, browser_context):
     screenshot_option = get_config_value(request.config, "screenshot")
     tracing_option = get_config_value(request.config, "tracing")
     video_option = get_config_value(request.config, "video")
+    events_buffer = get_config_value(request.config, "page_events_buffer")
 
-    print(f"[INFO] Navigating to: {base_url}")
+    logger.info("[INFO] Navigating to: %s", base_url)
 
     # Start tracing if enabled
     if tracing_option in ["on", "retain-on-failure"]:
-        print("[TRACE] Tracing enabled - capturing screenshots and actions")
+        logger.info("[TRACE] Tracing enabled - capturing screenshots and actions")
+        # sources=True also records the call stacks used by utilities/trace_analytics_util.py
         browser_context.tracing.start(screenshots=True, snapshots=True, sources=True)
 
     # Create and navigate to base URL
     page = browser_context.new_page()
+    events = event_bus(page)
+    page_events = PageEventBuffer(page, capacity=events_buffer) if events_buffer > 0 else None
     page.goto(base_url)
 
     # Yield the page to the test
@@ -153,13 +753,48 @@ def page(request, browser_context):
     test_name = request.node.name
     test_failed = hasattr(request.node, "rep_call") and request.node.rep_call.failed
 
-    print(f"[RESULT] Test '{test_name}' result: {'[FAIL]' if test_failed else '[PASS]'}")
+    logger.log(logging.ERROR if test_failed else logging.INFO,
+               "[RESULT] Test '%s' result: %s", test_name, "[FAIL]" if test_failed else "[PASS]")
+
+    # Page object action durations go to the controller, which updates the timings file
+    timings = timeout_policy().drain()
+    if timings["samples"] or timings["timeouts"]:
+        request.node.user_properties.append(("action_timings", timings))
+
+    # Capture screenshot first (fast, returns bytes); the file is written in the
+    # background while the trace and video are being saved
+    screenshot_job = None
+    if test_failed and screenshot_option in ["on", "only-on-failure"]:
+        screenshot_job = screenshot_manager.capture(
+            page, test_name, failure_text=request.node.rep_call.longreprtext
+        )
+
+    # Browser events: distinct errors go to the suite summary, the buffer only on failure
+    if page_events:
+        page_events.detach()
+        if page_events.errors:
+            request.node.user_properties.append(("page_errors", dict(page_events.errors)))
+        if test_failed:
+            allure.attach(
+                page_events.to_text(),
+                name=f"{test_name}_page_events",
+                attachment_type=allure.attachment_type.TEXT
+            )
+            logger.info("[ATTACH] Page events attached to Allure report")
+
+    # Handlers still subscribed by page objects / the test (growing counts point to a listener leak)
+    listeners = events.listener_counts()
+    if listeners:
+        logger.info("[EVENTS] Listeners subscribed at teardown: %s", listeners)
+    events.close()
 
     # Save and attach trace
     if tracing_option in ["on", "retain-on-failure"]:
         trace_path = f"reports/traces/{test_name}_trace.zip"
-        browser_context.tracing.stop(path=trace_path)
-        print(f"[SAVE] Trace saved: {trace_path}")
+        with new_file(trace_path) as tmp_path:
+            browser_context.tracing.stop(path=tmp_path)
+        request.node.user_properties.append(("artifact", trace_path))
+        logger.info("[SAVE] Trace saved: %s", trace_path)
 
         # Attach trace to Allure report if test failed
         # Currently ZIP file is not supported to attach in Allure reports
@@ -169,29 +804,39 @@ def page(request, browser_context):
         #         name=f"{test_name}_trace",
         #         attachment_type=allure.attachment_type.ZIP
         #     )
-        #     print("[ATTACH] Trace attached to Allure report")
+        #     logger.info("[ATTACH] Trace attached to Allure report")
 
-    # Take screenshot if test failed
-    if test_failed and screenshot_option in ["on", "only-on-failure"]:
-        screenshot_path = f"reports/screenshots/{test_name}.png"
-        page.screenshot(path=screenshot_path)
-        print(f"[SAVE] Screenshot saved: {screenshot_path}")
+    # Attach screenshot once the background write is done
+    if screenshot_job:
+        shot = screenshot_job.result()
+        request.node.user_properties.append(("artifact", shot["path"]))
+        logger.info("[SAVE] Screenshot saved: %s (%s, %.1f KB, capture %s ms%s)", shot["path"], shot["mode"],
+                    shot["bytes"] / 1024, shot["capture_ms"], ", duplicate" if shot["duplicate"] else "")
 
-        # Attach to Allure report
-        allure.attach.file(
-            screenshot_path,
+        # Hardlinked into the Allure results, the file is not written again
+        attach_artifact(
+            shot["path"],
             name=f"{test_name}_screenshot",
-            attachment_type=allure.attachment_type.PNG
+            attachment_type=SCREENSHOT_ATTACHMENT_TYPES[shot["extension"]],
+            extension=shot["extension"]
         )
-        print("[ATTACH] Screenshot attached to Allure report")
+        logger.info("[ATTACH] Screenshot attached to Allure report")
 
     # Attach video if available and test failed
     if test_failed and video_option in ["on", "retain-on-failure"]:
-        video_path = page.video.path() if page.video else None
+        # Closing the page finishes the video file
+        page.close()
+        if isinstance(browser_pool, BrowserGrid):
+            # Recorded on the browser server (video.path() raises there): download it
+            video_path = save_video(page, f"reports/videos/{test_name}.webm")
+        else:
+            video_path = page.video.path() if page.video else None
         if video_path and Path(video_path).exists():
-            allure.attach.file(
+            video_path = attach_artifact(
                 video_path,
                 name=f"{test_name}_video",
-                attachment_type=allure.attachment_type.WEBM
+                attachment_type=allure.attachment_type.WEBM,
+                move=get_config_value(request.config, "allure_move_videos")
             )
-            print("[ATTACH] Video attached to Allure report")
\ No newline at end of file
+            request.node.user_properties.append(("artifact", video_path))
+            logger.info("[ATTACH] Video attached to Allure report: %s", video_path)
\ No newline at end of file
@@ -0,0 +1,487 @@
+# This module contains the building blocks shared by all page objects.
+#
+# Locators are declared once at class level with PageLocator. The Playwright
+# locator is only created the first time it is used and is then cached on the
+# page object, so creating a page object is practically free. Page objects use
+# __slots__, which keeps every instance small.
+#
+# Example:
+#     class LoginPage(BasePage):
+#         __slots__ = ()
+#         txt_email_address = PageLocator('#input-email')
+#         lnk_logout = PageLocator("text='Logout'", nth=1)
+#
+# Every page class gets its own logger (self.log, e.g. "pages.LoginPage"), so
+# log lines show which page object step wrote them.
+#
+# Public page object methods are timed actions (utilities/timeout_util.py):
+# each one runs with a timeout learned from its own history. Pure getters that
+# only return a locator are marked with @untimed and are not timed. Visibility
+# checks get the same adaptive timeout through expect_visible(locator), timed
+# per calling function:
+#     login_page.expect_visible(login_page.get_login_error(), timeout=3000)
+
+import functools
+import importlib
+import inspect
+import pkgutil
+import re
+import sys
+
+from playwright.sync_api import Locator, Page, expect
+
+from utilities.log_util import get_logger
+from utilities.page_events_util import PageEventBus, event_bus
+from utilities.timeout_util import timeout_policy
+
+
+# ========================================================================
+# LOCATOR DESCRIPTOR
+# ========================================================================
+
+class PageLocator:
+    """Class-level locator declaration, resolved lazily per page object."""
+
+    def __init__(self, selector: str, has_text: str = None, nth: int = None):
+        self.selector = selector
+        self.has_text = has_text
+        self.nth = nth
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        # Accessed on the class (e.g. for validation): return the declaration itself
+        if instance is None:
+            return self
+        cache = instance._locators
+        locator = cache.get(self.name)
+        if locator is None:
+            locator = self.resolve(instance.page)
+            cache[self.name] = locator
+        return locator
+
+    def __set__(self, instance, value):
+        raise AttributeError(f"Locator '{self.name}' is declared on the class and cannot be replaced")
+
+    def resolve(self, page: Page):
+        """Build the Playwright locator for the given page."""
+        if self.has_text is not None:
+            locator = page.locator(self.selector, has_text=self.has_text)
+        else:
+            locator = page.locator(self.selector)
+        if self.nth is not None:
+            locator = locator.nth(self.nth)
+        return locator
+
+    @property
+    def is_plain_css(self) -> bool:
+        """True when the browser's own querySelector understands the selector."""
+        if self.has_text is not None or self.nth is not None or ">>" in self.selector:
+            return False
+        if self.selector.startswith(("text=", "xpath=", "//", "(//", "css=", "id=")):
+            return False
+        unquoted = QUOTED_PATTERN.sub('""', self.selector)
+        return not any(pseudo.lower() in PLAYWRIGHT_PSEUDO_CLASSES for pseudo in PSEUDO_PATTERN.findall(unquoted))
+
+    def __repr__(self):
+        return f"PageLocator({self.selector!r}, has_text={self.has_text!r}, nth={self.nth!r})"
+
+
+# ========================================================================
+# BASE PAGE
+# ========================================================================
+
+class ServerConfirmationError(AssertionError):
+    """Raised when the server response to a page action reports a failure."""
+
+    def __init__(self, route: str, reason: str, payload=None):
+        self.route = route
+        self.payload = payload
+        super().__init__(f"[FAIL] {route}: {reason}. Response: {payload}")
+
+
+def route_matches(url: str, route: str) -> bool:
+    """
+    True when the URL calls the given OpenCart route.
+    OpenCart 3 uses "route=checkout/cart/add", OpenCart 4 "route=checkout/cart.add"
+    (or "|add"), so the last separator may be "/", "." or "|".
+    """
+    head, _, action = route.rpartition("/")
+    pattern = rf"[?&]route={re.escape(head)}[/.|]{re.escape(action)}(&|$)" if head else rf"[?&]route={re.escape(route)}(&|$)"
+    return re.search(pattern, url.replace("%2F", "/").replace("%7C", "|")) is not None
+
+
+# Sets all fields in one go and returns the names of fields it could not set.
+# Before that it starts watching the dependent selects (see DEPENDENT_FIELDS)
+# for the option reload their parent's change event triggers.
+FILL_FORM_JS = """
+({fields, watch}) => {
+    window.__fillFormReloads = watch.map(selector => new Promise(resolve => {
+        const el = document.querySelector(selector);
+        if (!el) { resolve(false); return; }
+        const observer = new MutationObserver(() => { observer.disconnect(); resolve(true); });
+        observer.observe(el, {childList: true});
+    }));
+    const notSet = [];
+    const fire = (el, type) => el.dispatchEvent(new Event(type, {bubbles: true}));
+    for (const field of fields) {
+        const el = document.querySelector(field.selector);
+        if (!el || el.disabled) { notSet.push(field.name); continue; }
+        if (typeof field.value === 'boolean') {
+            if (el.checked !== field.value) { el.click(); }
+            continue;
+        }
+        if (el.tagName === 'SELECT') {
+            const wanted = String(field.value).trim();
+            const option = Array.from(el.options).find(o => o.text.trim() === wanted || o.value === wanted);
+            if (!option) { notSet.push(field.name); continue; }
+            el.focus();
+            el.value = option.value;
+            fire(el, 'input');
+            fire(el, 'change');
+            continue;
+        }
+        const proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, String(field.value));
+        fire(el, 'input');
+        fire(el, 'change');
+        el.dispatchEvent(new FocusEvent('blur'));
+    }
+    return notSet;
+}
+"""
+
+# Waits until every watched select got its new options (false after the timeout).
+WAIT_FOR_RELOADS_JS = """
+timeout => Promise.race([
+    Promise.all(window.__fillFormReloads || []).then(done => done.every(Boolean)),
+    new Promise(resolve => setTimeout(() => resolve(false), timeout)),
+])
+"""
+
+
+def timed_action(method):
+    """Run a page object method as a timed action named "<PageClass>.<method>"."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with timeout_policy().action(self.page, f"{type(self).__name__}.{method.__name__}"):
+            return method(self, *args, **kwargs)
+    wrapper.timed_action = True
+    return wrapper
+
+
+def untimed(method):
+    """
+    Keep a public page object method out of the timed actions: for pure
+    getters that only return a locator and never touch the page.
+    """
+    method.untimed = True
+    return method
+
+
+def _time_actions(cls, names=None):
+    for name, value in list(vars(cls).items()):
+        if names is not None and name not in names:
+            continue
+        if name.startswith("_") or not inspect.isfunction(value):
+            continue
+        if not getattr(value, "timed_action", False) and not getattr(value, "untimed", False):
+            setattr(cls, name, timed_action(value))
+
+
+class BasePage:
+    """Base class for all page objects."""
+
+    __slots__ = ("page", "_locators")
+
+    log = get_logger("pages.BasePage")
+
+    # Header cart button ("1 item(s) - $122.00"), shown on every page
+    btn_header_cart = PageLocator("#cart > button")
+
+    # Locator names masked in visual snapshots (dynamic regions: prices, carousels...)
+    VISUAL_MASKS = ("btn_header_cart",)
+
+    # Selects whose options the page reloads when another field changes:
+    # {dependent locator name: parent locator name}, see fill_form()
+    DEPENDENT_FIELDS = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.log = get_logger(f"pages.{cls.__name__}")
+        _time_actions(cls)
+
+    def __init__(self, page: Page):
+        self.page = page
+        self._locators = {}
+
+    @property
+    def events(self) -> PageEventBus:
+        """
+        Event bus of the page: subscribe handlers here instead of page.on(),
+        e.g. "with self.events.accept_next_dialog(): ...".
+        """
+        return event_bus(self.page)
+
+    # ===== Batched Form Filling =====
+
+    def fill_form(self, values: dict, keystroke_fields=()) -> dict:
+        """
+        Fill many form fields with a single in-page evaluation.
+
+        values maps locator names to values:
+            - str  -> text input / textarea value, or option label/value for <select>
+            - bool -> checkbox / radio checked state
+        The right input/change events are dispatched so the page's JavaScript
+        still reacts. Fields that need real keystrokes (keystroke_fields) or use
+        Playwright-only selectors fall back to normal Playwright actions, in the
+        original order. A dependent select (DEPENDENT_FIELDS, e.g. the state
+        dropdown reloaded over AJAX when the country changes) whose parent is
+        filled too is set last, after its options were reloaded: a reload
+        would overwrite a value set in the same batch.
+
+        Example:
+            checkout_page.fill_form({"txt_first_name": "John", "drp_country": "India",
+                                     "drp_state": "Goa", "chkbox_terms": True})
+
+        :return: {"batched": [...names...], "fallback": [...names...]}
+        """
+        declarations = self.declared_locators()
+        unknown = [name for name in values if name not in declarations]
+        if unknown:
+            raise KeyError(f"Unknown locator(s) on {type(self).__name__}: {', '.join(unknown)}")
+
+        dependents = [name for name in values if self.DEPENDENT_FIELDS.get(name) in values]
+        batch = [
+            {"name": name, "selector": declarations[name].selector, "value": value}
+            for name, value in values.items()
+            if name not in keystroke_fields and name not in dependents and declarations[name].is_plain_css
+        ]
+        watch = [declarations[name].selector for name in dependents if declarations[name].is_plain_css]
+        not_set = set()
+        if batch or watch:
+            not_set = set(self.page.evaluate(FILL_FORM_JS, {"fields": batch, "watch": watch}))
+        batched = [field["name"] for field in batch if field["name"] not in not_set]
+
+        fallback = [name for name in values if name not in batched and name not in dependents]
+        for name in fallback:
+            self._fill_field(name, values[name], name in keystroke_fields)
+        if dependents:
+            reloaded = self.page.evaluate(WAIT_FOR_RELOADS_JS, timeout_policy().current_timeout(10000)) if watch else True
+            if not reloaded:
+                self.log.warning("fill_form: options of %s were not reloaded, setting them anyway", dependents)
+            for name in dependents:
+                self._fill_field(name, values[name], name in keystroke_fields)
+            fallback += dependents
+        self.log.debug("fill_form: %d fields batched, fallback for %s", len(batched), fallback)
+        return {"batched": batched, "fallback": fallback}
+
+    def _fill_field(self, name: str, value, keystrokes: bool = False):
+        """Set one field with regular Playwright actions (the slow but exact path)."""
+        locator = getattr(self, name)
+        if isinstance(value, bool):
+            locator.set_checked(value)
+        elif locator.evaluate("el => el.tagName") == "SELECT":
+            try:
+                locator.select_option(label=value, timeout=5000)
+            except Exception:
+                locator.select_option(value=value)
+        elif keystrokes:
+            locator.fill("")
+            locator.press_sequentially(str(value))
+        else:
+            locator.fill(str(value))
+
+    # ===== Network Confirmations =====
+
+    def click_and_confirm(self, locator, route: str, dom_check=None, timeout: int = None) -> dict:
+        """
+        Click an element and wait for the AJAX call it triggers instead of
+        polling the DOM for a banner or the next panel.
+
+        :param locator: element to click
+        :param route: OpenCart route of the expected request, e.g. "checkout/cart/add"
+        :param dom_check: optional locator that must also become visible (secondary check)
+        :param timeout: max wait for the response in milliseconds
+                        (default: the adaptive timeout of the calling action, else 10 s)
+        :return: JSON payload returned by the server
+        :raises ServerConfirmationError: HTTP error or an "error"/"redirect" payload
+        """
+        timeout = timeout or timeout_policy().current_timeout(10000)
+        with self.page.expect_response(lambda response: route_matches(response.url, route),
+                                       timeout=timeout) as response_info:
+            locator.click()
+        response = response_info.value
+        self.log.debug("click_and_confirm: %s -> HTTP %s", route, response.status)
+
+        try:
+            payload = response.json()
+        except Exception:
+            payload = {}
+        if not response.ok:
+            raise ServerConfirmationError(route, f"HTTP {response.status}", payload)
+        if isinstance(payload, dict) and ("error" in payload or "redirect" in payload):
+            raise ServerConfirmationError(route, "server rejected the request", payload)
+
+        if dom_check is not None:
+            expect(dom_check).to_be_visible(timeout=timeout)
+        return payload
+
+    # ===== Assertions =====
+
+    def expect_visible(self, locator: Locator, timeout: float = None):
+        """
+        Assert that an element is visible, with the adaptive timeout of this check
+        (timed as "<PageClass>.expect_visible:<calling function>").
+
+        :param timeout: timeout in milliseconds until the check has enough history
+                        (default: the expect() timeout)
+
+        Example (in test_invalid_userlogin, timed as "LoginPage.expect_visible:test_invalid_userlogin"):
+            login_page.expect_visible(login_page.get_login_error(), timeout=3000)
+        """
+        caller = sys._getframe(1).f_code.co_name
+        with timeout_policy().action(self.page, f"{type(self).__name__}.expect_visible:{caller}"):
+            expect(locator).to_be_visible(timeout=timeout_policy().current_timeout(timeout))
+
+    # ===== Visual Snapshots =====
+
+    def assert_visual_match(self, visual_checker, name: str = None, full_page: bool = False) -> dict:
+        """
+        Compare a screenshot of this page with its baseline (utilities/visual_util.py).
+        The regions listed in VISUAL_MASKS are masked. The first run stores the baseline.
+
+        :return: comparison result (status, decision path, diff ratio, timings)
+        """
+        masks = [getattr(self, locator_name) for locator_name in self.VISUAL_MASKS]
+        result = visual_checker.check(self.page, name or type(self).__name__, mask=masks, full_page=full_page)
+        assert result["status"] != "mismatch", (
+            f"[FAIL] Visual mismatch for {result['name']}: {result['diff_ratio']:.4%} of pixels changed "
+            f"({result['path']}), see {visual_checker.output_dir / result['name']}-diff.png"
+        )
+        return result
+
+    @classmethod
+    def declared_locators(cls) -> dict:
+        """Return all PageLocator declarations of this page (including parents)."""
+        locators = {}
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if isinstance(value, PageLocator):
+                    locators[name] = value
+        return locators
+
+
+# The shared actions are timed per page class, e.g. "CheckoutPage.fill_form"
+_time_actions(BasePage, ("fill_form", "click_and_confirm", "assert_visual_match"))
+
+
+# ========================================================================
+# SELECTOR VALIDATION (runs once at collection time)
+# ========================================================================
+
+# Pseudo-classes only Playwright understands (document.querySelector does not)
+PLAYWRIGHT_PSEUDO_CLASSES = {
+    "has-text", "text", "text-is", "text-matches", "visible", "nth-match",
+    "left-of", "right-of", "above", "below", "near",
+}
+# Standard CSS pseudo-classes plus the ones Playwright adds
+KNOWN_PSEUDO_CLASSES = {
+    "active", "checked", "disabled", "empty", "enabled", "first-child", "first-of-type",
+    "focus", "focus-within", "has", "hover", "is", "last-child", "last-of-type", "link",
+    "not", "nth-child", "nth-last-child", "nth-of-type", "nth-last-of-type", "only-child",
+    "only-of-type", "optional", "read-only", "required", "root", "scope", "target",
+    "visited", "where", "before", "after",
+} | PLAYWRIGHT_PSEUDO_CLASSES
+PSEUDO_PATTERN = re.compile(r":{1,2}([a-zA-Z][a-zA-Z-]*)")
+QUOTED_PATTERN = re.compile(r"\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*'")
+BRACKET_PAIRS = {")": "(", "]": "["}
+
+
+def _check_balanced(selector: str):
+    """Return an error message if quotes or brackets are not balanced."""
+    stack = []
+    quote = None
+    escaped = False
+    for char in selector:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in "([":
+            stack.append(char)
+        elif char in ")]":
+            if not stack or stack.pop() != BRACKET_PAIRS[char]:
+                return f"unbalanced '{char}'"
+    if quote:
+        return f"unterminated string ({quote})"
+    if stack:
+        return f"unclosed '{stack[-1]}'"
+    return None
+
+
+def check_selector(selector: str) -> list:
+    """
+    Check that a Playwright selector parses.
+    Returns a list of problems (empty list = selector looks valid).
+    """
+    if not selector or not selector.strip():
+        return ["empty selector"]
+
+    problems = []
+    balance_error = _check_balanced(selector)
+    if balance_error:
+        problems.append(balance_error)
+
+    if selector.startswith("text="):
+        if not selector[len("text="):].strip():
+            problems.append("empty text= selector")
+    elif selector.startswith(("xpath=", "//", "(//", "..")):
+        pass  # only the balance check applies to XPath
+    else:
+        # CSS (with Playwright extensions): every pseudo-class must be known
+        unquoted = QUOTED_PATTERN.sub('""', selector)
+        for pseudo in PSEUDO_PATTERN.findall(unquoted):
+            if pseudo.lower() not in KNOWN_PSEUDO_CLASSES:
+                problems.append(f"unknown pseudo-class ':{pseudo}'")
+    return problems
+
+
+def import_page_modules(package_name: str = "pages"):
+    """Import every module of the pages package so all page classes are registered."""
+    package = importlib.import_module(package_name)
+    for module_info in pkgutil.iter_modules(package.__path__):
+        importlib.import_module(f"{package_name}.{module_info.name}")
+
+
+def all_page_classes(base=BasePage) -> list:
+    """Return every subclass of BasePage (recursively)."""
+    classes = []
+    for subclass in base.__subclasses__():
+        classes.append(subclass)
+        classes.extend(all_page_classes(subclass))
+    return classes
+
+
+def validate_page_locators() -> list:
+    """
+    Check every declared locator of every page object.
+    Returns a list of readable error lines.
+    """
+    import_page_modules()
+    errors = []
+    for page_class in all_page_classes():
+        for name, declaration in page_class.declared_locators().items():
+            problems = check_selector(declaration.selector)
+            if declaration.nth is not None and not isinstance(declaration.nth, int):
+                problems.append(f"nth must be an int, got {declaration.nth!r}")
+            for problem in problems:
+                errors.append(f"{page_class.__name__}.{name} = {declaration.selector!r}: {problem}")
+    return errors
@@ -3,39 +3,60 @@
 # locators and methods (actions) clearly.
 
 from playwright.sync_api import Page, expect
+from pages.base_page import BasePage, PageLocator, untimed
+from utilities.page_events_util import accept_dialog
 
+# OpenCart AJAX routes called by the checkout "Continue" buttons
+CHECKOUT_ROUTES = {
+    "billing_address": "checkout/payment_address/save",
+    "delivery_address": "checkout/shipping_address/save",
+    "delivery_method": "checkout/shipping_method/save",
+    "payment_method": "checkout/payment_method/save",
+}
 
-class CheckoutPage:
+
+class CheckoutPage(BasePage):
     """Page Object Model class for the Checkout Page."""
 
-    def __init__(self, page: Page):
+    __slots__ = ()
+
+    # ===== Locators =====
+    # These identify the web elements we want to interact with on the page.
+    radio_guest = PageLocator('input[value="guest"]')
+    btn_continue = PageLocator('#button-account')
+    txt_first_name = PageLocator('#input-payment-firstname')
+    txt_last_name = PageLocator('#input-payment-lastname')
+    txt_address1 = PageLocator('#input-payment-address-1')
+    txt_address2 = PageLocator('#input-payment-address-2')
+    txt_city = PageLocator('#input-payment-city')
+    txt_pin = PageLocator('#input-payment-postcode')
+    drp_country = PageLocator('#input-payment-country')
+    drp_state = PageLocator('#input-payment-zone')
+    btn_continue_billing_address = PageLocator('#button-payment-address')
+    btn_continue_delivery_address = PageLocator('#button-shipping-address')
+    txt_delivery_method = PageLocator('textarea[name="comment"]')
+    btn_continue_shipping_address = PageLocator('#button-shipping-method')
+    chkbox_terms = PageLocator('input[name="agree"]')
+    btn_continue_payment_method = PageLocator('#button-payment-method')
+    lbl_total_price = PageLocator('strong:has-text("Total:") + td')
+    btn_conf_order = PageLocator('#button-confirm')
+    lbl_order_con_msg = PageLocator('#content h1')
+
+    # The zone options are reloaded over AJAX when the country changes
+    DEPENDENT_FIELDS = {"drp_state": "drp_country"}
+
+    # ===== Deep Link =====
+
+    def open(self, base_url: str = None) -> "CheckoutPage":
         """
-        Constructor that initializes the Playwright Page object
-        and defines all the locators used on the Checkout page.
+        Open the checkout directly. The cart must not be empty, e.g. start the
+        test with @pytest.mark.store_state("guest_cart").
+
+        :param base_url: shop base URL; defaults to the one of the current page
         """
-        self.page = page
-
-        # ===== Locators =====
-        # These identify the web elements we want to interact with on the page.
-        self.radio_guest = page.locator('input[value="guest"]')
-        self.btn_continue = page.locator('#button-account')
-        self.txt_first_name = page.locator('#input-payment-firstname')
-        self.txt_last_name = page.locator('#input-payment-lastname')
-        self.txt_address1 = page.locator('#input-payment-address-1')
-        self.txt_address2 = page.locator('#input-payment-address-2')
-        self.txt_city = page.locator('#input-payment-city')
-        self.txt_pin = page.locator('#input-payment-postcode')
-        self.drp_country = page.locator('#input-payment-country')
-        self.drp_state = page.locator('#input-payment-zone')
-        self.btn_continue_billing_address = page.locator('#button-payment-address')
-        self.btn_continue_delivery_address = page.locator('#button-shipping-address')
-        self.txt_delivery_method = page.locator('textarea[name="comment"]')
-        self.btn_continue_shipping_address = page.locator('#button-shipping-method')
-        self.chkbox_terms = page.locator('input[name="agree"]')
-        self.btn_continue_payment_method = page.locator('#button-payment-method')
-        self.lbl_total_price = page.locator('strong:has-text("Total:") + td')
-        self.btn_conf_order = page.locator('#button-confirm')
-        self.lbl_order_con_msg = page.locator('#content h1')
+        base_url = base_url or self.page.url.split("index.php")[0].split("?")[0]
+        self.page.goto(f"{base_url.rstrip('/')}/index.php?route=checkout/checkout")
+        return self
 
     # ===== Page Validation Methods =====
 
@@ -44,7 +65,7 @@ class CheckoutPage:
         try:
             return self.page.title()
         except Exception as e:
-            print(f" Exception while getting Checkout page title: {e}")
+            self.log.error("Exception while getting Checkout page title: %s", e)
             return None
 
     # ===== Checkout Option =====
@@ -57,7 +78,7 @@ class CheckoutPage:
             if checkout_option.lower() == "guest checkout":
                 self.radio_guest.click()
         except Exception as e:
-            print(f" Exception while choosing checkout option '{checkout_option}': {e}")
+            self.log.error("Exception while choosing checkout option '%s': %s", checkout_option, e)
             raise
 
     # ===== Continue Button =====
@@ -67,7 +88,7 @@ class CheckoutPage:
         try:
             self.btn_continue.click()
         except Exception as e:
-            print(f" Exception while clicking Continue: {e}")
+            self.log.error("Exception while clicking Continue: %s", e)
             raise
 
     # ===== Billing Details =====
@@ -99,14 +120,49 @@ class CheckoutPage:
         """Select a state/region from the dropdown."""
         self.drp_state.select_option(label=state)
 
+    def fill_billing_details(self, details: dict) -> dict:
+        """
+        Fill the whole billing address form with one batched call.
+        Uses the same keys as the individual setter methods.
+
+        Example:
+            checkout_page.fill_billing_details({
+                "first_name": "John", "last_name": "Doe", "address1": "1 Main St",
+                "city": "Pune", "pin": "411001", "country": "India", "state": "Maharashtra"
+            })
+        """
+        field_map = {
+            "first_name": "txt_first_name",
+            "last_name": "txt_last_name",
+            "address1": "txt_address1",
+            "address2": "txt_address2",
+            "city": "txt_city",
+            "pin": "txt_pin",
+            "country": "drp_country",
+            "state": "drp_state",
+        }
+        try:
+            return self.fill_form({field_map[key]: value for key, value in details.items()})
+        except Exception as e:
+            self.log.error("Exception while filling billing details: %s", e)
+            raise
+
     # ===== Continue Buttons =====
 
-    def click_continue_after_billing_address(self):
-        """Click Continue after entering billing address details."""
+    def click_continue_after_billing_address(self, confirm: bool = False):
+        """
+        Click Continue after entering billing address details.
+        With confirm=True, waits for the payment-address save response and
+        fails fast with the server's validation errors.
+        """
+        if confirm:
+            return self.click_and_confirm(self.btn_continue_billing_address, CHECKOUT_ROUTES["billing_address"])
         self.btn_continue_billing_address.click()
 
-    def click_continue_after_delivery_address(self):
-        """Click Continue after confirming the delivery address."""
+    def click_continue_after_delivery_address(self, confirm: bool = False):
+        """Click Continue after confirming the delivery address (confirm=True waits for the save response)."""
+        if confirm:
+            return self.click_and_confirm(self.btn_continue_delivery_address, CHECKOUT_ROUTES["delivery_address"])
         self.btn_continue_delivery_address.click()
 
     # ===== Delivery Method =====
@@ -115,8 +171,10 @@ class CheckoutPage:
         """Enter a comment or instruction for delivery."""
         self.txt_delivery_method.fill(message)
 
-    def click_continue_after_delivery_method(self):
-        """Click Continue after setting the delivery method."""
+    def click_continue_after_delivery_method(self, confirm: bool = False):
+        """Click Continue after setting the delivery method (confirm=True waits for the save response)."""
+        if confirm:
+            return self.click_and_confirm(self.btn_continue_shipping_address, CHECKOUT_ROUTES["delivery_method"])
         self.btn_continue_shipping_address.click()
 
     # ===== Payment Method =====
@@ -125,12 +183,15 @@ class CheckoutPage:
         """Check the Terms & Conditions checkbox."""
         self.chkbox_terms.check()
 
-    def click_continue_after_payment_method(self):
-        """Click Continue after selecting payment method."""
+    def click_continue_after_payment_method(self, confirm: bool = False):
+        """Click Continue after selecting payment method (confirm=True waits for the save response)."""
+        if confirm:
+            return self.click_and_confirm(self.btn_continue_payment_method, CHECKOUT_ROUTES["payment_method"])
         self.btn_continue_payment_method.click()
 
     # ===== Order Confirmation =====
 
+    @untimed
     def get_total_price_before_confirm(self):
         """Return the total price before placing the order."""
         return self.lbl_total_price
@@ -140,9 +201,10 @@ class CheckoutPage:
         try:
             self.btn_conf_order.click()
         except Exception as e:
-            print(f" Exception while confirming order: {e}")
+            self.log.error("Exception while confirming order: %s", e)
             raise
 
+    @untimed
     def is_order_placed(self):
         """
         Verify if the order confirmation message appears.
@@ -150,8 +212,9 @@ class CheckoutPage:
         """
         try:
             # Handle alert/dialog popups automatically if they appear
-            self.page.on("dialog", lambda dialog: dialog.accept())
+            # (one shared handler: calling this again adds no new listener)
+            self.events.subscribe("dialog", accept_dialog)
             return self.lbl_order_con_msg
         except Exception as e:
-            print(f" Exception while checking order confirmation: {e}")
+            self.log.error("Exception while checking order confirmation: %s", e)
             return None
\ No newline at end of file
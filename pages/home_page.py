@@ -1,22 +1,24 @@
 from playwright.sync_api import Page
+from pages.base_page import BasePage, PageLocator
 
-class HomePage:
+class HomePage(BasePage):
     """Page Object Model class for the 'Home' page."""
 
-    def __init__(self, page: Page):
-        """
-        Constructor to initialize the Playwright page object
-        and define all necessary locators.
-        """
-        self.page = page
+    __slots__ = ()
 
-        # ===== Locators =====
-        # Using Playwright's 'locator' method to identify UI elements
-        self.lnk_my_account = page.locator('span:has-text("My Account")')
-        self.lnk_register = page.locator('a:has-text("Register")')
-        self.lnk_login = page.locator('a:has-text("Login")')
-        self.txt_search_box = page.locator('input[placeholder="Search"]')
-        self.btn_search = page.locator('#search button[type="button"]')
+    # ===== Locators =====
+    # Using Playwright's 'locator' method to identify UI elements
+    lnk_my_account = PageLocator('span:has-text("My Account")')
+    lnk_register = PageLocator('a:has-text("Register")')
+    lnk_login = PageLocator('a:has-text("Login")')
+    txt_search_box = PageLocator('input[placeholder="Search"]')
+    btn_search = PageLocator('#search button[type="button"]')
+    img_slideshow = PageLocator('#slideshow0')
+    img_brand_carousel = PageLocator('#carousel0')
+    lbl_prices = PageLocator('.product-thumb .price')
+
+    # Dynamic regions hidden in visual snapshots
+    VISUAL_MASKS = BasePage.VISUAL_MASKS + ("img_slideshow", "img_brand_carousel", "lbl_prices")
 
     # ===== Action Methods =====
     # Each method represents a user interaction on the page
@@ -31,7 +33,7 @@ class HomePage:
         try:
             self.lnk_my_account.click()
         except Exception as e:
-            print(f" Exception while clicking 'My Account': {e}")
+            self.log.error("Exception while clicking 'My Account': %s", e)
             raise
 
     def click_register(self):
@@ -39,7 +41,7 @@ class HomePage:
         try:
             self.lnk_register.click()
         except Exception as e:
-            print(f" Exception while clicking 'Register': {e}")
+            self.log.error("Exception while clicking 'Register': %s", e)
             raise
 
     def click_login(self):
@@ -47,7 +49,7 @@ class HomePage:
         try:
             self.lnk_login.click()
         except Exception as e:
-            print(f" Exception while clicking 'Login': {e}")
+            self.log.error("Exception while clicking 'Login': %s", e)
             raise
 
     def enter_product_name(self, product_name: str):
@@ -55,7 +57,7 @@ class HomePage:
         try:
             self.txt_search_box.fill(product_name)
         except Exception as e:
-            print(f" Exception while entering product name '{product_name}': {e}")
+            self.log.error("Exception while entering product name '%s': %s", product_name, e)
             raise
 
     def click_search(self):
@@ -63,5 +65,5 @@ class HomePage:
         try:
             self.btn_search.click()
         except Exception as e:
-            print(f" Exception while clicking 'Search' button: {e}")
+            self.log.error("Exception while clicking 'Search' button: %s", e)
             raise
\ No newline at end of file
@@ -3,24 +3,20 @@
 # which helps to keep locators and actions separate from the test logic.
 
 from playwright.sync_api import Page, expect
+from pages.base_page import BasePage, PageLocator, untimed
 
 
-class LoginPage:
+class LoginPage(BasePage):
     """Page Object Model class for the Login Page."""
 
-    def __init__(self, page: Page):
-        """
-        Constructor that initializes the Playwright Page instance
-        and defines all locators used on the Login Page.
-        """
-        self.page = page
+    __slots__ = ()
 
-        # ===== Locators =====
-        # Using CSS selectors to locate elements on the Login page.
-        self.txt_email_address = page.locator('#input-email')
-        self.txt_password = page.locator('#input-password')
-        self.btn_login = page.locator('input[value="Login"]')
-        self.txt_error_message = page.locator('.alert.alert-danger.alert-dismissible')
+    # ===== Locators =====
+    # Using CSS selectors to locate elements on the Login page.
+    txt_email_address = PageLocator('#input-email')
+    txt_password = PageLocator('#input-password')
+    btn_login = PageLocator('input[value="Login"]')
+    txt_error_message = PageLocator('.alert.alert-danger.alert-dismissible')
 
     # ===== Action Methods =====
     # These methods represent user interactions on the Login Page.
@@ -30,7 +26,7 @@ class LoginPage:
         try:
             self.txt_email_address.fill(email)
         except Exception as e:
-            print(f" Exception while entering email: {e}")
+            self.log.error("Exception while entering email: %s", e)
             raise
 
     def set_password(self, password: str):
@@ -38,7 +34,7 @@ class LoginPage:
         try:
             self.txt_password.fill(password)
         except Exception as e:
-            print(f" Exception while entering password: {e}")
+            self.log.error("Exception while entering password: %s", e)
             raise
 
     def click_login(self):
@@ -46,7 +42,7 @@ class LoginPage:
         try:
             self.btn_login.click()
         except Exception as e:
-            print(f" Exception while clicking Login button: {e}")
+            self.log.error("Exception while clicking Login button: %s", e)
             raise
 
     def login(self, email: str, password: str):
@@ -60,6 +56,7 @@ class LoginPage:
         self.set_password(password)
         self.click_login()
 
+    @untimed
     def get_login_error(self):
         """
         Return the error message element if login fails.
@@ -69,5 +66,5 @@ class LoginPage:
         try:
             return self.txt_error_message
         except Exception as e:
-            print(f" Exception while fetching login error message: {e}")
+            self.log.error("Exception while fetching login error message: %s", e)
             return None
\ No newline at end of file
@@ -3,22 +3,18 @@
 # to separate page locators and actions from the test logic.
 
 from playwright.sync_api import Page, expect
+from pages.base_page import BasePage, PageLocator, untimed
 from pages.home_page import HomePage  # Adjust this import path as per your project structure
 
 
-class LogoutPage:
+class LogoutPage(BasePage):
     """Page Object Model class for the Logout Page."""
 
-    def __init__(self, page: Page):
-        """
-        Constructor that initializes the Playwright Page instance
-        and defines all locators used on the Logout Page.
-        """
-        self.page = page
+    __slots__ = ()
 
-        # ===== Locators =====
-        # Button used to return to the home page after successful logout
-        self.btn_continue = page.locator('.btn.btn-primary')
+    # ===== Locators =====
+    # Button used to return to the home page after successful logout
+    btn_continue = PageLocator('.btn.btn-primary')
 
     # ===== Action Methods =====
 
@@ -30,9 +26,10 @@ class LogoutPage:
         try:
             self.btn_continue.click()
         except Exception as e:
-            print(f" Exception while clicking 'Continue' button: {e}")
+            self.log.error("Exception while clicking 'Continue' button: %s", e)
             raise
 
+    @untimed
     def get_continue_button(self):
         """
         Return the Continue button locator.
@@ -44,5 +41,5 @@ class LogoutPage:
         try:
             return self.btn_continue
         except Exception as e:
-            print(f" Exception while fetching 'Continue' button locator: {e}")
+            self.log.error("Exception while fetching 'Continue' button locator: %s", e)
             return None
\ No newline at end of file
@@ -3,26 +3,23 @@
 # the page locators and actions from the actual test cases.
 
 from playwright.sync_api import Page, expect
+from pages.base_page import BasePage, PageLocator, untimed
 from pages.logout_page import LogoutPage  # Adjust import path based on your project structure
 
 
-class MyAccountPage:
+class MyAccountPage(BasePage):
     """Page Object Model class for the My Account Page."""
 
-    def __init__(self, page: Page):
-        """
-        Constructor to initialize the Playwright Page instance
-        and define all locators present on the My Account page.
-        """
-        self.page = page
+    __slots__ = ()
 
-        # ===== Locators =====
-        # Identifying elements on the My Account page.
-        self.msg_heading = page.locator('h2:has-text("My Account")')
-        self.lnk_logout = page.locator("text='Logout'").nth(1)
+    # ===== Locators =====
+    # Identifying elements on the My Account page.
+    msg_heading = PageLocator('h2:has-text("My Account")')
+    lnk_logout = PageLocator("text='Logout'", nth=1)
 
     # ===== Page Validation Methods =====
 
+    @untimed
     def get_my_account_page_heading(self):
         """
         Returns the locator for the 'My Account' page heading.
@@ -34,7 +31,7 @@ class MyAccountPage:
         try:
             return self.msg_heading
         except Exception as e:
-            print(f"Error returning My Account page heading: {e}")
+            self.log.error("Error returning My Account page heading: %s", e)
             return None
 
     # ===== Logout Action =====
@@ -52,7 +49,7 @@ class MyAccountPage:
             self.lnk_logout.click()
             return LogoutPage(self.page)
         except Exception as e:
-            print(f"Unable to click Logout link: {e}")
+            self.log.error("Unable to click Logout link: %s", e)
             raise e  # Re-raise the exception to fail the test intentionally
 
     # ===== Page Title Verification =====
@@ -67,5 +64,5 @@ class MyAccountPage:
         try:
             return self.page.title()
         except Exception as e:
-            print(f"Error retrieving page title: {e}")
+            self.log.error("Error retrieving page title: %s", e)
             return ""
\ No newline at end of file
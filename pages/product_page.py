@@ -4,26 +4,58 @@
 # from the test logic for better reusability and maintenance.
 
 from playwright.sync_api import Page, expect
+from pages.base_page import BasePage, PageLocator, untimed
 from pages.shopping_cart_page import ShoppingCartPage  # Adjust path as per your folder structure
+from utilities.catalog_util import get_catalog
 
+# OpenCart route called by the 'Add to Cart' button
+CART_ADD_ROUTE = "checkout/cart/add"
 
-class ProductPage:
+
+class ProductPage(BasePage):
     """Page Object Model class for the Product Page."""
 
-    def __init__(self, page: Page):
-        """
-        Constructor to initialize the Playwright Page instance
-        and define all the locators used on the Product Page.
+    __slots__ = ()
+
+    # ===== Locators =====
+    # Using CSS selectors to identify page elements
+    txt_quantity = PageLocator('input[name="quantity"]')
+    btn_add_to_cart = PageLocator('#button-cart')
+    cnf_msg = PageLocator('.alert.alert-success.alert-dismissible')
+    btn_items = PageLocator('#cart')
+    lnk_view_cart = PageLocator('strong:has-text("View Cart")')
+    lbl_price = PageLocator('#content ul.list-unstyled h2')
+    lbl_product_name = PageLocator('#content h1')
+
+    # Dynamic regions hidden in visual snapshots
+    VISUAL_MASKS = BasePage.VISUAL_MASKS + ("lbl_price",)
+
+    # ===== Deep Link =====
+
+    def open(self, product_name: str, base_url: str = None) -> "ProductPage":
         """
-        self.page = page
+        Open a product page directly (no Home -> search -> results round trip),
+        using the cached catalog index (see utilities/catalog_util.py).
+        Tests of the search itself should keep going through the UI.
 
-        # ===== Locators =====
-        # Using CSS selectors to identify page elements
-        self.txt_quantity = page.locator('input[name="quantity"]')
-        self.btn_add_to_cart = page.locator('#button-cart')
-        self.cnf_msg = page.locator('.alert.alert-success.alert-dismissible')
-        self.btn_items = page.locator('#cart')
-        self.lnk_view_cart = page.locator('strong:has-text("View Cart")')
+        :param base_url: shop base URL; defaults to the one of the current page
+
+        Example:
+            product_page = ProductPage(page).open(Config.product_name)
+        """
+        try:
+            base_url = base_url or self.page.url.split("index.php")[0].split("?")[0]
+            catalog = get_catalog(base_url, fetch=lambda url: self.page.request.get(url).text())
+            product = catalog.find(product_name)
+            self.page.goto(product["url"])
+            if self.lbl_product_name.text_content().strip() != product["name"]:
+                # Cached id is stale (catalog changed): look the product up again
+                self.log.warning("Catalog entry for '%s' is stale, refreshing", product_name)
+                self.page.goto(catalog.find(product_name, refresh=True)["url"])
+            return self
+        except Exception as e:
+            self.log.error("Error while opening product '%s': %s", product_name, e)
+            raise
 
     # ===== Quantity Methods =====
 
@@ -36,23 +68,39 @@ class ProductPage:
             self.txt_quantity.fill('')   # Clear existing value
             self.txt_quantity.fill(qty)  # Enter new quantity
         except Exception as e:
-            print(f"Error while setting quantity: {e}")
+            self.log.error("Error while setting quantity: %s", e)
             raise
 
     # ===== Add to Cart Methods =====
 
-    def add_to_cart(self):
+    def add_to_cart(self, confirm: bool = False, check_banner: bool = False):
         """
         Click the 'Add to Cart' button to add the selected product.
+
+        :param confirm: wait for OpenCart's add-to-cart AJAX response and
+                        fail fast if the server reports an error
+        :param check_banner: with confirm, also check the success banner
+        :return: the server's JSON payload when confirm=True, otherwise None
+
+        Example:
+            payload = product_page.add_to_cart(confirm=True)
+            assert "success" in payload
         """
         try:
+            if confirm:
+                return self.click_and_confirm(
+                    self.btn_add_to_cart,
+                    CART_ADD_ROUTE,
+                    dom_check=self.cnf_msg if check_banner else None
+                )
             self.btn_add_to_cart.click()
         except Exception as e:
-            print(f"Error while clicking 'Add to Cart': {e}")
+            self.log.error("Error while clicking 'Add to Cart': %s", e)
             raise
 
     # ===== Confirmation Message =====
 
+    @untimed
     def get_confirmation_message(self):
         """
         Return the confirmation message element shown after adding to cart.
@@ -64,7 +112,7 @@ class ProductPage:
         try:
             return self.cnf_msg
         except Exception as e:
-            print(f"Confirmation message not found: {e}")
+            self.log.error("Confirmation message not found: %s", e)
             return None
 
     # ===== Navigate to Shopping Cart =====
@@ -77,7 +125,7 @@ class ProductPage:
         try:
             self.btn_items.click()
         except Exception as e:
-            print(f"Error while clicking cart items button: {e}")
+            self.log.error("Error while clicking cart items button: %s", e)
             raise
 
     def click_view_cart(self) -> ShoppingCartPage:
@@ -92,22 +140,26 @@ class ProductPage:
             self.lnk_view_cart.click()
             return ShoppingCartPage(self.page)
         except Exception as e:
-            print(f"Error while clicking 'View Cart': {e}")
+            self.log.error("Error while clicking 'View Cart': %s", e)
             raise
 
     # ===== Combined Workflow =====
 
-    def add_product_to_cart(self, quantity: str):
+    def add_product_to_cart(self, quantity: str, confirm: bool = False, check_banner: bool = False):
         """
         Combined workflow to:
         1. Set product quantity
         2. Add product to the cart
-        3. Validate confirmation message (optional)
+        3. Validate the result: by default the success banner; with
+           confirm=True the server's AJAX response (faster and reports
+           server-side errors), the banner check is then optional
         """
         try:
             self.set_quantity(quantity)
+            if confirm:
+                return self.add_to_cart(confirm=True, check_banner=check_banner)
             self.add_to_cart()
             expect(self.get_confirmation_message()).to_be_visible()
         except Exception as e:
-            print(f"Error in add_product_to_cart workflow: {e}")
+            self.log.error("Error in add_product_to_cart workflow: %s", e)
             raise
\ No newline at end of file
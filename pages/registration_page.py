@@ -1,31 +1,31 @@
 from playwright.sync_api import Page
+from pages.base_page import BasePage, PageLocator, untimed
 
 
-class RegistrationPage:
+class RegistrationPage(BasePage):
     """
     Page Object Model class for the Registration Page.
     This class contains web element locators and methods (actions)
     to interact with the registration form.
     """
 
-    def __init__(self, page: Page):
-        self.page = page
+    __slots__ = ()
 
-        # ===== Locators =====
-        # Input fields
-        self.txt_firstname = page.locator('#input-firstname')
-        self.txt_lastname = page.locator('#input-lastname')
-        self.txt_email = page.locator('#input-email')
-        self.txt_telephone = page.locator('#input-telephone')
-        self.txt_password = page.locator('#input-password')
-        self.txt_confirm_password = page.locator('#input-confirm')
+    # ===== Locators =====
+    # Input fields
+    txt_firstname = PageLocator('#input-firstname')
+    txt_lastname = PageLocator('#input-lastname')
+    txt_email = PageLocator('#input-email')
+    txt_telephone = PageLocator('#input-telephone')
+    txt_password = PageLocator('#input-password')
+    txt_confirm_password = PageLocator('#input-confirm')
 
-        # Checkbox and buttons
-        self.chk_policy = page.locator('input[name="agree"]')
-        self.btn_continue = page.locator('input[value="Continue"]')
+    # Checkbox and buttons
+    chk_policy = PageLocator('input[name="agree"]')
+    btn_continue = PageLocator('input[value="Continue"]')
 
-        # Confirmation message (displayed after successful registration)
-        self.msg_confirmation = page.locator('h1:has-text("Your Account Has Been Created!")')
+    # Confirmation message (displayed after successful registration)
+    msg_confirmation = PageLocator('h1:has-text("Your Account Has Been Created!")')
 
     # ===== Action Methods =====
 
@@ -61,6 +61,7 @@ class RegistrationPage:
         """Click on the 'Continue' button to submit the registration form."""
         self.btn_continue.click()
 
+    @untimed
     def get_confirmation_msg(self):
         """
         Return the confirmation message locator.
@@ -83,13 +84,16 @@ class RegistrationPage:
             "password": "Test@123"
         }
         """
-        self.set_first_name(user_data["firstName"])
-        self.set_last_name(user_data["lastName"])
-        self.set_email(user_data["email"])
-        self.set_telephone(user_data["telephone"])
-        self.set_password(user_data["password"])
-        self.set_confirm_password(user_data["password"])
-        self.set_privacy_policy()
+        # All fields and the policy checkbox are set in a single browser call
+        self.fill_form({
+            "txt_firstname": user_data["firstName"],
+            "txt_lastname": user_data["lastName"],
+            "txt_email": user_data["email"],
+            "txt_telephone": user_data["telephone"],
+            "txt_password": user_data["password"],
+            "txt_confirm_password": user_data["password"],
+            "chk_policy": True,
+        })
         self.click_continue()
 
         # Return confirmation message element for validation
@@ -1,26 +1,32 @@
 from playwright.sync_api import Page
+from pages.base_page import BasePage, PageLocator, untimed
 from pages.product_page import ProductPage  # Adjust import path based on your project structure
 
 
-class SearchResultsPage:
+class SearchResultsPage(BasePage):
     """
     Page Object Model class for the Search Results Page.
     This class contains locators and methods to interact with and verify
     products displayed after performing a search.
     """
 
-    def __init__(self, page: Page):
-        self.page = page
+    __slots__ = ()
 
-        # ===== Locators =====
-        # Header that appears on the search results page
-        self.search_page_header = page.locator("#content h1", has_text="Search -")
+    # ===== Locators =====
+    # Header that appears on the search results page
+    search_page_header = PageLocator("#content h1", has_text="Search -")
 
-        # List of all product links shown in the search results
-        self.search_products = page.locator("h4 > a")
+    # List of all product links shown in the search results
+    search_products = PageLocator("h4 > a")
+
+    # Product prices (masked in visual snapshots)
+    lbl_prices = PageLocator(".product-thumb .price")
+
+    VISUAL_MASKS = BasePage.VISUAL_MASKS + ("lbl_prices",)
 
     # ===== Page Header =====
 
+    @untimed
     def get_search_results_page_header(self):
         """
         Returns the header element of the search results page, if it exists.
@@ -29,7 +35,7 @@ class SearchResultsPage:
         try:
             return self.search_page_header
         except Exception as e:
-            print(f"Error fetching search results page header: {e}")
+            self.log.error("Error fetching search results page header: %s", e)
             return None
 
     # ===== Product Verification =====
@@ -49,7 +55,7 @@ class SearchResultsPage:
                 if title and title.strip() == product_name:
                     return product
         except Exception as e:
-            print(f"Error while checking product existence: {e}")
+            self.log.error("Error while checking product existence: %s", e)
         return None
 
     # ===== Product Selection =====
@@ -69,13 +75,14 @@ class SearchResultsPage:
                 if title and title.strip() == product_name:
                     product.click()
                     return ProductPage(self.page)
-            print(f"Product not found: {product_name}")
+            self.log.warning("Product not found: %s", product_name)
         except Exception as e:
-            print(f"Error while selecting product: {e}")
+            self.log.error("Error while selecting product: %s", e)
         return None
 
     # ===== Product Count =====
 
+    @untimed
     def get_product_count(self):
         """
         Returns the products found in the search results.
@@ -85,5 +92,5 @@ class SearchResultsPage:
         try:
             return self.search_products
         except Exception as e:
-            print(f"Error while getting product count: {e}")
+            self.log.error("Error while getting product count: %s", e)
             return None
\ No newline at end of file
@@ -1,28 +1,35 @@
 from playwright.sync_api import Page, expect
+from pages.base_page import BasePage, PageLocator, untimed
 from pages.checkout_page import CheckoutPage  # Adjust import path as per your project structure
 
 
-class ShoppingCartPage:
+class ShoppingCartPage(BasePage):
     """
     Page Object Model for the Shopping Cart Page.
     This class contains web element locators and reusable methods
     to interact with the shopping cart page.
     """
 
-    def __init__(self, page: Page):
-        self.page = page
+    __slots__ = ()
 
-        # ===== Locators =====
-        # Locator for the total price in the cart summary section
-        self.lbl_total_price = page.locator(
-            "//*[@id='content']/div[2]/div/table//strong[text()='Total:']//following::td"
-        )
+    # ===== Locators =====
+    # Locator for the total price in the cart summary section
+    lbl_total_price = PageLocator(
+        "//*[@id='content']/div[2]/div/table//strong[text()='Total:']//following::td"
+    )
 
-        # Locator for the "Checkout" button
-        self.btn_checkout = page.locator("a.btn.btn-primary")
+    # Locator for the "Checkout" button
+    btn_checkout = PageLocator("a.btn.btn-primary")
+
+    # Unit prices, line totals and the totals table (masked in visual snapshots)
+    lbl_cart_prices = PageLocator("#content .table-responsive td.text-right")
+    tbl_totals = PageLocator("#content .col-sm-offset-8 table")
+
+    VISUAL_MASKS = BasePage.VISUAL_MASKS + ("lbl_cart_prices", "tbl_totals")
 
     # ===== Methods =====
 
+    @untimed
     def get_total_price(self):
         """
         Returns the total price element from the shopping cart.
@@ -32,7 +39,7 @@ class ShoppingCartPage:
         try:
             return self.lbl_total_price
         except Exception as e:
-            print(f"Unable to retrieve total price: {e}")
+            self.log.error("Unable to retrieve total price: %s", e)
             return None
 
     def click_on_checkout(self) -> CheckoutPage:
@@ -45,9 +52,10 @@ class ShoppingCartPage:
             self.btn_checkout.click()
             return CheckoutPage(self.page)
         except Exception as e:
-            print(f"Error clicking on checkout button: {e}")
+            self.log.error("Error clicking on checkout button: %s", e)
             raise e  # Re-raise to fail the test if critical navigation fails
 
+    @untimed
     def is_page_loaded(self) :
         """
         Verifies if the Shopping Cart page is successfully loaded.
@@ -57,5 +65,5 @@ class ShoppingCartPage:
         try:
             return self.btn_checkout
         except Exception as e:
-            print(f"Error verifying shopping cart page load: {e}")
+            self.log.error("Error verifying shopping cart page load: %s", e)
             return None
\ No newline at end of file
@@ -0,0 +1,90 @@
+# Offline checks of the adaptive action timeouts (utilities/timeout_util.py)
+
+import pytest
+from playwright.sync_api import expect
+
+from utilities.timeout_util import (EXPECT_DEFAULT_MS, PLAYWRIGHT_DEFAULT_MS, TimeoutPolicy, drift_report,
+                                    load_history, percentile, save_history)
+
+HISTORY = {"LoginPage.click_login": [400.0] * 99 + [1000.0], "HomePage.click_search": [100.0] * 3}
+
+
+class FakeContext:
+    def __init__(self):
+        self.timeouts = []
+
+    def set_default_timeout(self, timeout):
+        self.timeouts.append(timeout)
+
+
+class FakePage(FakeContext):
+    def __init__(self):
+        super().__init__()
+        self.context = FakeContext()
+
+
+@pytest.fixture(autouse=True)
+def expect_timeout():
+    yield
+    expect.set_options(timeout=EXPECT_DEFAULT_MS)
+
+
+def test_percentile_is_nearest_rank():
+    assert percentile(list(range(1, 101)), 0.99) == 99
+    assert percentile([5.0], 0.99) == 5.0
+    assert percentile([3, 1, 2], 0.5) == 2
+
+
+def test_timeout_is_p99_times_multiplier_within_floor_and_ceiling():
+    policy = TimeoutPolicy(HISTORY, mode="adaptive", multiplier=3, floor_ms=2000, ceiling_ms=2500)
+
+    assert policy.timeout_for("LoginPage.click_login") == 2000     # p99 400 x 3 = 1200, raised to the floor
+    assert policy.timeout_for("HomePage.click_search") is None     # not enough history
+    policy.multiplier = 10
+    assert policy.timeout_for("LoginPage.click_login") == 2500     # 4000, capped at the ceiling
+
+
+def test_action_applies_and_restores_timeouts():
+    policy = TimeoutPolicy(HISTORY, mode="adaptive", multiplier=10, ceiling_ms=PLAYWRIGHT_DEFAULT_MS)
+    page = FakePage()
+
+    with policy.action(page, "LoginPage.click_login"):
+        assert policy.current_timeout(3000) == 4000
+    with policy.action(page, "HomePage.click_search"):
+        assert policy.current_timeout(3000) == 3000     # caller's timeout without history
+    policy.set_default_timeout(page.context, 12000)
+    with policy.action(page, "LoginPage.click_login"):
+        pass
+
+    assert page.timeouts == [4000, PLAYWRIGHT_DEFAULT_MS, 4000, 12000]
+    assert set(policy.drain()["samples"]) == {"LoginPage.click_login", "HomePage.click_search"}
+
+
+def test_record_mode_keeps_playwright_timeouts():
+    policy = TimeoutPolicy(HISTORY, mode="record")
+    page = FakePage()
+
+    with policy.action(page, "LoginPage.click_login"):
+        assert policy.current_timeout(3000) == 3000
+
+    assert page.timeouts == []
+    assert len(policy.drain()["samples"]["LoginPage.click_login"]) == 1
+
+
+def test_drift_report_lists_slow_actions_and_timeouts():
+    policy = TimeoutPolicy(HISTORY, mode="adaptive", multiplier=3)
+
+    lines = drift_report(policy, {"LoginPage.click_login": [900.0, 950.0], "HomePage.click_search": [900.0]},
+                         {"LoginPage.click_login": 2})
+
+    assert lines == ["DRIFT   LoginPage.click_login: median 400 -> 925 ms (timeout 2000 ms)",
+                     "TIMEOUT LoginPage.click_login: 2x after 2000 ms"]
+
+
+def test_history_keeps_the_last_runs(tmp_path):
+    path = str(tmp_path / ".timings_cache" / "action_timings.json")
+    save_history(path, {"LoginPage.click_login": [1.0] * 150})
+    save_history(path, {"LoginPage.click_login": [2.0]})
+
+    history = load_history(path)["LoginPage.click_login"]
+    assert len(history) == 100 and history[-1] == 2.0
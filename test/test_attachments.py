@@ -0,0 +1,59 @@
+# Offline checks of the artifact writers: a file linked into the Allure
+# results of an earlier run must keep its content when the artifact is written again
+
+import os
+
+import pytest
+
+from utilities.attachment_util import new_file
+from utilities.screenshot_util import ScreenshotManager
+
+
+class ScreenshotPage:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def screenshot(self, **options):
+        return self.data
+
+
+def test_new_file_keeps_linked_copy(tmp_path):
+    artifact = tmp_path / "traces" / "test_login_trace.zip"
+    with new_file(artifact) as tmp:
+        tmp.write_bytes(b"first run")
+    attachment = tmp_path / "attachment.zip"
+    os.link(artifact, attachment)
+
+    with new_file(artifact) as tmp:
+        tmp.write_bytes(b"second run")
+
+    assert artifact.read_bytes() == b"second run"
+    assert attachment.read_bytes() == b"first run"
+
+
+def test_new_file_failure_keeps_old_file(tmp_path):
+    artifact = tmp_path / "test_login_trace.zip"
+    artifact.write_bytes(b"first run")
+
+    with pytest.raises(RuntimeError):
+        with new_file(artifact) as tmp:
+            tmp.write_bytes(b"half")
+            raise RuntimeError("tracing.stop failed")
+
+    assert artifact.read_bytes() == b"first run"
+    assert [file.name for file in tmp_path.iterdir()] == ["test_login_trace.zip"]
+
+
+def test_screenshot_of_next_run_does_not_rewrite_attachment(tmp_path):
+    first_run = ScreenshotManager(str(tmp_path))
+    shot = first_run.capture(ScreenshotPage(b"first run"), "test_login").result()
+    first_run.close()
+    attachment = tmp_path / "attachment.png"
+    os.link(shot["path"], attachment)
+
+    next_run = ScreenshotManager(str(tmp_path))
+    shot = next_run.capture(ScreenshotPage(b"next run"), "test_login").result()
+    next_run.close()
+
+    assert (tmp_path / "test_login.png").read_bytes() == b"next run"
+    assert attachment.read_bytes() == b"first run"
@@ -0,0 +1,51 @@
+# Offline checks of the remote browser grid helpers (no browser server needed)
+
+import os
+
+from utilities.browser_grid_util import save_video, server_launch_options
+
+
+class RemoteVideo:
+    """Video of a page on a browser server: only save_as() works."""
+
+    def path(self):
+        raise Exception("Path is not available when using browserType.connect(). Use saveAs() to save a local copy.")
+
+    def save_as(self, path):
+        with open(path, "wb") as file:
+            file.write(b"webm")
+
+
+class ClosedPage:
+    def __init__(self, video):
+        self.video = video
+
+
+def test_save_video_downloads_remote_video(tmp_path):
+    video_path = save_video(ClosedPage(RemoteVideo()), str(tmp_path / "videos" / "test_login.webm"))
+
+    assert video_path == str(tmp_path / "videos" / "test_login.webm")
+    assert (tmp_path / "videos" / "test_login.webm").read_bytes() == b"webm"
+    assert [file.name for file in (tmp_path / "videos").iterdir()] == ["test_login.webm"]
+
+
+def test_save_video_replaces_instead_of_rewriting(tmp_path):
+    old_video = tmp_path / "test_login.webm"
+    old_video.write_bytes(b"old run")
+    linked = tmp_path / "attachment.webm"
+    os.link(old_video, linked)      # like the Allure results link of an earlier run
+
+    save_video(ClosedPage(RemoteVideo()), str(old_video))
+
+    assert old_video.read_bytes() == b"webm"
+    assert linked.read_bytes() == b"old run"
+
+
+def test_save_video_without_video(tmp_path):
+    assert save_video(ClosedPage(None), str(tmp_path / "test_login.webm")) is None
+
+
+def test_server_launch_options_are_camel_case():
+    options = server_launch_options({"headless": True, "firefox_user_prefs": {"a": 1}, "args": ["--disable-gpu"]})
+
+    assert options == {"headless": True, "firefoxUserPrefs": {"a": 1}, "args": ["--disable-gpu"]}
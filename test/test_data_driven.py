@@ -3,25 +3,29 @@ from pages.home_page import HomePage
 from pages.login_page import LoginPage
 from pages.my_account_page import MyAccountPage
 from playwright.sync_api import expect
-from utilities.data_reader_util import read_json_data, read_csv_data, read_excel_data
 
-# Load test data files (adjust paths if needed)
-
-csv_data = read_csv_data("testdatafiles/logindata.csv")
-excel_data = read_excel_data("testdatafiles/logindata.xlsx")
-json_data = read_json_data("testdatafiles/logindata.json")
+# Test data is not loaded at import time. The "dataset" marker parametrizes the
+# test with row ids and the data_row fixture reads each row only when it runs
+# (see conftest.py STEP 3c). Use --data-shard / --data-sample for big files.
+# The rows carry no shard_group on purpose: --shard balances them across the
+# CI shards like any other tests.
 
 # ========================================================
 # Data-driven Login Test
 # ========================================================
 
-@pytest.mark.parametrize("testName,email, password, expected",csv_data)
-#@pytest.mark.parametrize("testName,email, password, expected",excel_data)
-#@pytest.mark.parametrize("testName,email, password, expected",json_data)
+@pytest.mark.dataset("testdatafiles/logindata.csv", stratify="expected")
+#@pytest.mark.dataset("testdatafiles/logindata.xlsx", stratify="expected")
+#@pytest.mark.dataset("testdatafiles/logindata.json", stratify="expected")
+
 
 
+def test_login_data_driven(page, data_row):
 
-def test_login_data_driven(page,testName,email, password, expected):
+    # Test data for this row
+    email = data_row["email"]
+    password = data_row["password"]
+    expected = data_row["expected"]
 
     # Page object initialization
     home_page = HomePage(page)
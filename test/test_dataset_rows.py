@@ -0,0 +1,46 @@
+# Offline checks of the dataset row selection (--data-shard / --data-sample)
+
+import pytest
+
+from utilities.dataset_util import parse_sample, parse_shard, sample_rows, shard_range
+
+ROWS = list(range(100))
+# Stratify column "expected": 90 "success" rows, 10 "failure" rows
+STRATA = {"success": list(range(90)), "failure": list(range(90, 100))}
+
+
+def test_shard_ranges_cover_every_row_once():
+    rows = [row for index in range(1, 4) for row in shard_range(10, index, 3)]
+
+    assert rows == list(range(10))
+    assert parse_shard("2/3") == (2, 3)
+    with pytest.raises(ValueError):
+        parse_shard("4/3")
+
+
+def test_same_seed_gives_same_sample():
+    first = sample_rows(ROWS, "random", 10, seed=7)
+
+    assert first == sample_rows(ROWS, "random", 10, seed=7)
+    assert len(first) == 10 and first == sorted(first)
+
+
+def test_stratified_sample_keeps_every_value():
+    rows = sample_rows(ROWS, "stratified", 6, seed=1, strata=STRATA)
+
+    assert len(rows) == 6
+    assert sum(1 for row in rows if row in STRATA["failure"]) == 3
+
+
+def test_failed_first_puts_failed_rows_first():
+    rows = sample_rows(ROWS, "failed-first", 5, seed=1, failed_ids={42, 7})
+
+    assert rows[:2] == [7, 42]
+    assert len(rows) == 5
+
+
+def test_sample_bigger_than_dataset_keeps_all_rows():
+    assert sample_rows(ROWS, "random", 500, seed=1) == ROWS
+    assert parse_sample("stratified:50") == ("stratified", 50)
+    with pytest.raises(ValueError):
+        sample_rows(ROWS, "newest", 5, seed=1)
@@ -139,11 +139,10 @@ def add_product_to_cart(page):
 
 
     product_page = search_results_page.select_product(product_name)
-    product_page.set_quantity(quantity)
-    product_page.add_to_cart()
 
-    # Verify success message appears
-    expect(product_page.get_confirmation_message()).to_be_visible(timeout=3000)
+    # Add to cart and wait for the server's add-to-cart response
+    # (fails immediately with the server's error instead of waiting for the banner)
+    product_page.add_product_to_cart(quantity, confirm=True)
 
 
 # -------------------------------------------------------------
@@ -0,0 +1,82 @@
+"""
+Benchmark: Batched form fill vs per-field fills (Checkout billing form)
+
+===========================================
+Test Steps
+===========================================
+
+1. Start as a guest with the product already in the cart
+   (store state "guest_cart", restored without any UI).
+2. Open the checkout directly.
+3. Choose "Guest Checkout" and continue to the billing details form.
+4. Fill the billing form field by field (set_first_name, set_last_name, ...)
+   and measure the time.
+5. Fill the same form again with fill_billing_details (one in-page call)
+   and measure the time.
+   The country stays India, so the state options already exist: the state
+   must still survive the zone reload the country change triggers.
+6. Verify the batched fill really set every field.
+
+Expected Result:
+----------------
+Both approaches fill the form; the timings of both are printed and attached
+to the Allure report.
+"""
+
+import time
+import allure
+import pytest
+from playwright.sync_api import expect
+from pages.checkout_page import CheckoutPage
+from utilities.random_data_util import RandomDataUtil
+
+
+@pytest.mark.benchmark
+@pytest.mark.store_state("guest_cart")
+def test_fill_form_benchmark(page):
+    """
+    Compare the per-field setters with the batched fill_form on the checkout form.
+    """
+
+    # --- Step 1 + 2: Cart already filled (store state), open the Checkout and choose Guest Checkout ---
+    checkout_page = CheckoutPage(page).open()
+    checkout_page.choose_checkout_option("Guest Checkout")
+    checkout_page.click_continue()
+    expect(checkout_page.txt_first_name).to_be_visible(timeout=5000)
+
+    random_data = RandomDataUtil()
+
+    # --- Step 3: Per-field fills (one driver round trip per field) ---
+    start = time.perf_counter()
+    checkout_page.set_first_name(random_data.get_first_name())
+    checkout_page.set_last_name(random_data.get_last_name())
+    checkout_page.set_address1(random_data.get_random_address())
+    checkout_page.set_city(random_data.get_random_city())
+    checkout_page.set_pin(random_data.get_random_pin())
+    checkout_page.set_country("India")
+    checkout_page.set_state("Goa")
+    per_field_ms = (time.perf_counter() - start) * 1000
+
+    # --- Step 4: Batched fill (one in-page evaluation + fallbacks) ---
+    details = {
+        "first_name": random_data.get_first_name(),
+        "last_name": random_data.get_last_name(),
+        "address1": random_data.get_random_address(),
+        "city": random_data.get_random_city(),
+        "pin": random_data.get_random_pin(),
+        "country": "India",
+        "state": "Maharashtra",
+    }
+    start = time.perf_counter()
+    result = checkout_page.fill_billing_details(details)
+    batched_ms = (time.perf_counter() - start) * 1000
+
+    # --- Step 5: Verify and report ---
+    expect(checkout_page.txt_first_name).to_have_value(details["first_name"])
+    expect(checkout_page.txt_pin).to_have_value(details["pin"])
+    expect(checkout_page.drp_state.locator("option:checked")).to_have_text("Maharashtra")
+
+    summary = (f"per-field: {per_field_ms:.0f} ms | batched: {batched_ms:.0f} ms "
+               f"(batched fields: {len(result['batched'])}, fallback fields: {result['fallback']})")
+    print(f"[BENCHMARK] {summary}")
+    allure.attach(summary, name="fill_form_benchmark", attachment_type=allure.attachment_type.TEXT)
@@ -0,0 +1,86 @@
+"""
+Benchmark: Setup time per isolation level (context, storage-reset, page)
+
+===========================================
+Test Steps
+===========================================
+
+1. For each isolation level, run a few test-sized rounds:
+   get a context (new or shared), open a page, load the Home page,
+   then release the context.
+2. Measure the context setup, the page load and the teardown of each round.
+3. In the last round of each level, write a cookie and a localStorage entry
+   and verify the leak detection: storage-reset clears them, the page level
+   reports them as leaked state.
+
+Expected Result:
+----------------
+The median timings per level are printed and attached to the Allure report;
+storage-reset leaves no state behind and the page level detects the leak.
+"""
+
+import statistics
+import time
+import allure
+import pytest
+from utilities.isolation_util import ISOLATION_LEVELS, SharedContexts
+
+ROUNDS = 5
+
+# What a "test" leaves behind in the browser
+WRITE_STATE_SCRIPT = "() => { localStorage.setItem('benchmark', '1'); document.cookie = 'benchmark=1; path=/'; }"
+
+
+@pytest.mark.benchmark
+def test_isolation_benchmark(request, browser_pool, browser_name):
+    """
+    Compare the setup cost of the three isolation levels on the same browser.
+    """
+    base_url = request.config.getoption("base_url")
+    shared = SharedContexts(browser_pool, base_url)
+    timings = {}
+    leaks = {}
+
+    browser_pool.get(browser_name)      # launch outside the measurement
+    try:
+        for level in ISOLATION_LEVELS:
+            rounds = []
+            for round_index in range(ROUNDS):
+                # --- Step 1: Context and page, as the fixtures would create them ---
+                start = time.perf_counter()
+                if level == "context":
+                    context = browser_pool.new_context(browser_name)
+                else:
+                    context = shared.acquire(browser_name, level)
+                setup_ms = (time.perf_counter() - start) * 1000
+
+                start = time.perf_counter()
+                page = context.new_page()
+                page.goto(base_url)
+                load_ms = (time.perf_counter() - start) * 1000
+                if round_index == ROUNDS - 1:
+                    # Only the last round leaks, a leak replaces the shared context
+                    page.evaluate(WRITE_STATE_SCRIPT)
+
+                # --- Step 2: Teardown (reset and leak check for the shared levels) ---
+                start = time.perf_counter()
+                if level == "context":
+                    context.close()
+                else:
+                    leaks[level] = shared.release(browser_name, level, f"benchmark-{level}")
+                teardown_ms = (time.perf_counter() - start) * 1000
+                rounds.append((setup_ms, load_ms, teardown_ms))
+            timings[level] = [statistics.median(values) for values in zip(*rounds)]
+    finally:
+        shared.close_all()
+
+    # --- Step 3: Verify the leak detection ---
+    assert leaks["storage-reset"] == [], f"storage-reset left state behind: {leaks['storage-reset']}"
+    assert any("benchmark" in change for change in leaks["page"]), "page level did not detect the leaked state"
+
+    summary = " | ".join(
+        f"{level}: setup {setup:.0f} ms, page load {load:.0f} ms, teardown {teardown:.0f} ms"
+        for level, (setup, load, teardown) in timings.items()
+    )
+    print(f"[BENCHMARK] {browser_name} (median of {ROUNDS}) {summary}")
+    allure.attach(summary, name="isolation_benchmark", attachment_type=allure.attachment_type.TEXT)
@@ -0,0 +1,86 @@
+"""
+Benchmark: Browser launch profiles (lean, debug, realistic)
+
+===========================================
+Test Steps
+===========================================
+
+1. For each launch profile, launch a fresh browser with the profile's
+   launch options and measure the startup time.
+2. Run a few test-sized rounds: new context with the profile's options,
+   new page, load the Home page, close the context. Measure each round.
+3. Measure the memory of the profile's browser processes while it is open.
+4. Close the browser. (The headed debug profile is skipped without a display.)
+
+Expected Result:
+----------------
+The startup time, median round time and browser memory of every profile
+are printed and attached to the Allure report.
+"""
+
+import os
+import statistics
+import sys
+import time
+import allure
+import pytest
+from utilities.browser_pool_util import BrowserPool
+from utilities.launch_profile_util import LAUNCH_PROFILES
+from utilities.memory_util import child_tree_memory_mb
+
+ROUNDS = 5
+
+
+@pytest.mark.benchmark
+def test_launch_profile_benchmark(request, playwright_driver, browser_name):
+    """
+    Compare startup time, per-test time and memory of the launch profiles.
+    """
+    base_url = request.config.getoption("base_url")
+    has_display = sys.platform != "linux" or bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    results = {}
+
+    for profile, settings in LAUNCH_PROFILES.items():
+        if not settings["headless"] and not has_display:
+            continue
+
+        # Own pool: every profile starts from a cold browser
+        pool = BrowserPool(playwright_driver, headless=True)
+        memory_before, _ = child_tree_memory_mb()
+        try:
+            # --- Step 1: Browser startup ---
+            start = time.perf_counter()
+            pool.get(browser_name, profile)
+            startup_ms = (time.perf_counter() - start) * 1000
+
+            # --- Step 2: Test-sized rounds ---
+            rounds = []
+            for _ in range(ROUNDS):
+                start = time.perf_counter()
+                context = pool.new_context(browser_name, profile=profile)
+                context.new_page().goto(base_url)
+                context.close()
+                rounds.append((time.perf_counter() - start) * 1000)
+
+            # --- Step 3: Memory with a loaded page (outside the measured rounds) ---
+            context = pool.new_context(browser_name, profile=profile)
+            context.new_page().goto(base_url)
+            memory_after, _ = child_tree_memory_mb()
+            context.close()
+        finally:
+            pool.close_all()
+
+        results[profile] = {
+            "startup_ms": startup_ms,
+            "round_ms": statistics.median(rounds),
+            "memory_mb": memory_after - memory_before,
+        }
+
+    assert results, "no launch profile could be benchmarked"
+    summary = " | ".join(
+        f"{profile}: startup {stats['startup_ms']:.0f} ms, per test {stats['round_ms']:.0f} ms, "
+        f"browser memory {stats['memory_mb']:.0f} MB"
+        for profile, stats in results.items()
+    )
+    print(f"[BENCHMARK] {browser_name} (median of {ROUNDS}) {summary}")
+    allure.attach(summary, name="launch_profile_benchmark", attachment_type=allure.attachment_type.TEXT)
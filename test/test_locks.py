@@ -0,0 +1,53 @@
+# Offline checks of the cross-process lock files (utilities/lock_util.py)
+
+import json
+import os
+import socket
+import time
+from multiprocessing import Barrier, Process, Queue
+
+from utilities.lock_util import try_lock, unlock
+
+WORKERS = 6
+
+
+def write_lock(lock_path, pid: int, started: float):
+    lock_path.write_text(json.dumps({"pid": pid, "host": socket.gethostname(), "owner": "test", "time": started}))
+
+
+def take_lock(lock_path, start, done, holders):
+    start.wait()
+    holders.put(any(try_lock(lock_path, f"worker {os.getpid()}") for _ in range(20)))
+    done.wait()     # keep holding (alive) until every worker has tried
+
+
+def test_live_lock_is_not_taken_over(tmp_path):
+    lock_path = tmp_path / "account.lock"
+    write_lock(lock_path, os.getpid(), time.time())
+
+    assert not try_lock(lock_path, "other worker")
+
+
+def test_lock_of_dead_process_is_taken_over(tmp_path):
+    lock_path = tmp_path / "account.lock"
+    write_lock(lock_path, 2 ** 22 + 1, time.time())     # above the largest Linux pid: never alive
+
+    assert try_lock(lock_path, "other worker")
+    assert json.loads(lock_path.read_text())["owner"] == "other worker"
+    unlock(lock_path)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stale_lock_is_taken_over_by_one_worker(tmp_path):
+    for trial in range(5):
+        lock_path = tmp_path / f"account-{trial}.lock"
+        write_lock(lock_path, os.getpid(), 0)       # older than LOCK_TTL_SECONDS
+        start, done, holders = Barrier(WORKERS), Barrier(WORKERS), Queue()
+        workers = [Process(target=take_lock, args=(lock_path, start, done, holders)) for _ in range(WORKERS)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+
+        assert sum(holders.get() for _ in workers) == 1
+    assert sorted(path.suffix for path in tmp_path.iterdir()) == [".lock"] * 5
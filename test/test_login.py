@@ -20,14 +20,14 @@ def test_invalid_userlogin(page):
     expect(login_page.get_login_error()).to_be_visible(timeout=3000)
 
 
-def test_valid_userlogin(page):
+def test_valid_userlogin(page, account):
     home_page = HomePage(page)
     login_page = LoginPage(page)
     home_page.click_my_account()
     home_page.click_login()
 
-    login_page.set_email(Config.email)
-    login_page.set_password(Config.password)
+    login_page.set_email(account["email"])
+    login_page.set_password(account["password"])
     login_page.click_login()
 
     time.sleep(3)
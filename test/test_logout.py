@@ -7,7 +7,7 @@ Test Steps
 
 1. Open the application in the browser.
 2. Navigate to the "My Account" menu and click on "Login".
-3. Enter valid user credentials (email and password).
+3. Enter the credentials of an account leased from the account pool.
 4. Click on the "Login" button.
 5. Verify that the "My Account" page is displayed.
 6. Click on the "Logout" link or button.
@@ -26,12 +26,11 @@ from playwright.sync_api import expect
 from pages.home_page import HomePage
 from pages.login_page import LoginPage
 from pages.my_account_page import MyAccountPage
-from config import Config
 
 
 @pytest.mark.sanity
 @pytest.mark.regression
-def test_user_logout(page):
+def test_user_logout(page, account):
     """
     Automated Test Case: Verify that a logged-in user can successfully log out of the application.
     """
@@ -46,8 +45,8 @@ def test_user_logout(page):
     home_page.click_login()
 
     # --- Step 3: Enter Valid Credentials and Login ---
-    login_page.set_email(Config.email)
-    login_page.set_password(Config.password)
+    login_page.set_email(account["email"])
+    login_page.set_password(account["password"])
     login_page.click_login()
 
     # --- Step 4: Verify 'My Account' Page is Displayed ---
@@ -0,0 +1,52 @@
+# Offline checks of the page object helpers (no browser needed)
+
+import pytest
+
+from pages.base_page import check_selector, route_matches, validate_page_locators
+
+
+@pytest.mark.parametrize("selector", [
+    "#input-email",
+    "input[value='Login']",
+    "text='Logout'",
+    "//div[@id='content']/h2",
+    "button:has-text('Add to Cart')",
+    "#cart > button:not(.disabled)",
+    "a[title=':hover is not a pseudo-class here']",
+])
+def test_valid_selectors(selector):
+    assert check_selector(selector) == []
+
+
+@pytest.mark.parametrize("selector, problem", [
+    ("", "empty selector"),
+    ("input[value='Login'", "unclosed '['"),
+    ("div:nth-child(2))", "unbalanced ')'"),
+    ("a[title='Logout]", "unterminated string (')"),
+    ("text=", "empty text= selector"),
+    ("button:has-txt('Add')", "unknown pseudo-class ':has-txt'"),
+])
+def test_invalid_selectors(selector, problem):
+    assert problem in check_selector(selector)
+
+
+def test_declared_locators_are_valid():
+    assert validate_page_locators() == []
+
+
+@pytest.mark.parametrize("url", [
+    "https://shop.test/index.php?route=checkout/cart/add",               # OpenCart 3
+    "https://shop.test/index.php?route=checkout/cart.add&language=en-gb",  # OpenCart 4
+    "https://shop.test/index.php?route=checkout%2Fcart%7Cadd",             # OpenCart 4.0.2, encoded
+])
+def test_route_matches_every_opencart_version(url):
+    assert route_matches(url, "checkout/cart/add")
+
+
+@pytest.mark.parametrize("url", [
+    "https://shop.test/index.php?route=checkout/cart/addon",
+    "https://shop.test/index.php?route=checkout/cart",
+    "https://shop.test/index.php?other_route=checkout/cart/add",
+])
+def test_route_does_not_match_other_routes(url):
+    assert not route_matches(url, "checkout/cart/add")
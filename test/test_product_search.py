@@ -25,6 +25,7 @@ from pages.home_page import HomePage
 from pages.search_results_page import SearchResultsPage
 from config import Config
 
+@pytest.mark.isolation("page")     # read-only: a new page in a shared context is enough
 def test_product_search(page):
     """
     Automated Test Case: Verify that a user can successfully search for a product.
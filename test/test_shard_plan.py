@@ -0,0 +1,52 @@
+# Offline checks of the duration-balanced CI shard plan (--shard=i/N)
+
+from utilities.shard_util import bucket, plan_shards
+
+TESTS = [f"test/test_shop.py::test_{index}" for index in range(40)]
+DURATIONS = {nodeid: 1.0 + index % 7 for index, nodeid in enumerate(TESTS)}
+
+
+def shard_of(shards: list) -> dict:
+    return {nodeid: index for index, shard in enumerate(shards) for nodeid in shard["tests"]}
+
+
+def test_every_test_runs_in_exactly_one_shard():
+    shards = plan_shards(TESTS, DURATIONS, {}, 4)
+
+    assert sorted(nodeid for shard in shards for nodeid in shard["tests"]) == sorted(TESTS)
+    for shard in shards:
+        assert shard["tests"] == sorted(shard["tests"], key=TESTS.index)     # collection order kept
+
+
+def test_shards_are_balanced():
+    shards = plan_shards(TESTS, DURATIONS, {}, 4)
+    seconds = [shard["seconds"] for shard in shards]
+
+    assert max(seconds) - min(seconds) <= max(DURATIONS.values())
+
+
+def test_group_stays_in_one_shard():
+    groups = {TESTS[1]: "config-account", TESTS[17]: "config-account", TESTS[33]: "config-account"}
+    shards = plan_shards(TESTS, DURATIONS, groups, 4)
+    placement = shard_of(shards)
+
+    assert placement[TESTS[1]] == placement[TESTS[17]] == placement[TESTS[33]]
+    assert shards[placement[TESTS[1]]]["groups"] == ["config-account"]
+
+
+def test_plan_is_stable():
+    before = shard_of(plan_shards(TESTS, DURATIONS, {}, 4))
+    assert before == shard_of(plan_shards(TESTS, DURATIONS, {}, 4))
+
+    # A new test and a small timing change move only a few tests
+    durations = dict(DURATIONS, **{TESTS[5]: DURATIONS[TESTS[5]] * 1.1})
+    after = shard_of(plan_shards(TESTS + ["test/test_shop.py::test_new"], durations, {}, 4))
+    moved = [nodeid for nodeid in TESTS if before[nodeid] != after[nodeid]]
+    assert len(moved) <= len(TESTS) // 4
+
+
+def test_unknown_durations_use_the_average():
+    shards = plan_shards(TESTS[:4], {}, {}, 2)
+
+    assert sum(len(shard["tests"]) for shard in shards) == 4
+    assert bucket(0.01) == 0.1
@@ -0,0 +1,38 @@
+"""
+Test Case: Synthetic Monitoring Flows
+
+===========================================
+Test Steps
+===========================================
+
+1. Run one synthetic monitoring flow (search, add_to_cart, logout) on the page.
+2. Verify the flow succeeded.
+3. Verify the Prometheus metrics contain a successful run and the step histograms.
+
+Expected Result:
+----------------
+Every flow the monitoring daemon runs (python -m utilities.synthetic_monitor_util)
+works against the shop under test and is exported as metrics.
+"""
+
+import pytest
+from utilities.synthetic_monitor_util import FLOWS, MonitorMetrics, execute_flow
+
+
+@pytest.mark.monitoring
+@pytest.mark.shard_group("config-account")     # the logout flow logs in with Config.email
+@pytest.mark.parametrize("flow", list(FLOWS))
+def test_synthetic_flow(request, page, flow):
+    metrics = MonitorMetrics()
+
+    # --- Step 1: Run the flow ---
+    ok, seconds, error = execute_flow(flow, page, request.config.getoption("base_url"), metrics)
+    metrics.observe_flow(flow, seconds, ok, failures=0 if ok else 1, next_run=0)
+
+    # --- Step 2: Verify it succeeded ---
+    assert ok, f"synthetic flow '{flow}' failed: {error}"
+
+    # --- Step 3: Verify the exported metrics ---
+    text = metrics.render()
+    assert f'synthetic_flow_runs_total{{flow="{flow}",outcome="success"}} 1' in text
+    assert f'synthetic_step_duration_seconds_count{{flow="{flow}",step="open_' in text
@@ -0,0 +1,78 @@
+# Offline checks of the visual comparison steps (exact, size, hash, pixels)
+# with synthetic screenshots; no browser and no stored baselines needed
+
+import io
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from utilities.visual_util import VisualChecker  # noqa: E402
+
+
+def screenshot(width: int = 64, height: int = 48, changed_pixels: int = 0, flipped: bool = False) -> bytes:
+    """Horizontal gradient PNG, optionally with a few red pixels or mirrored (a different layout)."""
+    pixels = np.zeros((height, width, 3), dtype=np.uint8)
+    pixels[..., :] = np.linspace(0, 255, width, dtype=np.uint8)[None, :, None]
+    if flipped:
+        pixels = pixels[:, ::-1].copy()
+    pixels.reshape(-1, 3)[:changed_pixels] = (255, 0, 0)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def checker(tmp_path):
+    checker = VisualChecker(baseline_dir=str(tmp_path / "baselines"), output_dir=str(tmp_path / "visual"),
+                            max_diff_ratio=0.01)
+    checker.compare("chromium/HomePage", screenshot())
+    return checker
+
+
+def test_first_screenshot_becomes_the_baseline(checker, tmp_path):
+    assert checker.results[0]["status"] == "new"
+    assert (tmp_path / "baselines" / "chromium" / "HomePage.png").exists()
+
+
+def test_identical_screenshot_matches_without_decoding(checker):
+    result = checker.compare("chromium/HomePage", screenshot())
+
+    assert (result["status"], result["path"]) == ("match", "exact")
+
+
+def test_other_size_is_a_mismatch(checker, tmp_path):
+    result = checker.compare("chromium/HomePage", screenshot(width=80))
+
+    assert (result["status"], result["path"]) == ("mismatch", "size")
+    assert (tmp_path / "visual" / "chromium" / "HomePage-diff.png").exists()
+
+
+def test_other_layout_is_decided_by_the_hash(checker):
+    result = checker.compare("chromium/HomePage", screenshot(flipped=True))
+
+    assert (result["status"], result["path"]) == ("mismatch", "hash")
+    assert result["hash_distance"] > checker.hash_limit
+
+
+def test_few_changed_pixels_are_within_the_limit(checker):
+    result = checker.compare("chromium/HomePage", screenshot(changed_pixels=3))
+
+    assert (result["status"], result["path"]) == ("match", "pixels")
+    assert 0 < result["diff_ratio"] <= checker.max_diff_ratio
+
+
+def test_many_changed_pixels_are_a_mismatch(checker):
+    result = checker.compare("chromium/HomePage", screenshot(changed_pixels=300))
+
+    assert (result["status"], result["path"]) == ("mismatch", "pixels")
+
+
+def test_update_replaces_the_baseline(checker):
+    checker.update = True
+    assert checker.compare("chromium/HomePage", screenshot(flipped=True))["status"] == "updated"
+
+    checker.update = False
+    assert checker.compare("chromium/HomePage", screenshot(flipped=True))["path"] == "exact"
+    assert checker.stats()["status"] == {"match": 1, "mismatch": 0, "new": 1, "updated": 1}
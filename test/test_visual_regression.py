@@ -0,0 +1,57 @@
+"""
+Test Case: Visual Regression of Key Pages
+
+===========================================
+Test Steps
+===========================================
+
+1. Open the Home page and compare it with its visual baseline.
+2. Search for a product and compare the Search Results page.
+3. Open the product (catalog deep link) and compare the Product page.
+4. Add the product to the cart, open the cart and compare the Shopping Cart page.
+
+Expected Result:
+----------------
+Every page looks like its stored baseline. Prices, carousels and the header
+cart total are masked, so only layout changes are reported. The first run
+stores the baselines (visual_baselines/<browser>/).
+"""
+
+import pytest
+from pages.home_page import HomePage
+from pages.product_page import ProductPage
+from pages.search_results_page import SearchResultsPage
+from config import Config
+
+
+@pytest.mark.visual
+@pytest.mark.isolation("page")
+def test_home_page_visual(page, visual_checker):
+    HomePage(page).assert_visual_match(visual_checker)
+
+
+@pytest.mark.visual
+@pytest.mark.isolation("page")
+def test_search_results_page_visual(page, visual_checker):
+    home_page = HomePage(page)
+    home_page.enter_product_name(Config.product_name)
+    home_page.click_search()
+
+    SearchResultsPage(page).assert_visual_match(visual_checker)
+
+
+@pytest.mark.visual
+def test_product_page_visual(page, visual_checker):
+    product_page = ProductPage(page).open(Config.product_name)
+
+    product_page.assert_visual_match(visual_checker)
+
+
+@pytest.mark.visual
+def test_shopping_cart_page_visual(page, visual_checker):
+    product_page = ProductPage(page).open(Config.product_name)
+    product_page.add_to_cart(confirm=True)
+    product_page.click_items_to_navigate_to_cart()
+    shopping_cart_page = product_page.click_view_cart()
+
+    shopping_cart_page.assert_visual_match(visual_checker)
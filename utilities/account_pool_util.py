@@ -0,0 +1,197 @@
+# Pool of pre-registered customer accounts for logged-in tests.
+#
+# Tests that log in with the one Config.email account trample each other's
+# cart and session when they run in parallel. The account fixture leases an
+# account of the pool to one test at a time instead:
+#
+#   - Accounts are registered once per base URL and cached in
+#     .account_cache/<site>.json, so later runs register nothing.
+#   - A lease is a lock file (.account_cache/locks/<site>/<account>.lock)
+#     created with O_CREAT | O_EXCL: atomic across processes (xdist workers
+#     and parallel CI jobs on one machine, see utilities/lock_util.py). Locks
+#     of dead processes or older than LOCK_TTL_SECONDS are taken over.
+#   - The pool grows to the number of xdist workers (or --account-pool-size);
+#     growing is serialized with a pool lock, so two workers never register
+#     the same missing accounts.
+#   - On return the cart and the wishlist of the account are emptied before
+#     the lock is released, so the next test starts from a clean account.
+#
+# Registration, login and the reset use plain HTTP requests (Playwright's
+# APIRequestContext, OpenCart 3 routes), no browser page is needed.
+#
+# Example:
+#     def test_login(page, account):
+#         LoginPage(page).login(account["email"], account["password"])
+
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from utilities.lock_util import LOCK_WAIT_SECONDS, POLL_SECONDS, locked, try_lock, unlock
+from utilities.log_util import get_logger
+from utilities.random_data_util import RandomDataUtil
+
+logger = get_logger(__name__)
+
+CACHE_DIR = ".account_cache"
+LEASE_WAIT_SECONDS = LOCK_WAIT_SECONDS      # max wait for a free account
+
+# Cart item keys ("quantity[<key>]") and wishlist remove links on the OpenCart 3 pages
+CART_KEY_PATTERN = re.compile(r'name="quantity\[([^\]]+)\]"')
+WISHLIST_REMOVE_PATTERN = re.compile(r'route=account/wishlist(?:&amp;|&)remove=(\d+)')
+# Characters replaced in cache and lock file names
+UNSAFE_NAME_PATTERN = re.compile(r"[^\w.-]+")
+
+
+# ========================================================================
+# ACCOUNT POOL
+# ========================================================================
+
+class AccountPool:
+    """
+    Pre-registered accounts of one site, leased exclusively to one test at a time.
+
+    Example:
+        pool = AccountPool(playwright.request, "https://shop.example.com/", size=4)
+        pool.ensure_size()
+        account = pool.lease("test_login")       # {"email", "password", "firstName", ...}
+        ...
+        pool.release(account)                    # empties cart + wishlist, frees the lock
+    """
+
+    def __init__(self, api_request, base_url: str, size: int = 1, cache_dir: str = None, worker: str = "main"):
+        """
+        :param api_request: playwright.request, or a function returning it (to follow driver restarts)
+        """
+        self.api_request = api_request
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.size = max(1, size)
+        self.worker = worker
+        site = UNSAFE_NAME_PATTERN.sub("_", self.base_url.split("://")[-1]).strip("_")
+        cache_dir = Path(cache_dir or CACHE_DIR)
+        self.cache_path = cache_dir / f"{site}.json"
+        self.lock_dir = cache_dir / "locks" / site
+        self.accounts = []
+
+    # ===== Cache =====
+
+    def _load(self) -> list:
+        try:
+            return json.loads(self.cache_path.read_text(encoding="utf-8"))["accounts"]
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def _save(self):
+        """Write atomically, so other workers never read a half written file."""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps({"base_url": self.base_url, "accounts": self.accounts}, indent=1),
+                             encoding="utf-8")
+        os.replace(temp_path, self.cache_path)
+
+    def ensure_size(self) -> list:
+        """Load the cached accounts and register the missing ones (one worker at a time)."""
+        self.accounts = self._load()
+        if len(self.accounts) >= self.size:
+            return self.accounts
+        with locked(self.lock_dir / "pool.lock", f"{self.worker}: growing the pool"):
+            self.accounts = self._load()        # another worker may have grown it meanwhile
+            random_data = RandomDataUtil() if len(self.accounts) < self.size else None
+            while len(self.accounts) < self.size:
+                account = {
+                    "firstName": random_data.get_first_name(),
+                    "lastName": random_data.get_last_name(),
+                    "email": f"pool.{random_data.get_random_alphanumeric(12).lower()}@example.com",
+                    "telephone": random_data.get_random_numeric(10),
+                    "password": random_data.get_random_alphanumeric(12),
+                }
+                self.register(account)
+                self.accounts.append(account)
+                self._save()
+                logger.info("[ACCOUNTS] Registered pool account %d/%d: %s", len(self.accounts), self.size, account["email"])
+        return self.accounts
+
+    # ===== Leases =====
+
+    def _lock_path(self, account: dict) -> Path:
+        return self.lock_dir / f"{UNSAFE_NAME_PATTERN.sub('_', account['email'])}.lock"
+
+    def lease(self, test_id: str, timeout: float = LEASE_WAIT_SECONDS) -> dict:
+        """Return a free account, locked for this test (waits while all are leased)."""
+        if not self.accounts:
+            self.ensure_size()
+        # Each worker starts looking at a different account, fewer collisions
+        offset = sum(map(ord, self.worker)) % len(self.accounts)
+        order = self.accounts[offset:] + self.accounts[:offset]
+        deadline = time.monotonic() + timeout
+        while True:
+            for account in order:
+                if try_lock(self._lock_path(account), f"{self.worker}: {test_id}"):
+                    logger.info("[ACCOUNTS] %s leased %s", test_id, account["email"])
+                    return dict(account)
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"[FAIL] No free account in the pool of {len(self.accounts)} after {timeout:.0f}s "
+                                   f"(locks in {self.lock_dir})")
+            time.sleep(POLL_SECONDS)
+
+    def release(self, account: dict, reset: bool = True):
+        """Empty the account's cart and wishlist, then free it for the next test."""
+        try:
+            if reset:
+                self.reset(account)
+        except Exception as e:
+            logger.warning("[ACCOUNTS] Could not reset %s: %s", account["email"], e)
+        finally:
+            unlock(self._lock_path(account))
+
+    # ===== HTTP (OpenCart 3 routes) =====
+
+    def url_for(self, route: str) -> str:
+        return f"{self.base_url}index.php?route={route}"
+
+    @contextmanager
+    def _session(self):
+        api_request = self.api_request() if callable(self.api_request) else self.api_request
+        context = api_request.new_context(base_url=self.base_url)
+        try:
+            yield context
+        finally:
+            context.dispose()
+
+    def register(self, account: dict):
+        with self._session() as session:
+            response = session.post(self.url_for("account/register"), form={
+                "firstname": account["firstName"],
+                "lastname": account["lastName"],
+                "email": account["email"],
+                "telephone": account["telephone"],
+                "password": account["password"],
+                "confirm": account["password"],
+                "newsletter": "0",
+                "agree": "1",
+            })
+            if "account/success" not in response.url:
+                raise RuntimeError(f"[FAIL] Registration of {account['email']} failed (ended on {response.url})")
+
+    def _login(self, session, account: dict):
+        response = session.post(self.url_for("account/login"),
+                                form={"email": account["email"], "password": account["password"]})
+        if "account/account" not in response.url:
+            raise RuntimeError(f"[FAIL] Login of {account['email']} failed (ended on {response.url})")
+
+    def reset(self, account: dict):
+        """Remove every cart item and wishlist entry of the account."""
+        with self._session() as session:
+            self._login(session, account)
+            cart_keys = CART_KEY_PATTERN.findall(session.get(self.url_for("checkout/cart")).text())
+            for key in cart_keys:
+                session.post(self.url_for("checkout/cart/remove"), form={"key": key})
+            product_ids = set(WISHLIST_REMOVE_PATTERN.findall(session.get(self.url_for("account/wishlist")).text()))
+            for product_id in product_ids:
+                session.get(self.url_for(f"account/wishlist&remove={product_id}"))
+            if cart_keys or product_ids:
+                logger.info("[ACCOUNTS] Reset %s: %d cart items, %d wishlist entries removed",
+                            account["email"], len(cart_keys), len(product_ids))
@@ -0,0 +1,148 @@
+# Zero-copy Allure attachments.
+#
+# allure-pytest copies every attached file into the results directory
+# (reports/allure-results), so a failure screenshot or video is written twice.
+# install_linking_logger() replaces allure's file writer with one that puts
+# the file there as a hardlink instead - no bytes are written at all. When a
+# hardlink is not possible (results directory on another filesystem, or a
+# filesystem without hardlinks) the file is copied once, streamed in chunks
+# (sendfile on Linux), never read into memory as a whole. A file attached
+# again (e.g. the same deduplicated screenshot for several tests) is linked
+# to the first copy in the results directory instead of being copied again.
+#
+# Files attached with attach_artifact(..., move=True) are moved instead of
+# linked: the results directory then holds the only copy.
+#
+# All allure.attach.file() calls go through it, nothing changes for callers.
+#
+# A linked attachment shares its inode with the artifact, so artifact files
+# must never be rewritten in place: the next run would silently change the
+# attachments of earlier runs still in the results. Screenshots, traces and
+# downloaded videos are written through new_file(), which writes a temp file
+# and os.replace()s it over the old one (a new inode every time). Local
+# videos need nothing: Playwright gives every recording a new random name.
+
+import errno
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+
+import allure
+import allure_commons
+from allure_commons import hookimpl
+from allure_commons.logger import AllureFileLogger
+
+from utilities.log_util import get_logger
+
+logger = get_logger(__name__)
+
+
+@contextmanager
+def new_file(path):
+    """
+    Write an artifact as a new file: yields a temp path to write to, which
+    replaces path when the block succeeds (and is removed when it fails).
+
+    Example:
+        with new_file("reports/traces/test_login_trace.zip") as tmp_path:
+            context.tracing.stop(path=tmp_path)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+class LinkingFileLogger(AllureFileLogger):
+    """AllureFileLogger that hardlinks or moves attached files instead of copying them."""
+
+    def __init__(self, report_dir):
+        super().__init__(report_dir, clean=False)
+        self.move_sources = set()   # sources to move instead of link (see attach_artifact)
+        self.moved = {}             # moved source -> its path in the results
+        self._copies = {}           # (device, inode) of a copied source -> its copy in the results
+
+    @hookimpl
+    def report_attached_file(self, source, file_name):
+        source = Path(source)
+        tmp_destination = self._report_dir / f"{file_name}.tmp"
+        final_destination = self._report_dir / file_name
+        if str(source) in self.move_sources:
+            self.move_sources.discard(str(source))
+            self._move(source, tmp_destination)
+            self.moved[str(source)] = final_destination
+        else:
+            self._link(source, tmp_destination, final_destination)
+        os.replace(tmp_destination, final_destination)
+
+    def _link(self, source: Path, destination: Path, final_destination: Path):
+        status = source.stat()
+        key = (status.st_dev, status.st_ino)
+        # Copied once before: link to that copy (same filesystem as the destination)
+        origin = self._copies.get(key, source)
+        try:
+            os.link(origin, destination)
+            logger.debug("[ATTACH] Linked %s", source)
+        except OSError:
+            self._copy(source, destination)
+            self._copies[key] = final_destination
+
+    def _move(self, source: Path, destination: Path):
+        try:
+            os.replace(source, destination)
+            logger.debug("[ATTACH] Moved %s", source)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        self._copy(source, destination)
+        source.unlink()
+
+    def _copy(self, source: Path, destination: Path):
+        shutil.copyfile(source, destination)      # streamed, constant memory
+        logger.debug("[ATTACH] Hardlink not possible, copied %s", source)
+
+
+def install_linking_logger(config):
+    """
+    Swap allure-pytest's file writer for a LinkingFileLogger (no-op without
+    --alluredir). Call after allure's pytest_configure, e.g. in pytest_sessionstart.
+    """
+    manager = allure_commons.plugin_manager
+    for plugin in manager.get_plugins():
+        if type(plugin) is AllureFileLogger:
+            name = manager.get_name(plugin)
+            linking = LinkingFileLogger(config.option.allure_report_dir)
+            manager.unregister(plugin)
+            manager.register(linking, name)
+
+            # Cleanups run last-in first-out: put allure's own writer back before allure unregisters it
+            def restore():
+                manager.unregister(linking)
+                manager.register(plugin, name)
+
+            config.add_cleanup(restore)
+            return linking
+    return None
+
+
+def attach_artifact(path: str, name: str, attachment_type=None, extension: str = None, move: bool = False) -> str:
+    """
+    Attach a file to the Allure report. With move=True the file is moved into
+    the results directory (only when the linking writer is installed).
+
+    :return: where the file is now (the results directory after a move)
+    """
+    linking = next((plugin for plugin in allure_commons.plugin_manager.get_plugins()
+                    if isinstance(plugin, LinkingFileLogger)), None)
+    if move and linking:
+        linking.move_sources.add(str(path))
+    allure.attach.file(path, name=name, attachment_type=attachment_type, extension=extension)
+    if move and linking and str(path) in linking.moved:
+        return str(linking.moved.pop(str(path)))
+    return str(path)
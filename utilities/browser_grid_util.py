@@ -0,0 +1,297 @@
+# Remote browser grid.
+#
+# Instead of launching browsers inside every pytest-xdist worker, the workers
+# connect over WebSocket to one or more Playwright browser servers. The
+# BrowserGrid coordinator picks the least loaded healthy server for every new
+# BrowserContext, health-checks the servers and reconnects when a connection
+# drops.
+#
+# Limitation: a Playwright browser server does not report its load, so "load"
+# is the number of contexts this worker has open on each server. With one
+# test at a time per worker that is 0 or 1: the balancing is effectively a
+# rotation, spread across workers by starting each worker on a different
+# server (worker_index). Servers shared by several CI jobs are not balanced.
+#
+# Launch profiles: the server launches the browser with the options sent in
+# the x-playwright-launch-options header (camelCase, as the server expects).
+# A server only accepts a profile's browser args and firefoxUserPrefs when it
+# runs with "playwright run-server --unsafe", otherwise it silently drops them
+# (headless, channel and the context options still apply). The launcher below
+# starts its servers with --unsafe.
+#
+# Videos: a context on a server records its video on the server (also with
+# record_video_dir, which only switches recording on). page.video.path()
+# raises for connected browsers, save_video() streams the file here instead.
+#
+# Start local servers for testing (see the launcher at the bottom):
+#   python -m utilities.browser_grid_util --count 3 --port 3000
+# then run:
+#   pytest --browser-endpoint=ws://localhost:3000/,ws://localhost:3001/,ws://localhost:3002/ -n 6
+
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from playwright.sync_api import sync_playwright
+
+from utilities.attachment_util import new_file
+from utilities.launch_profile_util import prepare_context, profile_context_options, profile_launch_options
+from utilities.log_util import get_logger
+
+logger = get_logger(__name__)
+
+
+def parse_endpoints(value: str) -> list:
+    """Split the --browser-endpoint option into a list of ws:// URLs."""
+    return [endpoint.strip() for endpoint in str(value or "").split(",") if endpoint.strip()]
+
+
+def server_launch_options(options: dict) -> dict:
+    """Python launch option names -> the camelCase names of the server protocol (firefox_user_prefs -> firefoxUserPrefs)."""
+    def camel_case(name: str) -> str:
+        first, *rest = name.split("_")
+        return first + "".join(word.capitalize() for word in rest)
+    return {camel_case(name): value for name, value in options.items()}
+
+
+def save_video(page, path: str):
+    """
+    Download the video of a closed page from its browser server to path.
+    Returns the path, or None when the page has no video or the download fails.
+    """
+    if not page.video:
+        return None
+    try:
+        with new_file(path) as tmp_path:
+            page.video.save_as(tmp_path)
+    except Exception as e:
+        logger.warning("[GRID] Could not download the video of %s: %s", Path(path).stem, str(e).splitlines()[0])
+        return None
+    return str(path)
+
+
+def is_port_open(endpoint: str, timeout: float = 1.0) -> bool:
+    """Cheap TCP health check of a browser server."""
+    url = urlparse(endpoint)
+    try:
+        with socket.create_connection((url.hostname, url.port or 80), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class BrowserServer:
+    """State of one remote browser server as seen by this worker."""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.browsers = {}          # (browser name, launch profile) -> connected Browser
+        self.open_contexts = 0
+        self.failures = 0
+        self.retry_at = 0.0         # do not try again before this time (backoff)
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.retry_at
+
+    def mark_failed(self, reason: str):
+        self.failures += 1
+        backoff = min(2 ** self.failures, 30)
+        self.retry_at = time.monotonic() + backoff
+        logger.warning("[GRID] %s unavailable (%s), retry in %ss", self.endpoint, reason, backoff)
+
+    def mark_healthy(self):
+        self.failures = 0
+        self.retry_at = 0.0
+
+
+class BrowserGrid:
+    """
+    Load-balances BrowserContexts across remote Playwright browser servers.
+
+    Example:
+        grid = BrowserGrid(playwright, ["ws://localhost:3000/", "ws://localhost:3001/"])
+        context = grid.new_context("chromium", record_video_dir="reports/videos")
+        ...
+        context.close()     # load is updated automatically
+        grid.close_all()
+    """
+
+    def __init__(self, playwright, endpoints: list, headless: bool = True,
+                 launch_options: dict = None, worker_index: int = 0):
+        if not endpoints:
+            raise ValueError("[FAIL] BrowserGrid needs at least one endpoint")
+        self.playwright = playwright
+        self.launch_options = dict(launch_options or {}, headless=headless)
+        # Rotate the list per worker so workers do not all start on the same server
+        shift = worker_index % len(endpoints)
+        self.servers = [BrowserServer(e) for e in endpoints[shift:] + endpoints[:shift]]
+
+    # ===== Connections =====
+
+    def _connect(self, server: BrowserServer, browser_name: str, profile: str = None):
+        """Return a connected browser on the server, reconnecting if the connection dropped."""
+        browser = server.browsers.get((browser_name, profile))
+        if browser is not None and browser.is_connected():
+            return browser
+
+        # The server launches the browser with these options (one browser per launch profile)
+        options = dict(self.launch_options, **profile_launch_options(profile, browser_name, self.launch_options["headless"]))
+        browser_type = getattr(self.playwright, browser_name)
+        browser = browser_type.connect(
+            server.endpoint,
+            timeout=10000,
+            headers={"x-playwright-launch-options": json.dumps(server_launch_options(options))},
+        )
+        browser.on("disconnected", lambda _: self._on_disconnected(server, browser, browser_name, profile))
+        server.browsers[(browser_name, profile)] = browser
+        server.mark_healthy()
+        logger.info("[GRID] Connected %s (profile=%s) on %s", browser_name, profile, server.endpoint)
+        return browser
+
+    def _on_disconnected(self, server: BrowserServer, browser, browser_name: str, profile: str = None):
+        # Browsers closed on purpose (close_all) are removed from server.browsers first
+        if server.browsers.get((browser_name, profile)) is not browser:
+            return
+        server.browsers.pop((browser_name, profile))
+        server.open_contexts = 0
+        server.mark_failed("connection dropped")
+
+    # ===== Contexts =====
+
+    def new_context(self, browser_name: str, profile: str = None, **context_options):
+        """
+        Create a BrowserContext on the least loaded healthy server
+        (with the launch profile's defaults).
+        Falls through to the next server when one cannot be reached.
+        """
+        candidates = sorted(
+            (server for server in self.servers if server.available),
+            key=lambda server: server.open_contexts
+        ) or sorted(self.servers, key=lambda server: server.retry_at)
+
+        last_error = None
+        for server in candidates:
+            if not server.browsers.get((browser_name, profile)) and not is_port_open(server.endpoint):
+                server.mark_failed("port closed")
+                last_error = ConnectionError(f"{server.endpoint} is not reachable")
+                continue
+            try:
+                browser = self._connect(server, browser_name, profile)
+                context = browser.new_context(**dict(profile_context_options(profile), **context_options))
+                prepare_context(context, profile)
+            except Exception as e:
+                server.browsers.pop((browser_name, profile), None)
+                server.mark_failed(str(e).splitlines()[0])
+                last_error = e
+                continue
+
+            server.open_contexts += 1
+            context.on("close", lambda _: self._on_context_closed(server))
+            return context
+
+        raise ConnectionError(f"[FAIL] No browser server available: {last_error}")
+
+    def _on_context_closed(self, server: BrowserServer):
+        server.open_contexts = max(server.open_contexts - 1, 0)
+
+    def load(self) -> dict:
+        """Open contexts per server, counted by this worker only (the servers do not report their load)."""
+        return {server.endpoint: server.open_contexts for server in self.servers}
+
+    def close_all(self):
+        """Disconnect from all servers (the servers keep running)."""
+        for server in self.servers:
+            browsers = list(server.browsers.values())
+            # Cleared first, so the "disconnected" handler does not take this for a dropped server
+            server.browsers.clear()
+            server.open_contexts = 0
+            for browser in browsers:
+                try:
+                    browser.close()
+                except Exception:
+                    pass
+
+    def restart_driver(self):
+        """Disconnect and start a fresh local Playwright driver (the servers keep running)."""
+        self.close_all()
+        self.playwright.stop()
+        self.playwright = sync_playwright().start()
+
+
+# ========================================================================
+# LOCAL LAUNCHER: start N browser servers on this machine
+# ========================================================================
+
+def start_servers(count: int, first_port: int, host: str = "localhost") -> list:
+    """
+    Start N Playwright browser servers ("playwright run-server", the Python
+    counterpart of BrowserType.launchServer) and wait until they listen.
+    --unsafe lets the servers apply the launch profiles' browser args and prefs.
+    Returns a list of (process, endpoint).
+    """
+    servers = []
+    for port in range(first_port, first_port + count):
+        process = subprocess.Popen(
+            [sys.executable, "-m", "playwright", "run-server", "--port", str(port), "--host", host, "--unsafe"],
+            stdout=subprocess.DEVNULL,
+            # Own process group, so stopping also stops the node driver child
+            start_new_session=(os.name != "nt"),
+        )
+        servers.append((process, f"ws://{host}:{port}/"))
+
+    deadline = time.monotonic() + 30
+    for process, endpoint in servers:
+        while not is_port_open(endpoint):
+            if process.poll() is not None or time.monotonic() > deadline:
+                stop_servers(servers)
+                raise RuntimeError(f"[FAIL] Browser server did not start: {endpoint}")
+            time.sleep(0.2)
+    return servers
+
+
+def stop_servers(servers: list):
+    """Terminate the server processes started by start_servers."""
+    for process, _ in servers:
+        if process.poll() is None:
+            if os.name != "nt":
+                os.killpg(process.pid, signal.SIGTERM)
+            else:
+                process.terminate()
+    for process, _ in servers:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Start N local Playwright browser servers")
+    parser.add_argument("--count", type=int, default=os.cpu_count() or 2, help="Number of servers")
+    parser.add_argument("--port", type=int, default=3000, help="Port of the first server")
+    parser.add_argument("--host", default="localhost")
+    args = parser.parse_args(argv)
+
+    servers = start_servers(args.count, args.port, args.host)
+    endpoints = ",".join(endpoint for _, endpoint in servers)
+    print(f"[OK] {len(servers)} browser servers running")
+    print(f"[OK] pytest --browser-endpoint={endpoints}")
+    try:
+        while all(process.poll() is None for process, _ in servers):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("[CLEANUP] Stopping browser servers...")
+        stop_servers(servers)
+
+
+if __name__ == "__main__":
+    main()
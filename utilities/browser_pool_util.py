@@ -0,0 +1,92 @@
+# This module keeps one Playwright driver per worker and launches each
+# browser type (chromium, firefox, webkit) only when a test first needs it.
+# Browsers stay open for the whole session; every test still gets its own
+# fresh BrowserContext, so tests stay isolated (unless a cheaper isolation
+# level is chosen, see utilities/isolation_util.py).
+
+from playwright.sync_api import sync_playwright
+
+from utilities.launch_profile_util import prepare_context, profile_context_options, profile_launch_options
+from utilities.log_util import get_logger
+
+logger = get_logger(__name__)
+
+SUPPORTED_BROWSERS = ("chromium", "firefox", "webkit")
+
+
+def parse_browser_list(value: str) -> list:
+    """
+    Convert the --browser option into a list of browser names.
+    Example: "chromium, Firefox" -> ["chromium", "firefox"]
+    """
+    browsers = []
+    for name in str(value).split(","):
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in SUPPORTED_BROWSERS:
+            raise ValueError(f"[FAIL] Unsupported browser: {name}")
+        if name not in browsers:
+            browsers.append(name)
+    if not browsers:
+        raise ValueError("[FAIL] No browser given in --browser")
+    return browsers
+
+
+class BrowserPool:
+    """
+    Lazily launched browsers sharing a single Playwright driver.
+
+    Example:
+        pool = BrowserPool(playwright, headless=True)
+        browser = pool.get("firefox")   # launched on first use, reused afterwards
+        context = pool.new_context("chromium", profile="lean")
+        pool.close_all()
+    """
+
+    def __init__(self, playwright, headless: bool = True, launch_options: dict = None):
+        self.playwright = playwright
+        self.headless = headless
+        self.launch_options = launch_options or {}
+        self.browsers = {}          # (browser name, launch profile) -> Browser
+
+    def get(self, browser_name: str, profile: str = None):
+        """Return a connected browser of the given type and launch profile, launching it if needed."""
+        browser_name = browser_name.lower()
+        browser = self.browsers.get((browser_name, profile))
+        if browser is not None and browser.is_connected():
+            return browser
+
+        if browser_name not in SUPPORTED_BROWSERS:
+            raise ValueError(f"[FAIL] Unsupported browser: {browser_name}")
+
+        options = dict(self.launch_options, **profile_launch_options(profile, browser_name, self.headless))
+        logger.info("[OK] Launching browser: %s (profile=%s, headless=%s)", browser_name, profile, options["headless"])
+        browser_type = getattr(self.playwright, browser_name)
+        browser = browser_type.launch(**options)
+        self.browsers[(browser_name, profile)] = browser
+        return browser
+
+    def new_context(self, browser_name: str, profile: str = None, **context_options):
+        """Create a new BrowserContext on the given browser type (with the launch profile's defaults)."""
+        context = self.get(browser_name, profile).new_context(**dict(profile_context_options(profile), **context_options))
+        prepare_context(context, profile)
+        return context
+
+    def close(self, browser_name: str):
+        """Close one browser type, all profiles (it is launched again on the next get())."""
+        for key in [key for key in self.browsers if key[0] == browser_name.lower()]:
+            browser = self.browsers.pop(key)
+            if browser.is_connected():
+                browser.close()
+
+    def close_all(self):
+        """Close every launched browser."""
+        for browser_name in {browser_name for browser_name, _ in self.browsers}:
+            self.close(browser_name)
+
+    def restart_driver(self):
+        """Close all browsers and start a fresh Playwright driver (frees a leaking driver)."""
+        self.close_all()
+        self.playwright.stop()
+        self.playwright = sync_playwright().start()
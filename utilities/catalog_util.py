@@ -0,0 +1,188 @@
+# Product catalog index for deep links to product pages.
+#
+# Reaching a product page through the UI (Home -> search -> results -> product)
+# costs two full page loads. The catalog index maps product names to product
+# ids, URLs and prices, so ProductPage.open(product_name) can go straight to
+# the product.
+#
+# The index is built once per base URL by fetching the category pages as plain
+# HTML (no rendering) and is cached on disk (.catalog_cache/) for a limited
+# time (--catalog-ttl hours). Products that are not in any category are looked
+# up with one search request and added to the index. On a cold cache one
+# worker crawls (under a lock file), the other xdist workers wait for it and
+# read its result.
+#
+# The catalog only keeps the data: the fetch function (the current test's
+# page.request / context.request) is passed on every get_catalog() call.
+
+import html
+import json
+import os
+import re
+import time
+from pathlib import Path
+from urllib.parse import quote_plus
+
+from utilities.lock_util import locked
+from utilities.log_util import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_DIR = ".catalog_cache"
+TTL_HOURS = 24.0
+BUILD_WAIT_SECONDS = 600        # max wait for another worker's crawl
+
+PRODUCT_LINK_PATTERN = re.compile(r'<h4>\s*<a href="([^"]*?product_id=(\d+)[^"]*)"\s*>([^<]+)</a>')
+PRICE_PATTERN = re.compile(r'class="price(?:-new)?">\s*([^<\s][^<]*?)\s*<')
+CATEGORY_PATTERN = re.compile(r'href="([^"]*?route=product/category(?:&amp;|&)path=([\d_]+))"')
+
+
+def configure_catalog(cache_dir: str = None, ttl_hours: float = None):
+    """Change the cache folder / time to live (called from conftest.py)."""
+    global CACHE_DIR, TTL_HOURS
+    if cache_dir is not None:
+        CACHE_DIR = cache_dir
+    if ttl_hours is not None:
+        TTL_HOURS = ttl_hours
+
+
+def parse_products(page_html: str) -> dict:
+    """Products listed on a category / search page: name -> {product_id, price}."""
+    products = {}
+    for block in page_html.split('class="product-thumb')[1:]:
+        link = PRODUCT_LINK_PATTERN.search(block)
+        if not link:
+            continue
+        price = PRICE_PATTERN.search(block)
+        products[html.unescape(link.group(3)).strip()] = {
+            "product_id": int(link.group(2)),
+            "price": html.unescape(price.group(1)).strip() if price else None,
+        }
+    return products
+
+
+def parse_category_paths(page_html: str) -> list:
+    """Category path ids ("20", "20_27", ...) linked from a page."""
+    return sorted({match.group(2) for match in CATEGORY_PATTERN.finditer(page_html)})
+
+
+class CatalogIndex:
+    """
+    Product name -> product id / URL / price for one shop.
+
+    :param base_url: shop base URL, e.g. https://tutorialsninja.com/demo/
+    :param fetch: function url -> HTML text (e.g. using page.request)
+
+    Example:
+        catalog = CatalogIndex(base_url, fetch=lambda url: page.request.get(url).text())
+        page.goto(catalog.find("MacBook")["url"])
+    """
+
+    def __init__(self, base_url: str, fetch, cache_dir: str = None, ttl_hours: float = None):
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.fetch = fetch
+        cache_name = re.sub(r"[^\w.-]+", "_", self.base_url.split("://")[-1]).strip("_")
+        self.cache_path = Path(cache_dir or CACHE_DIR) / f"{cache_name}.json"
+        self.ttl_seconds = (TTL_HOURS if ttl_hours is None else ttl_hours) * 3600
+        self.products = {}
+        self._load()
+
+    # ===== Cache =====
+
+    def _read_cache(self, built_since: float = None) -> bool:
+        """Load the cached index if it is fresh (or was built after built_since)."""
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        built_at = data.get("built_at", 0)
+        if time.time() - built_at < self.ttl_seconds or (built_since is not None and built_at >= built_since):
+            self.products = data["products"]
+            return True
+        return False
+
+    def _load(self):
+        if self._read_cache():
+            return
+        waiting_since = time.time()
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        with locked(self.cache_path.with_suffix(".lock"), f"{worker}: building the catalog", timeout=BUILD_WAIT_SECONDS):
+            # Built by another worker while this one waited for the lock (also with --catalog-ttl=0)
+            if self._read_cache(built_since=waiting_since):
+                return
+            self.build()
+
+    def _save(self):
+        """Write atomically, so parallel workers never read a half written file."""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps({
+            "base_url": self.base_url,
+            "built_at": time.time(),
+            "products": self.products,
+        }, indent=1), encoding="utf-8")
+        os.replace(temp_path, self.cache_path)
+
+    # ===== Crawling =====
+
+    def url_for(self, route: str) -> str:
+        return f"{self.base_url}index.php?route={route}"
+
+    def build(self):
+        """Crawl all category pages (100 products per page) and save the index."""
+        start = time.perf_counter()
+        self.products = {}
+        paths = parse_category_paths(self.fetch(self.base_url))
+        for path in paths:
+            found = parse_products(self.fetch(self.url_for(f"product/category&path={path}&limit=100")))
+            for name, product in found.items():
+                self.products.setdefault(name, product)
+        self._save()
+        logger.info("[CATALOG] Indexed %d products from %d categories in %.1fs",
+                    len(self.products), len(paths), time.perf_counter() - start)
+
+    def _search(self, product_name: str):
+        """One search request for a product that no category lists."""
+        found = parse_products(self.fetch(self.url_for(f"product/search&search={quote_plus(product_name)}")))
+        if found:
+            self.products.update(found)
+            self._save()
+
+    # ===== Lookup =====
+
+    def find(self, product_name: str, refresh: bool = False) -> dict:
+        """
+        Return {"name", "product_id", "price", "url"} for a product.
+        refresh=True looks the product up again (e.g. when the cached id is stale).
+        """
+        name = self._match(product_name)
+        if refresh or name is None:
+            self._search(product_name)
+            name = self._match(product_name)
+        if name is None:
+            raise LookupError(f"[FAIL] Product not found in catalog: {product_name}")
+        product = self.products[name]
+        return dict(product, name=name, url=self.url_for(f"product/product&product_id={product['product_id']}"))
+
+    def _match(self, product_name: str):
+        """Exact name, otherwise case-insensitive match (None if unknown)."""
+        if product_name in self.products:
+            return product_name
+        lowered = product_name.lower()
+        return next((name for name in self.products if name.lower() == lowered), None)
+
+
+# Catalogs already loaded in this process (one per base URL)
+_CATALOGS = {}
+
+
+def get_catalog(base_url: str, fetch) -> CatalogIndex:
+    """
+    Return the (cached) CatalogIndex for a shop. fetch replaces the one of the
+    earlier caller, whose page / context may be closed by now.
+    """
+    if base_url not in _CATALOGS:
+        _CATALOGS[base_url] = CatalogIndex(base_url, fetch)
+    catalog = _CATALOGS[base_url]
+    catalog.fetch = fetch
+    return catalog
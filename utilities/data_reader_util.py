@@ -1,6 +1,9 @@
 import json
 import csv
-import openpyxl
+
+from utilities.log_util import get_logger
+
+logger = get_logger(__name__)
 
 
 def read_json_data(file_path: str):
@@ -20,7 +23,7 @@ def read_json_data(file_path: str):
             #data.append((record["email"], record["password"], record["validity"]))
             data.append(tuple(record.values())) # Convert dictionary values to tuple (preserve order of keys)
     except Exception as e:
-        print(f"Error reading JSON file: {e}")
+        logger.error("Error reading JSON file: %s", e)
     return data
 
 
@@ -37,7 +40,7 @@ def read_csv_data(file_path: str):
             #data.append((row["email"], row["password"], row["validity"]))
             data.append(tuple(row.values()))
     except Exception as e:
-        print(f"Error reading CSV file: {e}")
+        logger.error("Error reading CSV file: %s", e)
     return data
 
 
@@ -46,6 +49,8 @@ def read_excel_data(file_path: str, sheet_name: str = None):
     Reads test data from an Excel file and returns a list of tuples.
     Assumes the first row contains headers (email, password, validity).
     """
+    import openpyxl     # slow to import, only needed for Excel files
+
     data = []
     try:
         workbook = openpyxl.load_workbook(file_path)
@@ -53,5 +58,5 @@ def read_excel_data(file_path: str, sheet_name: str = None):
         for row in sheet.iter_rows(min_row=2, values_only=True):
             data.append(row)
     except Exception as e:
-        print(f"Error reading Excel file: {e}")
+        logger.error("Error reading Excel file: %s", e)
     return data
\ No newline at end of file
@@ -0,0 +1,214 @@
+# Lazy, shardable datasets for data-driven tests.
+#
+# Large CSV files are never loaded completely. A small index of byte offsets
+# (one integer per row) is built once and cached; tests are parametrized with
+# row ids only, and each test reads just its own row from disk when it runs.
+#
+# Used from conftest.py through the "dataset" marker:
+#
+#     @pytest.mark.dataset("testdatafiles/logindata.csv", stratify="expected")
+#     def test_login_data_driven(page, data_row):
+#         email = data_row["email"]
+#
+# Row selection (all optional, see conftest.py options):
+#     --data-shard=2/4                 only rows of shard 2 out of 4 (CI machines)
+#     --data-sample=random:100         100 random rows
+#     --data-sample=stratified:100     100 rows spread evenly over the stratify column
+#     --data-sample=failed-first:100   previously failed rows first, then random rows
+
+import csv
+import io
+import json
+import os
+import random
+import re
+from pathlib import Path
+
+
+class LazyDataset:
+    """
+    Row-by-id access to a data file.
+    CSV files (one record per line) are indexed by byte offset and read lazily;
+    small JSON / Excel files are read completely.
+    """
+
+    def __init__(self, file_path: str, stratify: str = None, cache=None):
+        self.file_path = Path(file_path)
+        self.stratify = stratify
+        self.cache = cache              # pytest config.cache (optional)
+        self.offsets = []               # CSV: byte offset of every data row
+        self.rows = None                # JSON / Excel: all rows (small files only)
+        self.columns = []
+        self.strata = {}                # stratify value -> list of row ids
+        self._load_index()
+
+    # ===== Index =====
+
+    def _cache_key(self) -> str:
+        safe_name = re.sub(r"[^\w.-]", "_", str(self.file_path))
+        return f"dataset/{safe_name}/{self.stratify or 'none'}"
+
+    def _file_signature(self) -> list:
+        stat = os.stat(self.file_path)
+        return [stat.st_size, int(stat.st_mtime)]
+
+    def _load_index(self):
+        if self.file_path.suffix.lower() != ".csv":
+            self._load_small_file()
+            return
+
+        signature = self._file_signature()
+        if self.cache is not None:
+            cached = self.cache.get(self._cache_key(), None)
+            if cached and cached.get("signature") == signature:
+                self.columns = cached["columns"]
+                self.offsets = cached["offsets"]
+                self.strata = cached["strata"]
+                return
+
+        self._build_csv_index()
+        if self.cache is not None:
+            self.cache.set(self._cache_key(), {
+                "signature": signature,
+                "columns": self.columns,
+                "offsets": self.offsets,
+                "strata": self.strata,
+            })
+
+    def _build_csv_index(self):
+        """Scan the file once, remembering only where each row starts."""
+        with open(self.file_path, "rb") as file:
+            header = file.readline()
+            self.columns = next(csv.reader([header.decode("utf-8-sig")]))
+            stratify_index = self.columns.index(self.stratify) if self.stratify in self.columns else None
+
+            offset = file.tell()
+            for line in iter(file.readline, b""):
+                if line.strip():
+                    row_id = len(self.offsets)
+                    self.offsets.append(offset)
+                    if stratify_index is not None:
+                        text = line.decode("utf-8").rstrip("\r\n")
+                        # Plain split is much faster; csv is only needed for quoted values
+                        fields = next(csv.reader([text])) if '"' in text else text.split(",")
+                        self.strata.setdefault(fields[stratify_index], []).append(row_id)
+                offset = file.tell()
+
+    def _load_small_file(self):
+        """JSON and Excel files are small in practice, so they are read fully."""
+        if self.file_path.suffix.lower() == ".json":
+            with open(self.file_path, encoding="utf-8") as file:
+                records = json.load(file)
+            self.columns = list(records[0].keys()) if records else []
+            self.rows = [tuple(record.values()) for record in records]
+        else:
+            import openpyxl
+
+            sheet = openpyxl.load_workbook(self.file_path, read_only=True).active
+            all_rows = list(sheet.iter_rows(values_only=True))
+            self.columns = list(all_rows[0]) if all_rows else []
+            self.rows = all_rows[1:]
+
+        if self.stratify in self.columns:
+            position = self.columns.index(self.stratify)
+            for row_id, row in enumerate(self.rows):
+                self.strata.setdefault(str(row[position]), []).append(row_id)
+
+    # ===== Row Access =====
+
+    def __len__(self):
+        return len(self.rows) if self.rows is not None else len(self.offsets)
+
+    def get_row(self, row_id: int) -> dict:
+        """Read a single row (as a dict keyed by column name)."""
+        if self.rows is not None:
+            return dict(zip(self.columns, self.rows[row_id]))
+
+        with open(self.file_path, "rb") as file:
+            file.seek(self.offsets[row_id])
+            line = file.readline().decode("utf-8")
+        values = next(csv.reader(io.StringIO(line)))
+        return dict(zip(self.columns, values))
+
+
+# ========================================================================
+# ROW SELECTION (SHARDING AND SAMPLING)
+# ========================================================================
+
+def parse_shard(value: str):
+    """Parse "i/N" (1-based) into (i, N). Returns None when not set."""
+    if not value:
+        return None
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value)
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise ValueError(f"[FAIL] Invalid shard '{value}', expected i/N with 1 <= i <= N")
+    return int(match.group(1)), int(match.group(2))
+
+
+def shard_range(total: int, index: int, count: int) -> range:
+    """Contiguous row range for shard index (1-based) out of count."""
+    start = total * (index - 1) // count
+    end = total * index // count
+    return range(start, end)
+
+
+def sample_rows(row_ids: list, mode: str, size: int, seed: int,
+                strata: dict = None, failed_ids: set = None) -> list:
+    """
+    Pick rows for a fast run.
+    The same seed always gives the same rows, which keeps the collection
+    identical on every pytest-xdist worker.
+    """
+    if mode in ("", "all"):
+        return list(row_ids)
+
+    rng = random.Random(seed)
+
+    if mode == "failed-first":
+        failed_ids = failed_ids or set()
+        failed = [r for r in row_ids if r in failed_ids]
+        rest = [r for r in row_ids if r not in failed_ids]
+        extra = len(rest) if size <= 0 else max(size - len(failed), 0)
+        return failed + sorted(rng.sample(rest, min(extra, len(rest))))
+
+    if size <= 0 or size >= len(row_ids):
+        return list(row_ids)
+
+    if mode == "random":
+        return sorted(rng.sample(row_ids, size))
+
+    if mode == "stratified":
+        allowed = set(row_ids)
+        groups = [[r for r in ids if r in allowed] for _, ids in sorted((strata or {}).items())]
+        groups = [rng.sample(group, len(group)) for group in groups if group]
+        if not groups:
+            return sorted(rng.sample(row_ids, size))
+        # Round-robin over the groups so every value of the column is represented
+        picked = []
+        while len(picked) < size and any(groups):
+            for group in groups:
+                if group and len(picked) < size:
+                    picked.append(group.pop())
+        return sorted(picked)
+
+    raise ValueError(f"[FAIL] Unknown data sample mode: {mode}")
+
+
+def parse_sample(value: str):
+    """Parse "mode:N" (e.g. "random:100") into (mode, N)."""
+    if not value:
+        return "all", 0
+    mode, _, size = value.partition(":")
+    return mode.strip(), int(size) if size.strip() else 0
+
+
+# Datasets already indexed in this process (one per file + stratify column)
+_DATASETS = {}
+
+
+def get_dataset(file_path: str, stratify: str = None, cache=None) -> LazyDataset:
+    """Return the (cached) LazyDataset for a file."""
+    key = (str(file_path), stratify)
+    if key not in _DATASETS:
+        _DATASETS[key] = LazyDataset(file_path, stratify=stratify, cache=cache)
+    return _DATASETS[key]
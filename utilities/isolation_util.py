@@ -0,0 +1,168 @@
+# Per-test isolation levels for the browser_context fixture.
+#
+#   context        a new BrowserContext per test (default, safest, slowest)
+#   storage-reset  one reused context per browser; cookies, permissions,
+#                  localStorage and sessionStorage are cleared after each test
+#   page           one reused context per browser, only a new page per test;
+#                  for read-only tests (e.g. search), shared cookies stay
+#
+# Chosen globally with --isolation=<level> or per test with
+# @pytest.mark.isolation("page") (the marker wins).
+#
+# Leak detection: after each test in a cheaper level the client-side state
+# (cookies + localStorage, from context.storage_state()) is compared with
+# what the next test should see - empty for storage-reset, the state after
+# the warm-up visit for page. Any difference is logged, reported in the
+# "isolation" terminal summary and the shared context is replaced, so the
+# leak never reaches the next test. Server-side state (e.g. a cart kept for
+# the session cookie) cannot be seen here: tests that change it should keep
+# the context level.
+
+from playwright.sync_api import Error
+
+from utilities.log_util import get_logger
+
+logger = get_logger(__name__)
+
+ISOLATION_LEVELS = ("context", "storage-reset", "page")
+
+# Runs in each open page before it is closed (the page's own origin only;
+# state left on other origins is caught by the leak check)
+CLEAR_STORAGE_SCRIPT = "() => { try { localStorage.clear(); sessionStorage.clear(); } catch (e) {} }"
+
+EMPTY_STATE = {"cookies": [], "local_storage": []}
+
+
+def isolation_level(node, default: str = "context") -> str:
+    """Isolation level of a test: @pytest.mark.isolation(level) or the --isolation default."""
+    marker = node.get_closest_marker("isolation")
+    level = marker.args[0] if marker and marker.args else default
+    if level not in ISOLATION_LEVELS:
+        raise ValueError(f"[FAIL] Unknown isolation level '{level}', use one of {', '.join(ISOLATION_LEVELS)}")
+    return level
+
+
+def state_fingerprint(context) -> dict:
+    """Cookies and localStorage entries of a context as sorted tuples (expiry ignored)."""
+    state = context.storage_state()
+    return {
+        "cookies": sorted((c["domain"], c["path"], c["name"], c["value"]) for c in state["cookies"]),
+        "local_storage": sorted((origin["origin"], item["name"], item["value"])
+                                for origin in state["origins"] for item in origin["localStorage"]),
+    }
+
+
+def state_diff(expected: dict, actual: dict) -> list:
+    """Readable differences between two fingerprints, e.g. "cookie added: .shop.com/cart_id"."""
+    changes = []
+    for kind, label in (("cookies", "cookie"), ("local_storage", "localStorage")):
+        before = {entry[:-1]: entry[-1] for entry in expected[kind]}
+        after = {entry[:-1]: entry[-1] for entry in actual[kind]}
+        for key in sorted(before.keys() | after.keys()):
+            name = "/".join(part.strip("/") for part in key if part.strip("/"))
+            if key not in before:
+                changes.append(f"{label} added: {name}")
+            elif key not in after:
+                changes.append(f"{label} removed: {name}")
+            elif before[key] != after[key]:
+                changes.append(f"{label} changed: {name}")
+    return changes
+
+
+def _alive(context) -> bool:
+    try:
+        return context.browser is not None and context.browser.is_connected()
+    except Error:
+        return False
+
+
+class SharedContexts:
+    """
+    Reused BrowserContexts for the storage-reset and page isolation levels,
+    one per (browser type, level, launch profile).
+
+    Example:
+        shared = SharedContexts(browser_pool, base_url)
+        context = shared.acquire("chromium", "page")
+        ...                                            # test uses context.new_page()
+        leaks = shared.release("chromium", "page", "test_search")
+        shared.close_all()
+    """
+
+    def __init__(self, pool, base_url: str = None):
+        self.pool = pool
+        self.base_url = base_url
+        self.contexts = {}      # (browser_name, level, profile) -> {"context", "baseline"}
+
+    def acquire(self, browser_name: str, level: str, profile: str = None, **context_options):
+        """Return the shared context of a level, creating (and warming up) it when needed."""
+        key = (browser_name, level, profile)
+        entry = self.contexts.get(key)
+        if entry is None or not _alive(entry["context"]):
+            context = self.pool.new_context(browser_name, profile=profile, **context_options)
+            entry = self.contexts[key] = {"context": context, "baseline": EMPTY_STATE}
+            if level == "page" and self.base_url:
+                # The first visit sets the site's session cookies; they belong to the baseline
+                warm_up = context.new_page()
+                warm_up.goto(self.base_url)
+                warm_up.close()
+                entry["baseline"] = state_fingerprint(context)
+        return entry["context"]
+
+    def release(self, browser_name: str, level: str, test_id: str, profile: str = None) -> list:
+        """
+        Close the test's pages, reset the context (storage-reset) and check for
+        leaked state. Returns the leaked entries (empty list when clean).
+        """
+        key = (browser_name, level, profile)
+        entry = self.contexts.get(key)
+        if entry is None or not _alive(entry["context"]):
+            self.contexts.pop(key, None)      # browser recycled during the test
+            return []
+
+        context = entry["context"]
+        for page in context.pages:
+            if level == "storage-reset":
+                try:
+                    page.evaluate(CLEAR_STORAGE_SCRIPT)
+                except Error:
+                    pass      # page crashed or on about:blank
+            page.close()
+        if level == "storage-reset":
+            context.clear_cookies()
+            context.clear_permissions()
+
+        leaks = state_diff(entry["baseline"], state_fingerprint(context))
+        if leaks:
+            logger.warning("[ISOLATION] %s leaked state (%s level), replacing the shared context: %s",
+                           test_id, level, "; ".join(leaks[:5]))
+            self.discard(browser_name, level, profile)
+        return leaks
+
+    def discard(self, browser_name: str, level: str, profile: str = None):
+        """Close a shared context; the next acquire() creates a fresh one."""
+        entry = self.contexts.pop((browser_name, level, profile), None)
+        if entry and _alive(entry["context"]):
+            entry["context"].close()
+
+    def close_all(self):
+        for key in list(self.contexts):
+            self.discard(*key)
+
+
+def isolation_report(stats: dict) -> list:
+    """
+    Terminal lines from the per-level stats collected on the controller:
+    {level: {"tests", "setup_ms", "leaks": [(test, [changes])]}}
+    """
+    lines = []
+    for level in ISOLATION_LEVELS:
+        if level not in stats:
+            continue
+        level_stats = stats[level]
+        average = level_stats["setup_ms"] / level_stats["tests"] if level_stats["tests"] else 0.0
+        lines.append(f"{level:<14} {level_stats['tests']:>5} tests  {average:>8.1f} ms avg context setup  "
+                     f"{len(level_stats['leaks'])} leaks")
+        for test_id, changes in level_stats["leaks"][:10]:
+            lines.append(f"    LEAK {test_id}: {'; '.join(changes[:3])}")
+    return lines
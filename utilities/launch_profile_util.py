@@ -0,0 +1,101 @@
+# Named browser launch profiles.
+#
+#   lean       CI default: headless shell (chromium), no GPU, small viewport,
+#              device scale factor 1, reduced motion, CSS animations and
+#              transitions switched off
+#   debug      headed browser with normal animations, for watching a test locally
+#   realistic  closest to a user's browser: full Chromium in new headless mode
+#              (channel="chromium"), full HD viewport, animations on
+#
+# Chosen globally with --launch-profile=<name> or per test with
+# @pytest.mark.launch_profile("realistic") (the marker wins). --headed makes
+# any profile headed. Browsers are launched once per (browser type, profile).
+#
+# Playwright already launches Chromium with --disable-extensions,
+# --disable-background-networking, --disable-sync, --no-first-run, --mute-audio
+# and similar switches, so the profiles only add what is not there by default.
+#
+# In remote grid mode the browser servers must run with --unsafe to apply the
+# launch args and Firefox prefs (see utilities/browser_grid_util.py).
+#
+# Compare the profiles with: pytest -m benchmark test/test_launch_profile_benchmark.py
+
+# Injected before any page script: no CSS animations, transitions or smooth scrolling
+DISABLE_ANIMATIONS_SCRIPT = """
+(() => {
+    const css = '*, *::before, *::after { animation: none !important; transition: none !important;'
+              + ' scroll-behavior: auto !important; caret-color: transparent !important; }';
+    const add = () => {
+        const style = document.createElement('style');
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    if (document.documentElement) add(); else document.addEventListener('DOMContentLoaded', add);
+})();
+"""
+
+LAUNCH_PROFILES = {
+    "lean": {
+        "headless": True,
+        "launch": {
+            # No channel: headless Chromium runs the lightweight headless shell
+            "chromium": {"args": ["--disable-gpu", "--disable-dev-shm-usage", "--disable-software-rasterizer"]},
+            "firefox": {"firefox_user_prefs": {
+                "toolkit.cosmeticAnimations.enabled": False,
+                "layers.acceleration.disabled": True,
+                "network.prefetch-next": False,
+                "network.dns.disablePrefetch": True,
+                "browser.shell.checkDefaultBrowser": False,
+            }},
+            "webkit": {},
+        },
+        "context": {"viewport": {"width": 1280, "height": 720}, "device_scale_factor": 1, "reduced_motion": "reduce"},
+        "disable_animations": True,
+    },
+    "debug": {
+        "headless": False,
+        "launch": {"chromium": {}, "firefox": {}, "webkit": {}},
+        "context": {"viewport": {"width": 1366, "height": 768}},
+        "disable_animations": False,
+    },
+    "realistic": {
+        "headless": True,
+        "launch": {
+            # channel="chromium": the full browser in new headless mode instead of the headless shell
+            "chromium": {"channel": "chromium"},
+            "firefox": {},
+            "webkit": {},
+        },
+        "context": {"viewport": {"width": 1920, "height": 1080}, "device_scale_factor": 1,
+                    "reduced_motion": "no-preference"},
+        "disable_animations": False,
+    },
+}
+
+
+def launch_profile(node, default: str = "lean") -> str:
+    """Launch profile of a test: @pytest.mark.launch_profile(name) or the --launch-profile default."""
+    marker = node.get_closest_marker("launch_profile")
+    name = marker.args[0] if marker and marker.args else default
+    if name not in LAUNCH_PROFILES:
+        raise ValueError(f"[FAIL] Unknown launch profile '{name}', use one of {', '.join(LAUNCH_PROFILES)}")
+    return name
+
+
+def profile_launch_options(profile: str, browser_name: str, headless: bool = True) -> dict:
+    """Options for BrowserType.launch(); headless=False (--headed) wins over the profile."""
+    if not profile:
+        return {"headless": headless}
+    settings = LAUNCH_PROFILES[profile]
+    return dict(settings["launch"].get(browser_name, {}), headless=headless and settings["headless"])
+
+
+def profile_context_options(profile: str) -> dict:
+    """Default options for Browser.new_context() (explicit options of the caller win)."""
+    return dict(LAUNCH_PROFILES[profile]["context"]) if profile else {}
+
+
+def prepare_context(context, profile: str):
+    """Apply what cannot be given as a context option (run once per new context)."""
+    if profile and LAUNCH_PROFILES[profile]["disable_animations"]:
+        context.add_init_script(DISABLE_ANIMATIONS_SCRIPT)
@@ -0,0 +1,133 @@
+# Cross-process lock files.
+#
+# A lock is a file created with O_CREAT | O_EXCL: atomic across processes
+# (xdist workers and parallel CI jobs on one machine). The file holds the
+# owner's pid, host and start time, so locks of dead processes or older than
+# LOCK_TTL_SECONDS are taken over. Takeovers run one at a time under a guard
+# file (<lock>.takeover) and check the lock again there, so two processes that
+# both saw the same stale lock never delete the new lock one of them created.
+#
+# Used by the account pool (one lock per leased account) and the product
+# catalog (one worker crawls, the others wait and read its result).
+#
+# Example:
+#     with locked(Path(".catalog_cache/shop.lock"), "gw1: building the catalog"):
+#         ...
+
+import json
+import os
+import socket
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from utilities.log_util import get_logger
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = get_logger(__name__)
+
+LOCK_TTL_SECONDS = 3600         # a lock held longer than this is considered dead
+LOCK_WAIT_SECONDS = 120         # default max wait for a lock
+GUARD_TTL_SECONDS = 30          # a takeover guard older than this was left by a crash
+POLL_SECONDS = 0.2
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.path.isdir("/proc"):
+        return os.path.exists(f"/proc/{pid}")
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    return True     # cannot tell: only the lock TTL frees the lock
+
+
+def _is_stale(lock_path: Path) -> bool:
+    try:
+        owner = json.loads(lock_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        # Being written right now, or left half written by a crash
+        try:
+            return time.time() - lock_path.stat().st_mtime > LOCK_TTL_SECONDS
+        except OSError:
+            return False
+    if time.time() - owner.get("time", 0) > LOCK_TTL_SECONDS:
+        return True
+    return owner.get("host") == socket.gethostname() and not _pid_alive(owner.get("pid", 0))
+
+
+def _take_over(lock_path: Path) -> bool:
+    """Remove a stale lock under the takeover guard. True when the lock file is gone."""
+    guard = lock_path.with_name(f"{lock_path.name}.takeover")
+    try:
+        os.close(os.open(guard, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        # Another process is taking over right now (or crashed while doing it)
+        try:
+            if time.time() - guard.stat().st_mtime > GUARD_TTL_SECONDS:
+                guard.unlink()
+        except FileNotFoundError:
+            pass
+        return False
+    try:
+        # Checked again under the guard: a faster process may already have taken over and locked anew
+        inode = lock_path.stat().st_ino
+        if not _is_stale(lock_path):
+            return False
+        # Moved away atomically, then only deleted if it is still the file that was checked
+        moved = lock_path.with_name(f"{lock_path.name}.{os.getpid()}.stale")
+        os.replace(lock_path, moved)
+        if moved.stat().st_ino != inode:
+            # Unlocked and locked again in between: put the new owner's lock back
+            try:
+                os.link(moved, lock_path)
+            except FileExistsError:
+                pass
+            moved.unlink()
+            return False
+        moved.unlink()
+        logger.warning("[LOCK] Took over stale lock %s", lock_path)
+        return True
+    except FileNotFoundError:
+        return True
+    finally:
+        guard.unlink(missing_ok=True)
+
+
+def try_lock(lock_path: Path, owner: str) -> bool:
+    """Create the lock file if nobody holds it (a stale lock is taken over). True on success."""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    for _ in range(2):
+        try:
+            descriptor = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if not _is_stale(lock_path) or not _take_over(lock_path):
+                return False
+            continue
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            json.dump({"pid": os.getpid(), "host": socket.gethostname(), "owner": owner, "time": time.time()}, file)
+        return True
+    return False
+
+
+def unlock(lock_path: Path):
+    try:
+        lock_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+@contextmanager
+def locked(lock_path: Path, owner: str, timeout: float = LOCK_WAIT_SECONDS):
+    """Hold a lock file for the with block (waits until it is free)."""
+    deadline = time.monotonic() + timeout
+    while not try_lock(lock_path, owner):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"[FAIL] Lock {lock_path} is still held after {timeout:.0f}s")
+        time.sleep(POLL_SECONDS)
+    try:
+        yield
+    finally:
+        unlock(lock_path)
@@ -0,0 +1,149 @@
+# Buffered structured logging for the framework (fixtures, page objects, utilities).
+#
+# Log calls only put a record on a queue (QueueHandler); a background thread
+# (QueueListener) formats and writes them, so logging never blocks a test.
+# Every record carries correlation fields:
+#     test    node id of the running test
+#     worker  pytest-xdist worker id ("main" without xdist)
+#     cid     correlation id of the test run (same for all lines of one test)
+#     step    page object step, e.g. "LoginPage.click_login"
+# and is written as one JSON line to reports/logs/<worker>/<test>.jsonl.
+# Records of WARNING and above are also echoed to the terminal.
+#
+# Usage:
+#     from utilities.log_util import get_logger
+#     logger = get_logger(__name__)
+#     logger.info("[OK] Launching browser: %s", browser_name)   # args are formatted lazily
+#
+# Page objects have a ready-made logger: self.log.error("...")
+# Switch on verbose diagnostics with --framework-log-level=DEBUG.
+
+import json
+import logging
+import logging.handlers
+import queue
+import re
+import sys
+import uuid
+from pathlib import Path
+
+ROOT_LOGGER = "framework"
+
+# Correlation fields of the current test (one test at a time per worker)
+_context = {"test": None, "cid": None, "worker": "main"}
+_listener = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger below the framework root logger (e.g. framework.pages.LoginPage)."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def set_test_context(test_id: str = None) -> str:
+    """Start (or end, with None) the correlation context of a test. Returns the correlation id."""
+    _context["test"] = test_id
+    _context["cid"] = uuid.uuid4().hex[:12] if test_id else None
+    return _context["cid"]
+
+
+class CorrelationFilter(logging.Filter):
+    """Stamps the correlation fields on the record (runs in the test thread)."""
+
+    def filter(self, record):
+        record.test = _context["test"]
+        record.cid = _context["cid"]
+        record.worker = _context["worker"]
+        if not hasattr(record, "step"):
+            owner = record.name.rsplit(".", 1)[-1]
+            record.step = f"{owner}.{record.funcName}" if record.name.startswith(f"{ROOT_LOGGER}.pages.") else None
+        return True
+
+
+class PerTestFileHandler(logging.Handler):
+    """
+    Writes records as JSON lines into one file per test.
+    Runs in the listener thread only; tests of one worker run one after the
+    other, so only the current file is kept open.
+    """
+
+    def __init__(self, log_dir: str):
+        super().__init__()
+        self.log_dir = Path(log_dir) / _context["worker"]
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.current_path = None
+        self.file = None
+        self.written = set()
+
+    def path_for(self, test_id: str) -> Path:
+        name = re.sub(r"[^\w.-]+", "_", test_id)[-150:] if test_id else "session"
+        return self.log_dir / f"{name}.jsonl"
+
+    def emit(self, record):
+        path = self.path_for(record.test)
+        if path != self.current_path:
+            if self.file:
+                self.file.close()
+            # First file of the run is overwritten, reruns of a test append
+            self.file = open(path, "a" if path in self.written else "w", encoding="utf-8")
+            self.written.add(path)
+            self.current_path = path
+
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name[len(ROOT_LOGGER) + 1:],
+            "step": record.step,
+            "msg": record.getMessage(),
+            "test": record.test,
+            "worker": record.worker,
+            "cid": record.cid,
+        }
+        self.file.write(json.dumps(entry) + "\n")
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+        super().close()
+
+
+def start_logging(log_dir: str = "reports/logs", level: str = "INFO", echo_level: str = "WARNING",
+                  worker: str = "main"):
+    """
+    Configure the framework logger: level filter + queue in the calling thread,
+    file writing and terminal echo in a background thread.
+    """
+    global _listener
+    _context["worker"] = worker
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.setLevel(level.upper())
+    logger.propagate = False
+    logger.handlers.clear()
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(CorrelationFilter())
+    logger.addHandler(queue_handler)
+
+    handlers = []
+    if log_dir:
+        handlers.append(PerTestFileHandler(log_dir))
+    # The real stderr: echoed lines are not mixed into the next test's captured output
+    echo = logging.StreamHandler(sys.__stderr__)
+    echo.setLevel(echo_level.upper())
+    echo.setFormatter(logging.Formatter("%(levelname)s [%(worker)s] %(message)s"))
+    handlers.append(echo)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging():
+    """Write all queued records and close the log files."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
@@ -0,0 +1,273 @@
+# Worker memory watchdog.
+#
+# After every test (in the browser_context fixture) the watchdog samples:
+#   - the RSS of this worker's Python process
+#   - the memory of all its child processes: the Playwright driver (node) and
+#     the browser processes it launched (PSS when available, so memory shared
+#     between the browser processes is not counted several times)
+# Growth per test is logged and every sample is appended to a JSON timeline
+# (reports/memory/timeline-<worker>.jsonl). When the driver + browser processes
+# cross --memory-limit-browser the browsers are recycled, and the driver is
+# restarted too if that is not enough. The worker's own Python memory is not
+# freed by either, so crossing --memory-limit-worker is only reported (once).
+#
+# Linux reads /proc directly; other systems need psutil (optional). Without
+# either, sampling is switched off.
+
+import gc
+import json
+import os
+import time
+from pathlib import Path
+
+from utilities.log_util import get_logger
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = get_logger(__name__)
+
+
+# ========================================================================
+# PROCESS MEMORY
+# ========================================================================
+
+def _proc_memory_kb(pid: int) -> int:
+    """PSS (or RSS on older kernels) of one process from /proc, in kB."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as file:
+            for line in file:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _proc_children(pid: int) -> list:
+    """All descendant pids of a process (scans /proc once)."""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="ascii", errors="replace") as file:
+                # The process name may contain spaces, the fields after ")" do not
+                parent = int(file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+
+    found, pending = [], [pid]
+    while pending:
+        for child in children.get(pending.pop(), []):
+            found.append(child)
+            pending.append(child)
+    return found
+
+
+def sampling_supported() -> bool:
+    return psutil is not None or os.path.exists("/proc/self/status")
+
+
+def process_memory_mb(pid: int = None) -> float:
+    """RSS of a process (default: this process) in MB."""
+    pid = pid or os.getpid()
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss / 1048576
+        except psutil.Error:
+            return 0.0
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def child_tree_memory_mb(pid: int = None):
+    """
+    Memory of all child processes (Playwright driver + browsers) in MB.
+    Returns (megabytes, number of processes).
+    """
+    pid = pid or os.getpid()
+    if psutil is not None:
+        total, count = 0, 0
+        try:
+            children = psutil.Process(pid).children(recursive=True)
+        except psutil.Error:
+            return 0.0, 0
+        for child in children:
+            try:
+                info = child.memory_full_info() if hasattr(child, "memory_full_info") else child.memory_info()
+                total += getattr(info, "pss", info.rss)
+                count += 1
+            except psutil.Error:
+                continue
+        return total / 1048576, count
+
+    children = _proc_children(pid)
+    return sum(_proc_memory_kb(child) for child in children) / 1024, len(children)
+
+
+# ========================================================================
+# WATCHDOG
+# ========================================================================
+
+class MemoryWatchdog:
+    """
+    Samples worker and browser memory after each test and decides when the
+    browsers (or the whole Playwright driver) should be recycled.
+
+    Example:
+        watchdog = MemoryWatchdog("reports/memory", "gw0", browser_limit_mb=1500)
+        sample = watchdog.after_test("test/test_login.py::test_valid_userlogin")
+        if sample["action"]:
+            watchdog.recycle(browser_pool, sample["action"])
+    """
+
+    def __init__(self, output_dir: str, worker_id: str = "main",
+                 worker_limit_mb: float = 0, browser_limit_mb: float = 0):
+        self.enabled = sampling_supported()
+        self.worker_limit_mb = worker_limit_mb
+        self.browser_limit_mb = browser_limit_mb
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.timeline_path = self.output_dir / f"timeline-{worker_id}.jsonl"
+        self.timeline_path.write_text("", encoding="utf-8")
+        self.samples = []
+        self.recycles = []
+        self.sample_ms = 0.0
+        self.worker_limit_reported = False
+        if not self.enabled:
+            logger.warning("[WARN] Memory watchdog disabled (install psutil on this platform)")
+            return
+        self.last = self.sample("session-start")
+
+    # ===== Sampling =====
+
+    def sample(self, label: str) -> dict:
+        """Measure memory now and append the sample to the timeline."""
+        start = time.perf_counter()
+        browser_mb, processes = child_tree_memory_mb()
+        sample = {
+            "time": round(time.time(), 3),
+            "test": label,
+            "worker_mb": round(process_memory_mb(), 1),
+            "browser_mb": round(browser_mb, 1),
+            "processes": processes,
+        }
+        self.sample_ms += (time.perf_counter() - start) * 1000
+        with open(self.timeline_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(sample) + "\n")
+        return sample
+
+    def after_test(self, test_id: str):
+        """
+        Sample after a test and compare with the previous sample.
+        The returned sample contains the growth and the recycle action needed
+        ("browser" or None, see recycle()).
+        """
+        if not self.enabled:
+            return None
+        sample = self.sample(test_id)
+        sample["worker_delta_mb"] = round(sample["worker_mb"] - self.last["worker_mb"], 1)
+        sample["browser_delta_mb"] = round(sample["browser_mb"] - self.last["browser_mb"], 1)
+        sample["action"] = None
+        if self.browser_limit_mb and sample["browser_mb"] > self.browser_limit_mb:
+            sample["action"] = "browser"
+        if self.worker_limit_mb and sample["worker_mb"] > self.worker_limit_mb and not self.worker_limit_reported:
+            self.worker_limit_reported = True
+            logger.warning("[MEMORY] Worker Python memory %s MB is over the limit of %s MB after %s; "
+                           "recycling browsers or the driver does not free it, see the top growing tests "
+                           "in the memory report", sample["worker_mb"], self.worker_limit_mb, test_id)
+        self.samples.append(sample)
+        self.last = sample
+
+        logger.info("[MEMORY] worker %s MB (%+.1f) | browser %s MB (%+.1f, %d processes)",
+                    sample["worker_mb"], sample["worker_delta_mb"], sample["browser_mb"],
+                    sample["browser_delta_mb"], sample["processes"])
+        return sample
+
+    # ===== Recycling =====
+
+    def recycle(self, pool, action: str):
+        """
+        Free driver + browser memory: "browser" closes all browsers (relaunched
+        lazily by the pool), "driver" also restarts the Playwright driver. A
+        browser recycle that does not get below the limit is escalated to a
+        driver restart.
+        """
+        before = self.last
+        if action == "driver":
+            pool.restart_driver()
+        else:
+            pool.close_all()
+        gc.collect()
+        after = self.sample(f"after-{action}-recycle")
+
+        if action == "browser" and after["browser_mb"] > self.browser_limit_mb:
+            action = "driver"
+            pool.restart_driver()
+            gc.collect()
+            after = self.sample("after-driver-recycle")
+
+        self.recycles.append({
+            "after_test": before["test"],
+            "action": action,
+            "freed_worker_mb": round(before["worker_mb"] - after["worker_mb"], 1),
+            "freed_browser_mb": round(before["browser_mb"] - after["browser_mb"], 1),
+        })
+        logger.warning("[MEMORY] Recycled %s: worker %s MB, browser %s MB", action, after["worker_mb"], after["browser_mb"])
+        self.last = after
+        return action
+
+    # ===== Report =====
+
+    def summary(self) -> str:
+        if not self.enabled or not self.samples:
+            return "[MEMORY] No memory samples"
+        peak_worker = max(sample["worker_mb"] for sample in self.samples)
+        peak_browser = max(sample["browser_mb"] for sample in self.samples)
+        return (f"[MEMORY] {len(self.samples)} samples, peak worker {peak_worker} MB, "
+                f"peak browser {peak_browser} MB, {len(self.recycles)} recycles, "
+                f"sampling {self.sample_ms / len(self.samples):.1f} ms/test, timeline {self.timeline_path}")
+
+
+def memory_report(samples: dict, top: int = 10) -> dict:
+    """
+    Per-run memory report from the samples of all workers.
+    :param samples: {nodeid: sample dict from MemoryWatchdog.after_test}
+    """
+    def growth(item):
+        return item[1]["worker_delta_mb"] + item[1]["browser_delta_mb"]
+
+    growers = sorted(samples.items(), key=growth, reverse=True)[:top]
+    return {
+        "tests": len(samples),
+        "peak_worker_mb": max((s["worker_mb"] for s in samples.values()), default=0),
+        "peak_browser_mb": max((s["browser_mb"] for s in samples.values()), default=0),
+        "total_worker_growth_mb": round(sum(s["worker_delta_mb"] for s in samples.values()), 1),
+        "recycles": [{"after_test": nodeid, "action": s["action"]} for nodeid, s in samples.items() if s["action"]],
+        "top_growth": [
+            {"test": nodeid, "worker_delta_mb": s["worker_delta_mb"], "browser_delta_mb": s["browser_delta_mb"]}
+            for nodeid, s in growers
+        ],
+    }
+
+
+def write_memory_report(path: str, report: dict):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(report, indent=1), encoding="utf-8")
@@ -0,0 +1,251 @@
+# Bounded capture of browser events for failure diagnosis.
+#
+# The page fixture subscribes once per page to "console", "pageerror",
+# "requestfailed" and "response" (only 4xx/5xx are kept). Events go into a
+# small ring buffer (a deque with maxlen), so a chatty page cannot use more
+# memory than the buffer size. Only plain strings are stored, no Playwright
+# objects, and nothing is formatted unless the test fails.
+#
+# Errors are also counted by a normalized "signature" (numbers and query
+# strings removed) so the end of the run can show which distinct errors
+# happened most often across the whole suite.
+#
+# All page listeners go through one PageEventBus per page (event_bus(page),
+# created by the page fixture): each Playwright event is registered on the
+# page once, and handlers subscribe / unsubscribe on the bus. Subscribing the
+# same handler twice is a no-op, so page object methods can be called again
+# without piling up listeners. listener_counts() shows what is subscribed.
+
+import re
+import time
+import weakref
+from collections import Counter, deque
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from utilities.log_util import get_logger
+
+logger = get_logger(__name__)
+
+# Console message types that count as errors in the suite-wide summary
+CONSOLE_ERROR_TYPES = ("error", "assert")
+
+NUMBER_PATTERN = re.compile(r"\d+")
+
+
+def strip_query(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}" if parts.scheme else url
+
+
+def error_signature(kind: str, text: str) -> str:
+    """Normalized key for counting the same error across tests."""
+    text = NUMBER_PATTERN.sub("N", text.splitlines()[0] if text else "")
+    return f"{kind}: {text[:200]}"
+
+
+# ========================================================================
+# EVENT BUS
+# ========================================================================
+
+def accept_dialog(dialog):
+    """Shared "accept every dialog" handler (one subscription per page, however often it is added)."""
+    dialog.accept()
+
+
+class PageEventBus:
+    """
+    One Playwright listener per event of a page, fanned out to the subscribed handlers.
+
+    Example:
+        events = event_bus(page)
+        events.subscribe("dialog", accept_dialog)          # idempotent
+        with events.accept_next_dialog() as messages:
+            delete_button.click()
+        print(messages, events.listener_counts())          # ["Are you sure?"] {"dialog": 1}
+    """
+
+    def __init__(self, page):
+        self._page = weakref.ref(page)     # weak, see _buses below
+        self.handlers = {}      # event -> {handler: None}, in subscription order
+        self._dispatchers = {}  # event -> the one listener registered on the page
+
+    @property
+    def page(self):
+        """The page, or None once it has been garbage collected."""
+        return self._page()
+
+    def subscribe(self, event: str, handler):
+        """Add a handler (again for the same handler: nothing happens). Returns the handler."""
+        handlers = self.handlers.setdefault(event, {})
+        handlers[handler] = None
+        if event not in self._dispatchers and self.page is not None:
+            dispatcher = self._dispatchers[event] = lambda payload: self._dispatch(event, payload)
+            self.page.on(event, dispatcher)
+        return handler
+
+    def unsubscribe(self, event: str, handler):
+        """
+        Remove a handler. The page listener goes away with the last handler:
+        Playwright only auto-dismisses dialogs when nobody listens to "dialog".
+        """
+        handlers = self.handlers.get(event, {})
+        handlers.pop(handler, None)
+        if not handlers:
+            self.handlers.pop(event, None)
+            dispatcher = self._dispatchers.pop(event, None)
+            if dispatcher and self.page is not None:
+                try:
+                    self.page.remove_listener(event, dispatcher)
+                except Exception:
+                    pass      # page already closed
+
+    def _dispatch(self, event: str, payload):
+        for handler in tuple(self.handlers.get(event, ())):
+            try:
+                handler(payload)
+            except Exception as e:
+                logger.warning("[EVENTS] %s handler %s failed: %s", event, getattr(handler, "__name__", handler), e)
+
+    @contextmanager
+    def subscription(self, event: str, handler):
+        """Handler subscribed only inside the with block."""
+        self.subscribe(event, handler)
+        try:
+            yield handler
+        finally:
+            self.unsubscribe(event, handler)
+
+    @contextmanager
+    def accept_next_dialog(self, prompt_text: str = None):
+        """
+        Accept the first dialog opened inside the with block.
+        Yields a list that receives the dialog message.
+        """
+        messages = []
+
+        def accept_once(dialog):
+            self.unsubscribe("dialog", accept_once)
+            messages.append(dialog.message)
+            if prompt_text is None:
+                dialog.accept()
+            else:
+                dialog.accept(prompt_text)
+
+        with self.subscription("dialog", accept_once):
+            yield messages
+
+    def listener_counts(self) -> dict:
+        """Subscribed handlers per event, e.g. {"console": 1, "dialog": 1}."""
+        return {event: len(handlers) for event, handlers in self.handlers.items()}
+
+    def close(self):
+        """Unsubscribe everything and forget the page."""
+        for event in list(self.handlers):
+            for handler in list(self.handlers.get(event, ())):
+                self.unsubscribe(event, handler)
+        page = self.page
+        if page is not None:
+            _buses.pop(page, None)
+
+
+# Page -> its bus. The entry is removed on the page's "close" event, which also
+# fires for popups and for pages closed together with their context. Handlers
+# often hold the page themselves (page objects, event buffers), so closing is
+# what frees the entry: the bus only keeps a weak reference to the page.
+_buses = weakref.WeakKeyDictionary()
+
+
+def _forget_bus(page):
+    _buses.pop(page, None)
+
+
+def event_bus(page) -> PageEventBus:
+    """The event bus of a page, created on first use."""
+    bus = _buses.get(page)
+    if bus is None:
+        bus = _buses[page] = PageEventBus(page)
+        page.once("close", _forget_bus)
+    return bus
+
+
+# ========================================================================
+# EVENT BUFFER
+# ========================================================================
+
+class PageEventBuffer:
+    """
+    Ring buffer of console messages, page errors, failed requests and
+    HTTP error responses of one page.
+
+    Example:
+        events = PageEventBuffer(page, capacity=200)
+        ...
+        if test_failed:
+            allure.attach(events.to_text(), name="page_events")
+        events.detach()
+    """
+
+    def __init__(self, page, capacity: int = 200):
+        self.page = page
+        self.bus = event_bus(page)
+        self.events = deque(maxlen=capacity)
+        self.seen = 0
+        self.errors = Counter()
+        self.started = time.monotonic()
+        self.listeners = {
+            "console": self._on_console,
+            "pageerror": self._on_page_error,
+            "requestfailed": self._on_request_failed,
+            "response": self._on_response,
+        }
+        for event, listener in self.listeners.items():
+            self.bus.subscribe(event, listener)
+
+    # ===== Listeners (kept as small as possible) =====
+
+    def _add(self, kind: str, text: str, is_error: bool):
+        self.seen += 1
+        self.events.append((time.monotonic() - self.started, kind, text))
+        if is_error:
+            self.errors[error_signature(kind, text)] += 1
+
+    def _on_console(self, message):
+        self._add(f"console.{message.type}", message.text, message.type in CONSOLE_ERROR_TYPES)
+
+    def _on_page_error(self, error):
+        self._add("pageerror", f"{error.name}: {error.message}" if error.name else error.message, True)
+
+    def _on_request_failed(self, request):
+        self._add("requestfailed", f"{request.method} {strip_query(request.url)} ({request.failure})", True)
+
+    def _on_response(self, response):
+        if response.status >= 400:
+            self._add(f"http.{response.status}",
+                      f"{response.request.method} {strip_query(response.url)}", True)
+
+    # ===== Results =====
+
+    @property
+    def dropped(self) -> int:
+        """Events that no longer fit in the buffer (the oldest are dropped first)."""
+        return self.seen - len(self.events)
+
+    def to_text(self) -> str:
+        lines = [f"{offset:8.3f}s  {kind:<16} {text}" for offset, kind, text in self.events]
+        if self.dropped:
+            lines.insert(0, f"... {self.dropped} older events dropped (buffer size {self.events.maxlen})")
+        if not lines:
+            lines.append("No console messages, page errors or failed requests")
+        # Handlers of page objects and tests still subscribed (a long list means a listener leak)
+        others = {event: len([h for h in handlers if h not in self.listeners.values()])
+                  for event, handlers in self.bus.handlers.items()}
+        others = {event: count for event, count in others.items() if count}
+        if others:
+            lines.append("Other event listeners: " + ", ".join(f"{event}={count}" for event, count in sorted(others.items())))
+        return "\n".join(lines)
+
+    def detach(self):
+        """Remove the listeners (the page may be reused or closed afterwards)."""
+        for event, listener in self.listeners.items():
+            self.bus.unsubscribe(event, listener)
@@ -1,10 +1,12 @@
-from faker import Faker
 import random
 import string
 
 
 class RandomDataUtil:
     def __init__(self):
+        # Faker takes about half a second to import: imported here, not at
+        # module level, so collecting the tests that use this class stays fast
+        from faker import Faker
         self.faker = Faker()
 
     def get_first_name(self) -> str:
@@ -0,0 +1,200 @@
+# This module provides a lightweight, sharded HTML report.
+# Instead of one self-contained HTML file (which inlines every captured
+# print and can grow very large), each test result is streamed into its own
+# small shard page and a tiny index page loads those shards only when a row
+# is clicked. Long captured output is truncated and the full text is stored
+# gzip-compressed next to the shard. Screenshots, videos and traces are
+# linked, never embedded.
+
+import gzip
+import hashlib
+import html
+import os
+import time
+from pathlib import Path
+
+
+# ========================================================================
+# HELPER FUNCTIONS
+# ========================================================================
+
+def shard_id(nodeid: str) -> str:
+    """Return a short, file-system safe id for a test node id."""
+    return hashlib.sha1(nodeid.encode("utf-8")).hexdigest()[:12]
+
+
+def truncate_text(text: str, max_chars: int) -> tuple:
+    """
+    Keep the head and the tail of long text.
+    Returns (text, truncated_flag).
+    """
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text, False
+    half = max_chars // 2
+    skipped = len(text) - 2 * half
+    return f"{text[:half]}\n... [{skipped} chars truncated] ...\n{text[-half:]}", True
+
+
+def folder_size(path: Path) -> int:
+    """Return the total size (bytes) of all files inside a folder."""
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+# ========================================================================
+# SHARDED REPORT PLUGIN
+# ========================================================================
+
+class ShardedHtmlReport:
+    """
+    Pytest plugin that writes one shard page per test and a small index page.
+
+    Register it from conftest.py:
+        config.pluginmanager.register(ShardedHtmlReport("reports/sharded"))
+    """
+
+    OUTCOME_COLORS = {"passed": "#2e7d32", "failed": "#c62828", "skipped": "#f9a825", "error": "#6a1b9a"}
+
+    def __init__(self, report_dir: str, max_output_chars: int = 4000):
+        self.report_dir = Path(report_dir)
+        self.shard_dir = self.report_dir / "shards"
+        self.max_output_chars = max_output_chars
+        self.results = {}      # nodeid -> summary row (kept small on purpose)
+        self.start_time = None
+        self.write_seconds = 0.0   # time spent writing shards and the index
+
+    # ===== Pytest Hooks =====
+
+    def pytest_sessionstart(self, session):
+        self.start_time = time.time()
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+
+    def pytest_runtest_logreport(self, report):
+        """Collect setup/call/teardown phases and write the shard after teardown."""
+        row = self.results.setdefault(report.nodeid, {
+            "nodeid": report.nodeid,
+            "outcome": "passed",
+            "duration": 0.0,
+            "phases": [],
+            "sections": [],
+            "artifacts": [],
+        })
+        row["duration"] += report.duration
+
+        if report.failed:
+            row["outcome"] = "failed" if report.when == "call" else "error"
+        elif report.skipped and row["outcome"] == "passed":
+            row["outcome"] = "skipped"
+
+        row["phases"].append({
+            "when": report.when,
+            "outcome": report.outcome,
+            "longrepr": report.longreprtext if report.failed else "",
+        })
+        # pytest repeats the captured sections of the earlier phases in every
+        # later report, so the last phase has them all exactly once
+        row["sections"] = list(report.sections)
+        for key, value in report.user_properties:
+            if key == "artifact" and value not in row["artifacts"]:
+                row["artifacts"].append(value)
+
+        if report.when == "teardown":
+            start = time.perf_counter()
+            self._write_shard(row)
+            self.write_seconds += time.perf_counter() - start
+            # Drop the heavy parts, the index only needs the summary
+            row.pop("phases")
+            row.pop("sections")
+
+    def pytest_sessionfinish(self, session):
+        start = time.perf_counter()
+        self._write_index()
+        self.write_seconds += time.perf_counter() - start
+
+    def pytest_terminal_summary(self, terminalreporter):
+        size_kb = folder_size(self.report_dir) / 1024
+        terminalreporter.write_line(
+            f"[REPORT] Sharded report: {self.report_dir / 'index.html'} "
+            f"({len(self.results)} shards, {size_kb:.1f} KB, generated in {self.write_seconds:.2f}s)"
+        )
+
+    # ===== Writers =====
+
+    def _write_shard(self, row: dict):
+        """Write one test result as a small standalone HTML page."""
+        sid = shard_id(row["nodeid"])
+        row["shard"] = f"shards/{sid}.html"
+
+        parts = [f"<h3>{html.escape(row['nodeid'])}</h3>",
+                 f"<p>Outcome: <b>{row['outcome']}</b> &middot; Duration: {row['duration']:.2f}s</p>"]
+
+        full_output = []
+        output_truncated = False
+        for phase in row["phases"]:
+            if phase["longrepr"]:
+                text, _ = truncate_text(phase["longrepr"], self.max_output_chars)
+                parts.append(f"<h4>{phase['when']} failure</h4><pre>{html.escape(text)}</pre>")
+        for title, content in row["sections"]:
+            full_output.append(f"----- {title} -----\n{content}")
+            text, truncated = truncate_text(content, self.max_output_chars)
+            output_truncated = output_truncated or truncated
+            parts.append(f"<h4>{html.escape(title)}</h4><pre>{html.escape(text)}</pre>")
+
+        # Keep the complete captured output compressed, only if something was cut
+        if output_truncated:
+            log_name = f"{sid}.log.gz"
+            with gzip.open(self.shard_dir / log_name, "wt", encoding="utf-8") as log_file:
+                log_file.write("\n".join(full_output))
+            parts.append(f'<p><a href="{log_name}">Full captured output (gzip)</a></p>')
+
+        if row["artifacts"]:
+            links = "".join(
+                f'<li><a href="{html.escape(self._relative_link(path, self.shard_dir))}">'
+                f"{html.escape(Path(path).name)}</a></li>"
+                for path in row["artifacts"]
+            )
+            parts.append(f"<h4>Artifacts</h4><ul>{links}</ul>")
+
+        page = ("<!DOCTYPE html><html><head><meta charset='utf-8'>"
+                "<style>body{font-family:sans-serif;font-size:13px}pre{background:#f5f5f5;"
+                "padding:6px;white-space:pre-wrap}</style></head><body>"
+                + "".join(parts) + "</body></html>")
+        (self.shard_dir / f"{sid}.html").write_text(page, encoding="utf-8")
+
+    def _write_index(self):
+        """Write the index page; shard details are loaded lazily into an iframe."""
+        elapsed = time.time() - self.start_time if self.start_time else 0.0
+        counts = {}
+        rows = []
+        for row in self.results.values():
+            counts[row["outcome"]] = counts.get(row["outcome"], 0) + 1
+            color = self.OUTCOME_COLORS.get(row["outcome"], "#000")
+            rows.append(
+                f"<tr onclick=\"show('{row.get('shard', '')}', this)\">"
+                f"<td style='color:{color}'>{row['outcome']}</td>"
+                f"<td>{html.escape(row['nodeid'])}</td>"
+                f"<td>{row['duration']:.2f}s</td></tr>"
+            )
+
+        summary = ", ".join(f"{count} {outcome}" for outcome, count in sorted(counts.items()))
+        page = (
+            "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Test Report</title>"
+            "<style>body{font-family:sans-serif;font-size:13px}table{border-collapse:collapse;width:100%}"
+            "td{border-bottom:1px solid #ddd;padding:3px 6px;cursor:pointer}"
+            "iframe{width:100%;height:480px;border:1px solid #ccc}</style>"
+            "<script>function show(src,row){var old=document.getElementById('detail');"
+            "if(old){old.remove();}if(!src){return;}var tr=document.createElement('tr');tr.id='detail';"
+            "tr.innerHTML='<td colspan=3><iframe loading=lazy src=\"'+src+'\"></iframe></td>';"
+            "row.after(tr);}</script></head><body>"
+            f"<h2>Test Report</h2><p>{summary} &middot; run time {elapsed:.2f}s</p>"
+            "<table>" + "".join(rows) + "</table></body></html>"
+        )
+        (self.report_dir / "index.html").write_text(page, encoding="utf-8")
+
+    @staticmethod
+    def _relative_link(path: str, start: Path) -> str:
+        """Return a link to an artifact relative to the page that shows it."""
+        try:
+            return Path(os.path.relpath(Path(path).resolve(), start.resolve())).as_posix()
+        except ValueError:
+            # Different drive on Windows, fall back to an absolute file link
+            return Path(path).resolve().as_uri()
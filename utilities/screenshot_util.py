@@ -0,0 +1,164 @@
+# This module takes failure screenshots in an efficient way.
+# - Modes: viewport, full-page, or only the locator that made the test fail
+# - Formats: png, jpeg or webp (webp needs Pillow, otherwise jpeg is used)
+# - Capture returns bytes; encoding and writing run in a background thread
+# - Identical screenshots (same content hash) are stored only once, e.g. the
+#   same login error shown by several rows of a data-driven test
+
+import hashlib
+import io
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from utilities.attachment_util import new_file
+from utilities.log_util import get_logger
+
+logger = get_logger(__name__)
+
+SCREENSHOT_MODES = ("viewport", "full-page", "locator")
+SCREENSHOT_FORMATS = ("png", "jpeg", "webp")
+
+# Playwright error messages mention the locator they were waiting for, e.g.
+#   waiting for locator("#input-email")
+LOCATOR_PATTERN = re.compile(r'locator\("((?:[^"\\]|\\.)+)"\)')
+
+
+def find_failing_selector(failure_text: str):
+    """Return the last selector mentioned in a Playwright error message, if any."""
+    if not failure_text:
+        return None
+    matches = LOCATOR_PATTERN.findall(failure_text)
+    return matches[-1].replace('\\"', '"') if matches else None
+
+
+def pillow_available() -> bool:
+    """WebP encoding is optional and needs Pillow."""
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ScreenshotManager:
+    """
+    Captures screenshots and stores them (deduplicated) from a background thread.
+
+    Example:
+        manager = ScreenshotManager("reports/screenshots", mode="locator", image_format="jpeg")
+        job = manager.capture(page, "test_login", failure_text=report.longreprtext)
+        ...  # do other teardown work while the file is written
+        result = job.result()   # {"path": ..., "bytes": ..., "capture_ms": ..., ...}
+    """
+
+    def __init__(self, output_dir: str = "reports/screenshots", mode: str = "viewport",
+                 image_format: str = "png", quality: int = 80):
+        if mode not in SCREENSHOT_MODES:
+            raise ValueError(f"[FAIL] Unsupported screenshot mode: {mode}")
+        if image_format not in SCREENSHOT_FORMATS:
+            raise ValueError(f"[FAIL] Unsupported screenshot format: {image_format}")
+
+        if image_format == "webp" and not pillow_available():
+            logger.warning("[INFO] Pillow is not installed, saving screenshots as jpeg instead of webp")
+            image_format = "jpeg"
+
+        self.output_dir = Path(output_dir)
+        self.mode = mode
+        self.image_format = image_format
+        self.quality = quality
+        self.metrics = []       # one entry per capture
+        self._stored = {}       # content hash -> saved file path
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot-writer")
+
+    # ===== Capture (runs on the test thread) =====
+
+    def capture(self, page, name: str, failure_text: str = None):
+        """
+        Take the screenshot and return a Future.
+        The Future's result is a metrics dict including the saved file path.
+        """
+        start = time.perf_counter()
+        # WebP is converted from a lossless PNG capture
+        capture_type = "jpeg" if self.image_format == "jpeg" else "png"
+        options = {"type": capture_type}
+        if capture_type == "jpeg":
+            options["quality"] = self.quality
+
+        data = None
+        mode_used = self.mode
+        if self.mode == "locator":
+            selector = find_failing_selector(failure_text)
+            if selector:
+                try:
+                    data = page.locator(selector).first.screenshot(timeout=1000, **options)
+                except Exception as e:
+                    logger.info("[INFO] Could not capture failing locator '%s', using viewport: %s", selector, e)
+            if data is None:
+                mode_used = "viewport"
+        if data is None:
+            data = page.screenshot(full_page=(self.mode == "full-page"), **options)
+
+        capture_ms = (time.perf_counter() - start) * 1000
+        return self._executor.submit(self._store, name, data, mode_used, capture_ms)
+
+    # ===== Store (runs on the background thread) =====
+
+    def _store(self, name: str, data: bytes, mode_used: str, capture_ms: float) -> dict:
+        start = time.perf_counter()
+        extension = self.image_format
+        if self.image_format == "webp":
+            data, extension = self._to_webp(data)
+
+        content_hash = hashlib.sha1(data).hexdigest()
+        with self._lock:
+            path = self._stored.get(content_hash)
+            duplicate = path is not None
+            if not duplicate:
+                path = self.output_dir / f"{name}.{extension}"
+                # Not rewritten in place: the file of an earlier run may be linked into the Allure results
+                with new_file(path) as tmp_path:
+                    tmp_path.write_bytes(data)
+                self._stored[content_hash] = path
+
+        result = {
+            "name": name,
+            "path": str(path),
+            "extension": extension,
+            "mode": mode_used,
+            "bytes": len(data),
+            "hash": content_hash,
+            "duplicate": duplicate,
+            "capture_ms": round(capture_ms, 1),
+            "store_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+        with self._lock:
+            self.metrics.append(result)
+        return result
+
+    def _to_webp(self, png_data: bytes):
+        """Convert PNG bytes to WebP using Pillow."""
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.open(io.BytesIO(png_data)).save(buffer, format="WEBP", quality=self.quality)
+        return buffer.getvalue(), "webp"
+
+    # ===== Summary =====
+
+    def summary(self) -> str:
+        """Return a one-line summary of all captures in this session."""
+        if not self.metrics:
+            return "[SCREENSHOT] No screenshots captured"
+        total_bytes = sum(m["bytes"] for m in self.metrics if not m["duplicate"])
+        duplicates = sum(1 for m in self.metrics if m["duplicate"])
+        avg_ms = sum(m["capture_ms"] for m in self.metrics) / len(self.metrics)
+        return (f"[SCREENSHOT] {len(self.metrics)} captured, {duplicates} deduplicated, "
+                f"{total_bytes / 1024:.1f} KB stored, avg capture {avg_ms:.0f} ms")
+
+    def close(self):
+        """Wait for pending writes and stop the background thread."""
+        self._executor.shutdown(wait=True)
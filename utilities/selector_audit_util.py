@@ -0,0 +1,252 @@
+# Selector performance audit.
+#
+# Loads every page object's page (live site, local OpenCart or a recorded
+# HTML snapshot), times how long each declared locator takes to resolve,
+# counts the matched elements, flags ambiguous / missing / slow selectors and
+# suggests cheaper id or attribute based alternatives.
+#
+# Usage:
+#   python -m utilities.selector_audit_util --base-url http://localhost/opencart/upload/
+#   python -m utilities.selector_audit_util --record           # also save HTML snapshots
+#   python -m utilities.selector_audit_util --snapshot-dir reports/selector_audit/snapshots
+#
+# The ranked report is written to reports/selector_audit/latest.json (+ .txt),
+# and a one-line summary of every run is appended to history.jsonl so the
+# numbers can be tracked over time.
+
+import argparse
+import json
+import re
+import statistics
+import time
+from datetime import datetime
+from pathlib import Path
+
+from config import Config
+from pages.base_page import all_page_classes, import_page_modules
+
+# OpenCart route of each page object (appended to the base URL)
+PAGE_ROUTES = {
+    "HomePage": "",
+    "LoginPage": "index.php?route=account/login",
+    "RegistrationPage": "index.php?route=account/register",
+    "MyAccountPage": "index.php?route=account/account",
+    "LogoutPage": "index.php?route=account/logout",
+    "SearchResultsPage": f"index.php?route=product/search&search={Config.product_name}",
+    "ProductPage": "index.php?route=product/product&product_id=43",
+    "ShoppingCartPage": "index.php?route=checkout/cart",
+    "CheckoutPage": "index.php?route=checkout/checkout",
+}
+
+# Pages that are only reachable after logging in
+LOGIN_REQUIRED = {"MyAccountPage"}
+
+# JavaScript run on the first matched element: returns unique, cheap selectors
+SUGGEST_JS = """
+el => {
+    const unique = sel => { try { return document.querySelectorAll(sel).length === 1; } catch (e) { return false; } };
+    const tag = el.tagName.toLowerCase();
+    const candidates = [];
+    if (el.id) candidates.push('#' + CSS.escape(el.id));
+    for (const attr of ['name', 'data-testid', 'placeholder', 'value', 'type', 'href', 'title']) {
+        const v = el.getAttribute(attr);
+        if (v && v.length < 80) candidates.push(`${tag}[${attr}="${v.replace(/"/g, '\\\\"')}"]`);
+    }
+    const parentId = el.closest('[id]');
+    if (parentId && parentId !== el) candidates.push('#' + CSS.escape(parentId.id) + ' ' + tag);
+    return candidates.filter(unique).slice(0, 3);
+}
+"""
+
+
+# ========================================================================
+# STATIC HINTS (no browser needed)
+# ========================================================================
+
+def selector_hints(selector: str, nth=None) -> list:
+    """Return reasons why a selector is likely to be expensive or brittle."""
+    hints = []
+    if selector.startswith(("//", "(//", "xpath=")):
+        hints.append("XPath")
+        if re.search(r"/\w*\[\d+\]", selector) or re.search(r"/div\[\d+\]", selector):
+            hints.append("positional XPath steps")
+        if "following::" in selector or "preceding::" in selector:
+            hints.append("axis scan (following/preceding)")
+        if selector.count("/") > 6:
+            hints.append("deep XPath")
+    if ":has-text(" in selector or selector.startswith("text=") or ":text(" in selector:
+        hints.append("text matching scans the whole subtree")
+    if nth is not None:
+        hints.append("index-based (.nth) selection")
+    return hints
+
+
+# ========================================================================
+# AUDIT
+# ========================================================================
+
+def time_count(locator, repeat: int) -> tuple:
+    """Return (median milliseconds, element count) of locator.count()."""
+    timings = []
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = locator.count()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), count
+
+
+def load_page(page, page_name: str, base_url: str, snapshot_dir: Path = None) -> bool:
+    """Open the page for a page object, from a snapshot if one is available."""
+    if snapshot_dir:
+        snapshot = snapshot_dir / f"{page_name}.html"
+        if not snapshot.exists():
+            print(f"[SKIP] No snapshot for {page_name}: {snapshot}")
+            return False
+        page.set_content(snapshot.read_text(encoding="utf-8"))
+        return True
+
+    route = PAGE_ROUTES.get(page_name)
+    if route is None:
+        print(f"[SKIP] No route known for {page_name}")
+        return False
+    page.goto(base_url.rstrip("/") + "/" + route)
+    return True
+
+
+def login(page, base_url: str):
+    """Log in with the account from config.py (needed for My Account pages)."""
+    from pages.login_page import LoginPage
+
+    page.goto(base_url.rstrip("/") + "/" + PAGE_ROUTES["LoginPage"])
+    LoginPage(page).login(Config.email, Config.password)
+    page.wait_for_load_state()
+
+
+def audit(page, base_url: str, snapshot_dir: Path = None, record_dir: Path = None,
+          repeat: int = 5, slow_ms: float = 5.0) -> list:
+    """Audit every locator of every page object and return the result rows."""
+    import_page_modules()
+    rows = []
+    logged_in = False
+
+    for page_class in all_page_classes():
+        page_name = page_class.__name__
+        if page_name in LOGIN_REQUIRED and not snapshot_dir and not logged_in:
+            login(page, base_url)
+            logged_in = True
+        if not load_page(page, page_name, base_url, snapshot_dir):
+            continue
+        if record_dir:
+            record_dir.mkdir(parents=True, exist_ok=True)
+            (record_dir / f"{page_name}.html").write_text(page.content(), encoding="utf-8")
+
+        # Round trip cost of a trivial selector, subtracted from every timing
+        baseline_ms, _ = time_count(page.locator("html"), repeat)
+        page_object = page_class(page)
+
+        for name, declaration in page_class.declared_locators().items():
+            locator = getattr(page_object, name)
+            # Time the selector itself, .nth() only picks from its matches
+            raw_locator = page.locator(declaration.selector, has_text=declaration.has_text)
+            median_ms, count = time_count(raw_locator, repeat)
+
+            suggestions = []
+            if count >= 1:
+                try:
+                    suggestions = locator.first.evaluate(SUGGEST_JS, timeout=2000)
+                except Exception as e:
+                    print(f"[INFO] No suggestion for {page_name}.{name}: {e}")
+
+            net_ms = max(median_ms - baseline_ms, 0.0)
+            flags = []
+            if count == 0:
+                flags.append("not-found")
+            elif count > 1 and declaration.nth is None:
+                flags.append("ambiguous")
+            if net_ms > slow_ms:
+                flags.append("slow")
+
+            rows.append({
+                "page": page_name,
+                "locator": name,
+                "selector": declaration.selector,
+                "has_text": declaration.has_text,
+                "nth": declaration.nth,
+                "median_ms": round(median_ms, 2),
+                "net_ms": round(net_ms, 2),
+                "matches": count,
+                "flags": flags,
+                "hints": selector_hints(declaration.selector, declaration.nth),
+                "suggestions": [s for s in suggestions if s != declaration.selector],
+            })
+
+    # Rank: flagged selectors first, then by net resolution time
+    rows.sort(key=lambda row: (-len(row["flags"]), -row["net_ms"]))
+    return rows
+
+
+# ========================================================================
+# REPORT
+# ========================================================================
+
+def format_report(rows: list) -> str:
+    """Return a plain text ranked table."""
+    lines = [f"{'#':>3}  {'net ms':>7}  {'matches':>7}  {'locator':<45} flags / hints / suggestion"]
+    for rank, row in enumerate(rows, start=1):
+        notes = ", ".join(row["flags"] + row["hints"])
+        suggestion = f" -> try {row['suggestions'][0]}" if row["suggestions"] else ""
+        lines.append(
+            f"{rank:>3}  {row['net_ms']:>7.2f}  {row['matches']:>7}  "
+            f"{row['page'] + '.' + row['locator']:<45} {notes}{suggestion}"
+        )
+    return "\n".join(lines)
+
+
+def write_report(rows: list, output_dir: Path, base_url: str):
+    """Write latest.json / latest.txt and append a summary line to history.jsonl."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    run = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "base_url": base_url,
+        "locators": len(rows),
+        "flagged": sum(1 for row in rows if row["flags"]),
+        "total_net_ms": round(sum(row["net_ms"] for row in rows), 2),
+    }
+    (output_dir / "latest.json").write_text(json.dumps({"run": run, "rows": rows}, indent=2), encoding="utf-8")
+    (output_dir / "latest.txt").write_text(format_report(rows), encoding="utf-8")
+    with open(output_dir / "history.jsonl", "a", encoding="utf-8") as history:
+        history.write(json.dumps(run) + "\n")
+    return run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time and rank every page object selector")
+    parser.add_argument("--base-url", default="https://naveenautomationlabs.com/opencart")
+    parser.add_argument("--browser", default="chromium", help="chromium, firefox or webkit")
+    parser.add_argument("--snapshot-dir", default=None, help="Audit recorded HTML snapshots instead of live pages")
+    parser.add_argument("--record", action="store_true", help="Save HTML snapshots of the audited pages")
+    parser.add_argument("--repeat", type=int, default=5, help="Timings per locator (median is used)")
+    parser.add_argument("--slow-ms", type=float, default=5.0, help="Flag selectors slower than this (net ms)")
+    parser.add_argument("--output-dir", default="reports/selector_audit")
+    args = parser.parse_args(argv)
+
+    from playwright.sync_api import sync_playwright
+
+    output_dir = Path(args.output_dir)
+    snapshot_dir = Path(args.snapshot_dir) if args.snapshot_dir else None
+    record_dir = output_dir / "snapshots" if args.record else None
+
+    with sync_playwright() as playwright:
+        browser = getattr(playwright, args.browser).launch()
+        page = browser.new_page()
+        rows = audit(page, args.base_url, snapshot_dir, record_dir, args.repeat, args.slow_ms)
+        browser.close()
+
+    run = write_report(rows, output_dir, args.base_url)
+    print(format_report(rows))
+    print(f"[OK] {run['locators']} locators audited, {run['flagged']} flagged. Report: {output_dir / 'latest.json'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# Duration-balanced CI sharding.
+#
+# Splits the collected tests into N shards of about equal run time using the
+# durations recorded by earlier runs (.test_durations.json). Tests that share
+# a logged-in account or seeded data are marked with
+#     @pytest.mark.shard_group("config-account")
+# and always land in the same shard. The split is deterministic and stable:
+# every test has a hashed "home" shard, durations are rounded into coarse
+# buckets and only a few tests are moved to balance the shards, so small timing
+# changes (or new tests) leave most tests on the same machine.
+#
+# Usage:
+#   pytest --store-durations                 # record durations (e.g. nightly)
+#   pytest --shard=2/4                       # run shard 2 of 4 on a CI machine
+#   pytest --shard-manifest=reports/shards/shard-2-of-4.json   # replay a shard exactly
+
+import hashlib
+import json
+import math
+from pathlib import Path
+
+DEFAULT_DURATION = 5.0      # seconds, used for tests without a recorded duration
+BALANCE_TOLERANCE = 0.05    # shards may differ by 5% of the average shard time
+
+
+def load_durations(path: str) -> dict:
+    """Return {nodeid: seconds} from the durations file (empty if missing)."""
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(path: str, new_durations: dict):
+    """Merge new durations into the durations file (other tests are kept)."""
+    durations = load_durations(path)
+    durations.update({nodeid: round(seconds, 3) for nodeid, seconds in new_durations.items()})
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(dict(sorted(durations.items())), file, indent=1)
+
+
+def bucket(seconds: float) -> float:
+    """Round a duration to a coarse bucket (powers of 2^0.5) to keep shards stable."""
+    if seconds <= 0.1:
+        return 0.1
+    return round(2 ** (round(math.log2(seconds) * 2) / 2), 2)
+
+
+def stable_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def plan_shards(tests: list, durations: dict, groups: dict, shard_count: int) -> list:
+    """
+    Assign tests to shards: each test (or group) starts on a shard chosen by a
+    stable hash, then the fewest moves needed to balance the durations are made.
+
+    :param tests: node ids in collection order
+    :param durations: recorded {nodeid: seconds}
+    :param groups: {nodeid: group name} for tests that must stay together
+    :param shard_count: number of shards
+    :return: list of shards, each {"tests": [...], "seconds": float, "groups": [...]}
+    """
+    known = [durations[t] for t in tests if t in durations]
+    fallback = sum(known) / len(known) if known else DEFAULT_DURATION
+
+    # Build units: one per group, one per ungrouped test
+    units = {}
+    for nodeid in tests:
+        key = f"group:{groups[nodeid]}" if nodeid in groups else nodeid
+        unit = units.setdefault(key, {"key": key, "tests": [], "seconds": 0.0})
+        unit["tests"].append(nodeid)
+        unit["seconds"] += bucket(durations.get(nodeid, fallback))
+
+    # Every unit starts on its "home" shard (rendezvous hashing: independent of
+    # durations, so a unit only moves when balancing really needs it)
+    shards = [{"tests": [], "seconds": 0.0, "groups": [], "units": []} for _ in range(shard_count)]
+    for unit in sorted(units.values(), key=lambda unit: stable_hash(unit["key"])):
+        home = max(range(shard_count), key=lambda index: stable_hash(f"{unit['key']}#{index}"))
+        shards[home]["units"].append(unit)
+        shards[home]["seconds"] += unit["seconds"]
+
+    # Move units from the heaviest to the lightest shard while that reduces the gap
+    total = sum(shard["seconds"] for shard in shards)
+    tolerance = max(total / shard_count * BALANCE_TOLERANCE, 0.1)
+    while True:
+        heavy = max(shards, key=lambda shard: shard["seconds"])
+        light = min(shards, key=lambda shard: shard["seconds"])
+        gap = heavy["seconds"] - light["seconds"]
+        movable = [unit for unit in heavy["units"] if unit["seconds"] < gap]
+        if gap <= tolerance or not movable:
+            break
+        # The unit closest to half the gap evens the two shards best
+        unit = min(movable, key=lambda unit: (abs(gap / 2 - unit["seconds"]), stable_hash(unit["key"])))
+        heavy["units"].remove(unit)
+        light["units"].append(unit)
+        heavy["seconds"] -= unit["seconds"]
+        light["seconds"] += unit["seconds"]
+
+    for shard in shards:
+        for unit in shard.pop("units"):
+            shard["tests"].extend(unit["tests"])
+            if unit["key"].startswith("group:"):
+                shard["groups"].append(unit["key"][len("group:"):])
+
+    # Keep the original collection order inside each shard
+    position = {nodeid: index for index, nodeid in enumerate(tests)}
+    for shard in shards:
+        shard["tests"].sort(key=position.get)
+        shard["seconds"] = round(shard["seconds"], 2)
+    return shards
+
+
+def write_manifest(path: Path, shard_index: int, shard_count: int, shard: dict, durations_file: str):
+    """Save the exact test list of a shard so a failed shard can be replayed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "shard": f"{shard_index}/{shard_count}",
+        "durations_file": durations_file,
+        "expected_seconds": shard["seconds"],
+        "groups": shard["groups"],
+        "tests": shard["tests"],
+        "fingerprint": stable_hash("\n".join(shard["tests"]))[:12],
+    }
+    path.write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+    return manifest
+
+
+def read_manifest(path: str) -> dict:
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
@@ -0,0 +1,226 @@
+# Startup profiler: which imports and which test files make collection slow.
+#
+# Runs "pytest --collect-only" in a fresh interpreter with "python -X importtime"
+# and this module loaded as a pytest plugin, and reports:
+#   - the wall time of the whole collection run (what every xdist worker pays)
+#   - the slowest imports, grouped by top-level package, and which test file
+#     (or conftest/plugin) imported them first
+#   - the collection time per test file (module import + pytest collection)
+# Each number is the minimum of --runs runs, to keep the noise down.
+#
+# Regression check: compare with a saved profile; the command exits with 1 when
+# the total, a package or a test file got slower by more than --max-regression
+# (relative) and --min-ms (absolute).
+#
+# Usage:
+#   python -m utilities.startup_profile_util
+#   python -m utilities.startup_profile_util -- -m sanity            # args after -- go to pytest
+#   python -m utilities.startup_profile_util --save-baseline
+#   python -m utilities.startup_profile_util --baseline reports/startup/baseline.json
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+OUTPUT_ENV = "STARTUP_PROFILE_OUTPUT"
+
+# "import time:   self [us] |  cumulative | imported package" (2 spaces per nesting level)
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+# ========================================================================
+# PYTEST PLUGIN (loaded in the profiled run with -p utilities.startup_profile_util)
+# ========================================================================
+
+_collect_ms = {}
+# Module name -> what imported it first (conftest, a test file, ...). Test
+# modules and conftest files are executed by pytest's own loader, so the
+# importtime log cannot tell; new entries of sys.modules can.
+_first_importer = {}
+
+
+def _record_new_modules(label: str, before: set):
+    for name in sys.modules.keys() - before:
+        _first_importer.setdefault(name, label)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_load_initial_conftests(early_config, parser, args):
+    before = set(sys.modules)
+    yield
+    _record_new_modules("conftest", before)
+
+
+_modules_before_configure = set()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    _modules_before_configure.update(sys.modules)
+
+
+def pytest_sessionstart(session):
+    _record_new_modules("pytest_configure hooks", _modules_before_configure)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    """Time of collecting one test file, including the import of the module."""
+    before = set(sys.modules)
+    start = time.perf_counter()
+    yield
+    if isinstance(collector, pytest.Module):
+        _collect_ms[collector.nodeid] = round((time.perf_counter() - start) * 1000, 1)
+        _record_new_modules(collector.nodeid, before)
+
+
+def pytest_collection_finish(session):
+    output = os.environ.get(OUTPUT_ENV)
+    if output:
+        Path(output).write_text(json.dumps({
+            "files": _collect_ms,
+            "tests": len(session.items),
+            "importers": _first_importer,
+        }), encoding="utf-8")
+
+
+# ========================================================================
+# IMPORT TIME PARSING
+# ========================================================================
+
+def parse_importtime(lines) -> list:
+    """
+    Top-level entries of a "-X importtime" log (imports not made by another
+    module while it was loading): [{"name", "self_us", "cumulative_us"}, ...]
+    """
+    imports = []
+    for line in lines:
+        match = IMPORT_LINE.match(line.rstrip("\n"))
+        if match and not match.group(3):
+            imports.append({
+                "name": match.group(4),
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+            })
+    return imports
+
+
+def package_times(imports: list, importers: dict) -> dict:
+    """
+    Cumulative import time per top-level package, in ms, and what imported
+    the package first (a test file, conftest, or pytest and its plugins).
+    """
+    packages = {}
+    for entry in imports:
+        package = entry["name"].split(".")[0]
+        stats = packages.setdefault(package, {
+            "ms": 0.0,
+            "first_imported_by": importers.get(entry["name"], "pytest/plugins"),
+        })
+        stats["ms"] += entry["cumulative_us"] / 1000
+    return {name: {"ms": round(stats["ms"], 1), "first_imported_by": stats["first_imported_by"]}
+            for name, stats in sorted(packages.items(), key=lambda item: -item[1]["ms"])}
+
+
+# ========================================================================
+# PROFILING RUNS
+# ========================================================================
+
+def profile_once(pytest_args: list) -> dict:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output = Path(temp_dir) / "collect.json"
+        command = [sys.executable, "-X", "importtime", "-m", "pytest", "--collect-only", "-q",
+                   "-p", "no:cacheprovider", "-p", "no:xdist", "-p", "utilities.startup_profile_util", *pytest_args]
+        start = time.perf_counter()
+        result = subprocess.run(command, capture_output=True, text=True, env=dict(os.environ, **{OUTPUT_ENV: str(output)}))
+        total_ms = (time.perf_counter() - start) * 1000
+        if not output.exists():
+            errors = "\n".join(line for line in result.stderr.splitlines() if not IMPORT_LINE.match(line))
+            raise RuntimeError(f"[FAIL] Collection failed:\n{result.stdout[-2000:]}{errors[-2000:]}")
+        collected = json.loads(output.read_text(encoding="utf-8"))
+
+    return {
+        "total_ms": round(total_ms, 1),
+        "tests": collected["tests"],
+        "files": collected["files"],
+        "packages": package_times(parse_importtime(result.stderr.splitlines()), collected["importers"]),
+    }
+
+
+def profile(pytest_args: list, runs: int = 3) -> dict:
+    """Minimum of every number over several runs."""
+    profiles = [profile_once(pytest_args) for _ in range(runs)]
+    best = profiles[0]
+    best["total_ms"] = min(p["total_ms"] for p in profiles)
+    for nodeid in best["files"]:
+        best["files"][nodeid] = min(p["files"].get(nodeid, float("inf")) for p in profiles)
+    for name, stats in best["packages"].items():
+        stats["ms"] = min(p["packages"].get(name, {"ms": float("inf")})["ms"] for p in profiles)
+    best["runs"] = runs
+    best["pytest_args"] = pytest_args
+    return best
+
+
+def find_regressions(current: dict, baseline: dict, max_regression: float, min_ms: float) -> list:
+    """Entries that got slower than allowed, e.g. "file test/test_login.py: 120 -> 610 ms"."""
+    pairs = [("total", "collection", current["total_ms"], baseline["total_ms"])]
+    pairs += [("file", nodeid, ms, baseline["files"].get(nodeid, 0.0)) for nodeid, ms in current["files"].items()]
+    pairs += [("package", name, stats["ms"], baseline["packages"].get(name, {"ms": 0.0})["ms"])
+              for name, stats in current["packages"].items()]
+    return [f"{kind} {name}: {old:.0f} -> {new:.0f} ms"
+            for kind, name, new, old in pairs
+            if new - old > min_ms and new > old * (1 + max_regression)]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    pytest_args = argv[argv.index("--") + 1:] if "--" in argv else []
+    own_args = argv[:argv.index("--")] if "--" in argv else argv
+
+    parser = argparse.ArgumentParser(description="Profile import and collection time of the test suite")
+    parser.add_argument("--runs", type=int, default=3, help="Profiling runs (minimum is reported)")
+    parser.add_argument("--output", default="reports/startup/startup_profile.json")
+    parser.add_argument("--baseline", default="", help="Saved profile to compare with (fails on regressions)")
+    parser.add_argument("--save-baseline", action="store_true", help="Also save this profile as reports/startup/baseline.json")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed relative slowdown (0.2 = 20%%)")
+    parser.add_argument("--min-ms", type=float, default=50, help="Ignore slowdowns smaller than this")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(own_args)
+
+    report = profile(pytest_args, args.runs)
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=1), encoding="utf-8")
+    if args.save_baseline:
+        (output.parent / "baseline.json").write_text(json.dumps(report, indent=1), encoding="utf-8")
+
+    print(f"[OK] Collected {report['tests']} tests in {report['total_ms']:.0f} ms (min of {args.runs} runs)")
+    print("     Slowest imports:")
+    for name, stats in list(report["packages"].items())[:args.top]:
+        print(f"     {stats['ms']:>8.1f} ms  {name:<28} first imported by {stats['first_imported_by']}")
+    print("     Slowest test files:")
+    for nodeid, ms in sorted(report["files"].items(), key=lambda item: -item[1])[:args.top]:
+        print(f"     {ms:>8.1f} ms  {nodeid}")
+    print(f"[OK] Report: {output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = find_regressions(report, baseline, args.max_regression, args.min_ms)
+        if regressions:
+            print(f"[FAIL] Startup regressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"     {regression}")
+            sys.exit(1)
+        print(f"[OK] No startup regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# Named store states, restored into a test's browser context without any UI.
+#
+#   guest           a new visitor (empty cookie jar)
+#   guest_cart      a new visitor with Config.product_name in the cart
+#   logged_in       logged in with an account leased from the account pool
+#   logged_in_cart  logged in, with Config.product_name in the cart
+#
+# Chosen per test with @pytest.mark.store_state("logged_in_cart"). The state is
+# in place before the page fixture opens the base URL, so the test starts on
+# the Home page already logged in / with a filled cart.
+#
+# Snapshots: OpenCart keeps the session (login, checkout progress) on the
+# server behind the session cookie. The cookies of a logged-in session are
+# taken once per account and worker (one HTTP login) and restored into every
+# later test that leases the same account with context.add_cookies(), which
+# costs no request at all. The session must still be in its snapshot state for
+# that: when a test logs out or sends any other POST than a cart / wishlist
+# change (e.g. a checkout step, which is remembered in the session), the
+# snapshot is dropped and the next test logs in again. Cart and wishlist are
+# emptied by the account pool after each test, so the cart states add the
+# product with one HTTP request.
+# Orders cannot be undone: tests that place orders leave them in the shop.
+
+import re
+import time
+
+from config import Config
+from utilities.catalog_util import get_catalog
+from utilities.log_util import get_logger
+
+logger = get_logger(__name__)
+
+STORE_STATES = {
+    "guest": {"login": False, "cart": False},
+    "guest_cart": {"login": False, "cart": True},
+    "logged_in": {"login": True, "cart": False},
+    "logged_in_cart": {"login": True, "cart": True},
+}
+
+LOGOUT_PATTERN = re.compile(r"[?&]route=account/logout(&|$)")
+# POSTs the account pool undoes (cart and wishlist), all others change the session
+RESETTABLE_POST_PATTERN = re.compile(r"[?&]route=(checkout/cart|account/wishlist)[/.|]")
+
+
+def store_state(node):
+    """Store state of a test from @pytest.mark.store_state(name), None without the marker."""
+    marker = node.get_closest_marker("store_state")
+    if not marker:
+        return None
+    name = marker.args[0] if marker.args else "guest"
+    if name not in STORE_STATES:
+        raise ValueError(f"[FAIL] Unknown store state '{name}', use one of {', '.join(STORE_STATES)}")
+    return name
+
+
+def needs_account(state: str) -> bool:
+    return STORE_STATES[state]["login"]
+
+
+class StoreStates:
+    """
+    Restores named store states into new browser contexts (one instance per worker).
+
+    Example:
+        states = StoreStates("https://shop.example.com/")
+        context = browser.new_context()
+        states.restore(context, "logged_in_cart", account)   # account from the account pool
+    """
+
+    def __init__(self, base_url: str, product_name: str = Config.product_name,
+                 quantity: str = Config.product_quantity):
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.product_name = product_name
+        self.quantity = quantity
+        self.snapshots = {}     # account email -> cookies of its logged-in session
+
+    def url_for(self, route: str) -> str:
+        return f"{self.base_url}index.php?route={route}"
+
+    def restore(self, context, state: str, account: dict = None):
+        start = time.perf_counter()
+        settings = STORE_STATES[state]
+        if settings["login"]:
+            if account is None:
+                raise ValueError(f"[FAIL] Store state '{state}' needs an account from the account pool")
+            self._restore_login(context, account)
+        if settings["cart"]:
+            self._add_to_cart(context)
+        logger.info("[STATE] Restored store state '%s' in %.0f ms", state, (time.perf_counter() - start) * 1000)
+
+    # ===== Login snapshot =====
+
+    def _restore_login(self, context, account: dict):
+        email = account["email"]
+        cookies = self.snapshots.get(email)
+        if cookies:
+            context.add_cookies(cookies)
+        else:
+            # context.request shares the context's cookies: the login lands in the context
+            response = context.request.post(self.url_for("account/login"),
+                                            form={"email": email, "password": account["password"]})
+            if "account/account" not in response.url:
+                raise RuntimeError(f"[FAIL] Login of {email} failed (ended on {response.url})")
+            self.snapshots[email] = context.cookies()
+            logger.info("[STATE] Took a session snapshot for %s", email)
+
+        def drop_changed_snapshot(request):
+            if LOGOUT_PATTERN.search(request.url) or (
+                    request.method == "POST" and not RESETTABLE_POST_PATTERN.search(request.url)):
+                self.snapshots.pop(email, None)
+
+        context.on("request", drop_changed_snapshot)
+
+    # ===== Cart =====
+
+    def _add_to_cart(self, context):
+        catalog = get_catalog(self.base_url, fetch=lambda url: context.request.get(url).text())
+        product = catalog.find(self.product_name)
+        response = context.request.post(self.url_for("checkout/cart/add"),
+                                        form={"product_id": product["product_id"], "quantity": self.quantity})
+        try:
+            payload = response.json()
+        except Exception:
+            payload = {}
+        if not response.ok or "success" not in payload:
+            raise RuntimeError(f"[FAIL] Could not put '{self.product_name}' in the cart: HTTP {response.status} {payload}")
@@ -0,0 +1,393 @@
+# Synthetic monitoring: the sanity flows as a long-running daemon.
+#
+# Keeps one warm browser (launch profile "lean") and runs the page object
+# flows on a schedule:
+#   search        Home -> search -> product listed in the results
+#   add_to_cart   product page (catalog deep link) -> add to cart (server confirmed)
+#   logout        login with Config.email -> My Account -> logout
+# Every run gets a fresh BrowserContext. The next run of a flow is due after
+# --interval seconds +- --jitter; after repeated failures the interval doubles
+# per failure (up to --max-backoff), so a broken shop is not hammered.
+#
+# Metrics (Prometheus text format):
+#   synthetic_step_duration_seconds    histogram per flow, step and outcome
+#   synthetic_flow_duration_seconds    histogram per flow and outcome
+#   synthetic_flow_runs_total          counter per flow and outcome
+#   synthetic_flow_up, synthetic_flow_last_success_timestamp_seconds,
+#   synthetic_flow_consecutive_failures, synthetic_flow_next_run_seconds
+# written after every run to --metrics-file (node_exporter textfile collector)
+# and served on http://<host>:<--port>/metrics when --port is given.
+#
+# Usage:
+#   python -m utilities.synthetic_monitor_util --base-url https://shop.example.com/ --port 9464
+#   python -m utilities.synthetic_monitor_util --base-url http://localhost:8080/ --once   # one pass, exit 1 on failure
+#   python -m utilities.synthetic_monitor_util --flows search,add_to_cart --interval 60 --jitter 0.2
+
+import argparse
+import os
+import random
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from playwright.sync_api import expect, sync_playwright
+
+from config import Config
+from pages.home_page import HomePage
+from pages.login_page import LoginPage
+from pages.my_account_page import MyAccountPage
+from pages.product_page import ProductPage
+from pages.search_results_page import SearchResultsPage
+from utilities.browser_pool_util import BrowserPool
+from utilities.log_util import get_logger, set_test_context, start_logging, stop_logging
+from utilities.timeout_util import timeout_policy
+
+logger = get_logger(__name__)
+
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+# ========================================================================
+# METRICS
+# ========================================================================
+
+class MonitorMetrics:
+    """
+    Thread-safe metric store rendered in the Prometheus text exposition format.
+
+    Example:
+        metrics = MonitorMetrics()
+        metrics.observe_step("search", "open_home", 0.42, ok=True)
+        print(metrics.render())
+    """
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        self.step_durations = {}        # (flow, step, outcome) -> [bucket counts..., sum, count]
+        self.flow_durations = {}        # (flow, outcome) -> [bucket counts..., sum, count]
+        self.runs = {}                  # (flow, outcome) -> count
+        self.flows = {}                 # flow -> {"up", "last_success", "failures", "next_run"}
+
+    def _observe(self, histograms: dict, key: tuple, seconds: float):
+        values = histograms.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+        for index, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                values[index] += 1
+        values[-2] += seconds
+        values[-1] += 1
+
+    def observe_step(self, flow: str, step: str, seconds: float, ok: bool):
+        with self.lock:
+            self._observe(self.step_durations, (flow, step, "success" if ok else "failure"), seconds)
+
+    def observe_flow(self, flow: str, seconds: float, ok: bool, failures: int, next_run: float):
+        outcome = "success" if ok else "failure"
+        with self.lock:
+            self._observe(self.flow_durations, (flow, outcome), seconds)
+            self.runs[(flow, outcome)] = self.runs.get((flow, outcome), 0) + 1
+            state = self.flows.setdefault(flow, {"last_success": 0.0})
+            state.update(up=int(ok), failures=failures, next_run=next_run)
+            if ok:
+                state["last_success"] = time.time()
+
+    # ===== Exposition =====
+
+    def _histogram_lines(self, name: str, label_names: tuple, histograms: dict) -> list:
+        lines = []
+        for key, values in sorted(histograms.items()):
+            labels = ",".join(f'{label}="{value}"' for label, value in zip(label_names, key))
+            for bound, count in zip(self.buckets, values):
+                lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {values[-1]}')
+            lines.append(f"{name}_sum{{{labels}}} {values[-2]:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {values[-1]}")
+        return lines
+
+    def render(self) -> str:
+        with self.lock:
+            lines = [
+                "# HELP synthetic_step_duration_seconds Duration of one step of a synthetic flow.",
+                "# TYPE synthetic_step_duration_seconds histogram",
+                *self._histogram_lines("synthetic_step_duration_seconds", ("flow", "step", "outcome"),
+                                       self.step_durations),
+                "# HELP synthetic_flow_duration_seconds Duration of a whole synthetic flow run.",
+                "# TYPE synthetic_flow_duration_seconds histogram",
+                *self._histogram_lines("synthetic_flow_duration_seconds", ("flow", "outcome"), self.flow_durations),
+                "# HELP synthetic_flow_runs_total Synthetic flow runs.",
+                "# TYPE synthetic_flow_runs_total counter",
+                *(f'synthetic_flow_runs_total{{flow="{flow}",outcome="{outcome}"}} {count}'
+                  for (flow, outcome), count in sorted(self.runs.items())),
+            ]
+            gauges = (
+                ("synthetic_flow_up", "1 if the last run of the flow succeeded.", "up"),
+                ("synthetic_flow_last_success_timestamp_seconds", "Unix time of the last successful run.",
+                 "last_success"),
+                ("synthetic_flow_consecutive_failures", "Failed runs in a row.", "failures"),
+                ("synthetic_flow_next_run_seconds", "Delay until the next run (grows with backoff).", "next_run"),
+            )
+            for name, help_text, field in gauges:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+                lines += [f'{name}{{flow="{flow}"}} {state[field]}' for flow, state in sorted(self.flows.items())]
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Write atomically, so a collector never reads half a file."""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_text(self.render(), encoding="utf-8")
+        os.replace(temp_path, target)
+
+
+def start_http_server(metrics: MonitorMetrics, port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve /metrics from a background thread (the browser stays in the main thread)."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass    # no line per scrape
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+# ========================================================================
+# FLOWS (page object sequences, one "with step(...)" per measured step)
+# ========================================================================
+
+def flow_search(page, base_url: str, step):
+    with step("open_home"):
+        page.goto(base_url)
+    with step("search"):
+        home_page = HomePage(page)
+        home_page.enter_product_name(Config.product_name)
+        home_page.click_search()
+        expect(SearchResultsPage(page).is_product_exist(Config.product_name)).to_be_visible()
+
+
+def flow_add_to_cart(page, base_url: str, step):
+    with step("open_product"):
+        page.goto(base_url)
+        product_page = ProductPage(page).open(Config.product_name)
+    with step("add_to_cart"):
+        product_page.add_product_to_cart(Config.product_quantity, confirm=True)
+
+
+def flow_logout(page, base_url: str, step):
+    with step("open_home"):
+        page.goto(base_url)
+    with step("login"):
+        home_page = HomePage(page)
+        home_page.click_my_account()
+        home_page.click_login()
+        LoginPage(page).login(Config.email, Config.password)
+        my_account_page = MyAccountPage(page)
+        expect(my_account_page.get_my_account_page_heading()).to_be_visible()
+    with step("logout"):
+        logout_page = my_account_page.click_logout()
+        expect(logout_page.get_continue_button()).to_be_visible()
+        logout_page.click_continue()
+
+
+FLOWS = {
+    "search": flow_search,
+    "add_to_cart": flow_add_to_cart,
+    "logout": flow_logout,
+}
+
+
+def execute_flow(flow: str, page, base_url: str, metrics: MonitorMetrics):
+    """
+    Run one flow on a page and record every step.
+    Returns (ok, duration in seconds, error text or None).
+    """
+    @contextmanager
+    def step(name):
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            metrics.observe_step(flow, name, time.perf_counter() - start, ok)
+
+    start = time.perf_counter()
+    try:
+        FLOWS[flow](page, base_url, step)
+        return True, time.perf_counter() - start, None
+    except Exception as e:
+        return False, time.perf_counter() - start, str(e).splitlines()[0] if str(e) else type(e).__name__
+
+
+# ========================================================================
+# DAEMON
+# ========================================================================
+
+class SyntheticMonitor:
+    """
+    Runs the flows on a schedule with one warm browser.
+
+    Example:
+        monitor = SyntheticMonitor(playwright, "https://shop.example.com/", ["search"], interval=60)
+        monitor.run()            # until SIGTERM / Ctrl+C
+    """
+
+    def __init__(self, playwright, base_url: str, flows: list, interval: float = 300, jitter: float = 0.1,
+                 max_backoff: float = 3600, browser_name: str = "chromium", profile: str = "lean",
+                 timeout_ms: int = 15000, metrics_file: str = "reports/monitoring/synthetic.prom",
+                 output_dir: str = "reports/monitoring", recycle_after: int = 500):
+        self.pool = BrowserPool(playwright, headless=True)
+        self.base_url = base_url
+        self.flows = flows
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.browser_name = browser_name
+        self.profile = profile
+        self.timeout_ms = timeout_ms
+        self.metrics_file = metrics_file
+        self.output_dir = Path(output_dir)
+        self.recycle_after = recycle_after
+        self.metrics = MonitorMetrics()
+        self.failures = {flow: 0 for flow in flows}
+        self.stop_event = threading.Event()
+        self.runs = 0
+
+    def next_delay(self, flow: str) -> float:
+        """Interval with jitter; doubles per failure in a row after the first (capped at max_backoff)."""
+        delay = min(self.interval * 2 ** max(self.failures[flow] - 1, 0), self.max_backoff)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def run_flow(self, flow: str):
+        """One run in a fresh context on the warm browser. Returns (ok, delay until the next run)."""
+        set_test_context(f"synthetic::{flow}")
+        try:
+            context = self.pool.new_context(self.browser_name, profile=self.profile)
+        except Exception as e:
+            # Browser crashed or could not start: a failed run, relaunched next time
+            self.pool.close_all()
+            ok, seconds, error = False, 0.0, str(e).splitlines()[0]
+        else:
+            timeout_policy().set_default_timeout(context, self.timeout_ms)
+            page = context.new_page()
+            ok, seconds, error = execute_flow(flow, page, self.base_url, self.metrics)
+            if not ok:
+                # Only the latest failure per flow is kept, so a long outage cannot fill the disk
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                try:
+                    page.screenshot(path=str(self.output_dir / f"{flow}-last-failure.png"))
+                except Exception:
+                    pass
+            try:
+                context.close()
+            except Exception:
+                self.pool.close_all()
+        set_test_context(None)
+
+        self.failures[flow] = 0 if ok else self.failures[flow] + 1
+        delay = self.next_delay(flow)
+        self.metrics.observe_flow(flow, seconds, ok, self.failures[flow], round(delay, 1))
+        self.metrics.write(self.metrics_file)
+        if ok:
+            logger.info("[MONITOR] %s ok in %.2fs, next in %.0fs", flow, seconds, delay)
+        else:
+            logger.warning("[MONITOR] %s failed (%d in a row) after %.2fs: %s, next in %.0fs",
+                           flow, self.failures[flow], seconds, error, delay)
+
+        # A browser running for days slowly grows: relaunch it now and then
+        self.runs += 1
+        if self.recycle_after and self.runs % self.recycle_after == 0:
+            self.pool.close_all()
+        return ok, delay
+
+    def run_once(self) -> int:
+        """Every flow once; returns the number of failed flows."""
+        return sum(not self.run_flow(flow)[0] for flow in self.flows)
+
+    def run(self):
+        """Run until stop() (SIGTERM / SIGINT). The first runs are spread over one jitter window."""
+        try:
+            self.pool.get(self.browser_name, self.profile)      # warm browser
+        except Exception as e:
+            logger.error("[MONITOR] Browser could not start, the runs will retry: %s", str(e).splitlines()[0])
+        now = time.monotonic()
+        next_run = {flow: now + random.uniform(0, self.interval * self.jitter) for flow in self.flows}
+        while not self.stop_event.is_set():
+            flow = min(next_run, key=next_run.get)
+            wait = next_run[flow] - time.monotonic()
+            if wait > 0 and self.stop_event.wait(wait):
+                break
+            _, delay = self.run_flow(flow)
+            next_run[flow] = time.monotonic() + delay
+
+    def stop(self, *_):
+        self.stop_event.set()
+
+    def close(self):
+        self.pool.close_all()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the sanity flows as synthetic monitoring")
+    parser.add_argument("--base-url", default="https://tutorialsninja.com/demo/", help="Shop to monitor")
+    parser.add_argument("--flows", default=",".join(FLOWS), help=f"Comma separated: {', '.join(FLOWS)}")
+    parser.add_argument("--interval", type=float, default=300, help="Seconds between runs of a flow")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Random +- share of the interval (0.1 = 10%%)")
+    parser.add_argument("--max-backoff", type=float, default=3600, help="Longest delay after repeated failures")
+    parser.add_argument("--browser", default="chromium")
+    parser.add_argument("--launch-profile", default="lean")
+    parser.add_argument("--timeout", type=int, default=15000, help="Playwright timeout per action in ms")
+    parser.add_argument("--metrics-file", default="reports/monitoring/synthetic.prom")
+    parser.add_argument("--port", type=int, default=0, help="Serve /metrics on this port (0 = no HTTP)")
+    parser.add_argument("--once", action="store_true", help="Run every flow once and exit (1 if a flow failed)")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args(argv)
+
+    flows = [flow.strip() for flow in args.flows.split(",") if flow.strip()]
+    unknown = [flow for flow in flows if flow not in FLOWS]
+    if unknown:
+        parser.error(f"unknown flows: {', '.join(unknown)}")
+
+    start_logging(log_dir="", level=args.log_level, echo_level=args.log_level, worker="monitor")
+    playwright = sync_playwright().start()
+    monitor = SyntheticMonitor(playwright, args.base_url, flows, interval=args.interval, jitter=args.jitter,
+                               max_backoff=args.max_backoff, browser_name=args.browser,
+                               profile=args.launch_profile, timeout_ms=args.timeout,
+                               metrics_file=args.metrics_file)
+    server = start_http_server(monitor.metrics, args.port) if args.port else None
+    signal.signal(signal.SIGTERM, monitor.stop)
+    signal.signal(signal.SIGINT, monitor.stop)
+    failed = 0
+    try:
+        if args.once:
+            failed = monitor.run_once()
+        else:
+            logger.info("[MONITOR] Monitoring %s every %ss: %s", args.base_url, args.interval, ", ".join(flows))
+            monitor.run()
+    finally:
+        monitor.close()
+        playwright.stop()
+        if server:
+            server.shutdown()
+        stop_logging()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+# Adaptive, history-based timeouts for page object actions.
+#
+# Every public page object method that drives the page (e.g.
+# "LoginPage.click_login"; pure locator getters marked @untimed are not timed)
+# and every BasePage.expect_visible() check is timed. The durations of
+# successful runs are kept per action in .timings_cache/action_timings.json
+# (the last 100 per action, merged by the controller at the end of the run).
+# While an action runs it gets
+#     timeout = p99 of its history x multiplier, clamped to [floor, ceiling]
+# as the page default timeout (clicks, fills, waits, navigation) and as the
+# expect() timeout. A broken selector then fails after a few seconds instead
+# of 30 s, while a slow-but-healthy step still gets a multiple of its own
+# worst case. Actions with fewer than 5 recorded runs keep the caller's
+# timeouts (e.g. expect_visible(..., timeout=3000), otherwise the page /
+# expect() defaults).
+#
+# After an action the configured timeouts are restored. Playwright has no
+# getters for them, so timeouts meant to last are set through the policy:
+#     timeout_policy().set_default_timeout(page_or_context, 10000)
+#     timeout_policy().set_expect_timeout(8000)
+# Anything else is restored to Playwright's defaults (30 s, expect() 5 s).
+#
+# Drift: actions whose median in this run is more than 1.5x (and 200 ms) above
+# their recorded median, and the actions that hit their adaptive timeout, are
+# listed in the "action timeouts" terminal summary.
+#
+# Modes (--action-timeouts):
+#   adaptive  apply the learned timeouts and record new durations (default)
+#   record    only record durations (Playwright defaults stay), e.g. to seed the history
+#   off       no timing at all
+
+import json
+import math
+import os
+import statistics
+import time
+import weakref
+from contextlib import contextmanager
+
+from playwright.sync_api import expect
+
+from utilities.log_util import get_logger
+
+logger = get_logger(__name__)
+
+TIMEOUT_MODES = ("adaptive", "record", "off")
+PLAYWRIGHT_DEFAULT_MS = 30000
+EXPECT_DEFAULT_MS = 5000    # Playwright's expect() default
+HISTORY_SIZE = 100          # durations kept per action
+MIN_SAMPLES = 5             # fewer recorded runs: the caller's timeout is kept
+DRIFT_RATIO = 1.5           # median of this run vs. recorded median
+DRIFT_MIN_MS = 200          # ignore drifts smaller than this
+
+
+def load_history(path: str) -> dict:
+    """Return {action: [ms, ...]} from the timings file (empty if missing)."""
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_history(path: str, new_samples: dict):
+    """Append the durations of this run to the timings file (last HISTORY_SIZE per action)."""
+    history = load_history(path)
+    for action, samples in new_samples.items():
+        history[action] = (history.get(action, []) + [round(ms, 1) for ms in samples])[-HISTORY_SIZE:]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(dict(sorted(history.items())), file, indent=1)
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile, e.g. percentile(durations, 0.99)."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class TimeoutPolicy:
+    """
+    Timeouts per page object action, learned from earlier runs.
+
+    Example:
+        policy = TimeoutPolicy(load_history(".timings_cache/action_timings.json"), multiplier=3)
+        with policy.action(page, "LoginPage.click_login"):
+            login_page.btn_login.click()        # runs with the adaptive timeout
+        run = policy.drain()                    # {"samples": {...}, "timeouts": {...}}
+    """
+
+    def __init__(self, history: dict = None, mode: str = "off", multiplier: float = 3.0,
+                 floor_ms: float = 2000, ceiling_ms: float = PLAYWRIGHT_DEFAULT_MS):
+        if mode not in TIMEOUT_MODES:
+            raise ValueError(f"[FAIL] Unknown action timeout mode '{mode}', use one of {', '.join(TIMEOUT_MODES)}")
+        self.history = history or {}
+        self.mode = mode
+        self.multiplier = multiplier
+        self.floor_ms = floor_ms
+        self.ceiling_ms = ceiling_ms
+        self.samples = {}       # action -> [ms] of successful runs (since the last drain)
+        self.timeouts = {}      # action -> number of runs that hit the adaptive timeout
+        self._active = []       # [(action, timeout)] of the running outer action
+        self.expect_timeout = EXPECT_DEFAULT_MS
+        self._default_timeouts = weakref.WeakKeyDictionary()    # page or context -> configured timeout
+
+    def set_default_timeout(self, target, timeout_ms: float):
+        """Set the default timeout of a page or context, restored after every adaptive action."""
+        target.set_default_timeout(timeout_ms)
+        self._default_timeouts[target] = timeout_ms
+
+    def set_expect_timeout(self, timeout_ms: float):
+        """Set the expect() timeout, restored after every adaptive action."""
+        expect.set_options(timeout=timeout_ms)
+        self.expect_timeout = timeout_ms
+
+    def default_timeout(self, page) -> float:
+        """Configured default timeout of a page: its own, its context's, or Playwright's."""
+        for target in (page, getattr(page, "context", None)):
+            if target is not None and target in self._default_timeouts:
+                return self._default_timeouts[target]
+        return PLAYWRIGHT_DEFAULT_MS
+
+    def timeout_for(self, action: str):
+        """Learned timeout of an action in ms, None without enough history."""
+        history = self.history.get(action, [])
+        if len(history) < MIN_SAMPLES:
+            return None
+        return min(self.ceiling_ms, max(self.floor_ms, percentile(history, 0.99) * self.multiplier))
+
+    def current_timeout(self, default: float) -> float:
+        """Timeout of the running action (adaptive mode), otherwise the given default."""
+        timeout = self._active[-1][1] if self._active and self.mode == "adaptive" else None
+        return default if timeout is None else timeout
+
+    @contextmanager
+    def action(self, page, name: str):
+        """
+        Time one action and apply its timeout. Actions called by another action
+        (e.g. login() calling set_email()) run under the outer action's timeout
+        and are not recorded separately. Without enough history the page and
+        expect() timeouts stay as they are.
+        """
+        if self.mode == "off" or self._active:
+            yield
+            return
+
+        timeout = self.timeout_for(name)
+        self._active.append((name, timeout))
+        apply = self.mode == "adaptive" and timeout is not None
+        if apply:
+            page.set_default_timeout(timeout)
+            expect.set_options(timeout=timeout)
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if apply and elapsed_ms >= timeout:
+                self.timeouts[name] = self.timeouts.get(name, 0) + 1
+                logger.warning("[TIMEOUT] %s failed after %.0f ms (adaptive timeout %.0f ms)", name, elapsed_ms, timeout)
+            raise
+        else:
+            self.samples.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+        finally:
+            self._active.pop()
+            if apply:
+                # Back to what the test (or Playwright) had configured
+                page.set_default_timeout(self.default_timeout(page))
+                expect.set_options(timeout=self.expect_timeout)
+
+    def drain(self) -> dict:
+        """Return and reset what was recorded since the last call (sent to the controller per test)."""
+        run = {"samples": self.samples, "timeouts": self.timeouts}
+        self.samples, self.timeouts = {}, {}
+        return run
+
+
+_policy = TimeoutPolicy()
+
+
+def configure_timeouts(history_path: str, mode: str = "adaptive", multiplier: float = 3.0,
+                       floor_ms: float = 2000, ceiling_ms: float = PLAYWRIGHT_DEFAULT_MS) -> TimeoutPolicy:
+    """Load the timings file and make the policy the one used by all page objects."""
+    global _policy
+    history = load_history(history_path) if mode != "off" else {}
+    _policy = TimeoutPolicy(history, mode, multiplier, floor_ms, ceiling_ms)
+    return _policy
+
+
+def timeout_policy() -> TimeoutPolicy:
+    return _policy
+
+
+def drift_report(policy: TimeoutPolicy, samples: dict, timeouts: dict) -> list:
+    """
+    Terminal lines for the actions of this run that drifted from their history
+    or hit their adaptive timeout.
+    """
+    lines = []
+    for action in sorted(samples):
+        history = policy.history.get(action, [])
+        if len(history) < MIN_SAMPLES:
+            continue
+        before, now = statistics.median(history), statistics.median(samples[action])
+        if now > before * DRIFT_RATIO and now - before > DRIFT_MIN_MS:
+            lines.append(f"DRIFT   {action}: median {before:.0f} -> {now:.0f} ms "
+                         f"(timeout {policy.timeout_for(action):.0f} ms)")
+    for action, count in sorted(timeouts.items()):
+        lines.append(f"TIMEOUT {action}: {count}x after {policy.timeout_for(action):.0f} ms")
+    return lines
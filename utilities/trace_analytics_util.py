@@ -0,0 +1,330 @@
+# Suite-wide analysis of Playwright trace archives.
+#
+# Reads every reports/traces/*.zip directly from the archive (nothing is
+# extracted to disk) and collects:
+#   - actions ("before"/"after" events of trace.trace) with their durations
+#   - network requests (resource snapshots of trace.network)
+#   - the page object method that issued each action (from trace.stacks,
+#     written when tracing runs with sources=True, see conftest.py)
+# Only the few line types needed are parsed; DOM snapshots and screencast
+# frames are skipped without decoding their JSON.
+#
+# Output (reports/trace_analytics/):
+#   report.json   all numbers (per test, per page object method, rankings)
+#   report.html   suite-wide waterfall + slowest actions / navigations / requests
+#
+# Usage:
+#   python -m utilities.trace_analytics_util
+#   python -m utilities.trace_analytics_util --traces reports/traces --top 30 --jobs 4
+
+import argparse
+import html
+import io
+import json
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Playwright methods that load a new document
+NAVIGATION_METHODS = {"goto", "reload", "goBack", "goForward", "waitForURL", "waitForNavigation", "waitForLoadState"}
+
+# Only these trace lines are decoded
+WANTED_PREFIXES = ('{"type":"before"', '{"type":"after"', '{"type":"action"', '{"type":"context-options"')
+
+
+# ========================================================================
+# PAGE OBJECT METHOD INDEX
+# ========================================================================
+
+def page_method_index() -> dict:
+    """
+    Lookup of page object methods. The Python client records frames as
+    "ClassName.method" (class of self), older traces only as "method"; the
+    second form is matched by (page module file name, function name), which
+    still works for traces recorded on another machine.
+    """
+    import inspect
+    from pages.base_page import all_page_classes, import_page_modules
+
+    import_page_modules()
+    index = {}
+    for cls in all_page_classes():
+        file_name = Path(inspect.getsourcefile(cls)).name
+        for name in dir(cls):
+            if name.startswith("__") or not callable(getattr(cls, name, None)):
+                continue
+            index[f"{cls.__name__}.{name}"] = f"{cls.__name__}.{name}"
+            if name in vars(cls):
+                index[(file_name, name)] = f"{cls.__name__}.{name}"
+    return index
+
+
+def caller_of(stack: list, method_index: dict):
+    """Return (page object method, test function) for a client-side call stack."""
+    page_method, test_function = None, None
+    for frame in stack:       # innermost frame first
+        file_name = Path(frame["file"]).name
+        function = frame["function"]
+        if page_method is None:
+            page_method = method_index.get(function) or method_index.get((file_name, function))
+        if test_function is None and file_name.startswith("test_") and "." not in function:
+            test_function = function
+    return page_method, test_function
+
+
+# ========================================================================
+# READING ONE TRACE
+# ========================================================================
+
+def _read_lines(archive: zipfile.ZipFile, name: str):
+    if name not in archive.namelist():
+        return
+    with archive.open(name) as raw:
+        for line in io.TextIOWrapper(raw, encoding="utf-8"):
+            yield line
+
+
+def read_stacks(archive: zipfile.ZipFile) -> dict:
+    """callId -> list of frames {file, line, column, function}."""
+    if "trace.stacks" not in archive.namelist():
+        return {}
+    data = json.loads(archive.read("trace.stacks"))
+    files = data.get("files", [])
+    stacks = {}
+    for call_id, frames in data.get("stacks", []):
+        key = f"call@{call_id}" if isinstance(call_id, int) else call_id
+        stacks[key] = [{"file": files[f[0]], "line": f[1], "column": f[2], "function": f[3]} for f in frames]
+    return stacks
+
+
+def analyse_trace(path: str, method_index: dict = None) -> dict:
+    """Actions and requests of one trace archive, times in ms from the trace start."""
+    method_index = method_index if method_index is not None else page_method_index()
+    actions = {}
+    context = {}
+    with zipfile.ZipFile(path) as archive:
+        for line in _read_lines(archive, "trace.trace"):
+            if not line.strip() or (line.startswith('{"type":') and not line.startswith(WANTED_PREFIXES)):
+                continue
+            event = json.loads(line)
+            kind = event.get("type")
+            if kind == "context-options":
+                context = event
+            elif kind == "before":
+                actions[event["callId"]] = {
+                    "call_id": event["callId"],
+                    "step_id": event.get("stepId"),
+                    "method": event.get("method", ""),
+                    "api": event.get("title") or event.get("apiName") or f"{event.get('class')}.{event.get('method')}",
+                    "selector": (event.get("params") or {}).get("selector") or (event.get("params") or {}).get("url"),
+                    "start": event.get("startTime", 0),
+                    "end": None,
+                    "error": None,
+                }
+            elif kind == "after" and event.get("callId") in actions:
+                action = actions[event["callId"]]
+                action["end"] = event.get("endTime")
+                action["error"] = (event.get("error") or {}).get("message") if event.get("error") else None
+            elif kind == "action":        # traces of old Playwright versions
+                metadata = event.get("metadata", event)
+                actions[metadata.get("id", len(actions))] = {
+                    "call_id": metadata.get("id"), "step_id": None,
+                    "method": metadata.get("method", ""), "api": metadata.get("apiName", ""),
+                    "selector": (metadata.get("params") or {}).get("selector"),
+                    "start": metadata.get("startTime", 0), "end": metadata.get("endTime"), "error": None,
+                }
+
+        requests = []
+        for line in _read_lines(archive, "trace.network"):
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            snapshot = event.get("snapshot") or {}
+            if event.get("type") != "resource-snapshot" or "request" not in snapshot:
+                continue
+            requests.append({
+                "url": snapshot["request"].get("url", ""),
+                "method": snapshot["request"].get("method", ""),
+                "status": (snapshot.get("response") or {}).get("status"),
+                "start": snapshot.get("_monotonicTime"),
+                "duration": round(snapshot.get("time") or 0, 1),
+            })
+
+        stacks = read_stacks(archive)
+
+    origin = context.get("monotonicTime") or min((a["start"] for a in actions.values()), default=0)
+    result_actions = []
+    for action in actions.values():
+        stack = stacks.get(action["call_id"]) or stacks.get(action["step_id"]) or []
+        page_method, test_function = caller_of(stack, method_index)
+        end = action["end"] if action["end"] is not None else action["start"]
+        result_actions.append({
+            "api": action["api"],
+            "method": action["method"],
+            "selector": action["selector"],
+            "navigation": action["method"] in NAVIGATION_METHODS,
+            "page_method": page_method,
+            "test_function": test_function,
+            "start": round(action["start"] - origin, 1),
+            "duration": round(end - action["start"], 1),
+            "error": action["error"],
+        })
+    for request in requests:
+        request["start"] = round(request["start"] - origin, 1) if request["start"] is not None else None
+
+    result_actions.sort(key=lambda a: a["start"])
+    return {
+        "trace": Path(path).name,
+        "test": Path(path).name.replace("_trace.zip", ""),
+        "browser": context.get("browserName"),
+        "wall_start": context.get("wallTime"),
+        "duration": max((a["start"] + a["duration"] for a in result_actions), default=0),
+        "actions": result_actions,
+        "requests": requests,
+    }
+
+
+# ========================================================================
+# SUITE-WIDE REPORT
+# ========================================================================
+
+def percentile(values: list, share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * share), len(ordered) - 1)] if ordered else 0
+
+
+def build_report(traces: list, top: int = 25) -> dict:
+    all_actions = [dict(action, test=trace["test"]) for trace in traces for action in trace["actions"]]
+    all_requests = [dict(request, test=trace["test"]) for trace in traces for request in trace["requests"]]
+
+    per_method = {}
+    for action in all_actions:
+        per_method.setdefault(action["page_method"] or f"(direct) {action['api']}", []).append(action["duration"])
+    methods = sorted((
+        {
+            "method": name,
+            "calls": len(durations),
+            "total_ms": round(sum(durations), 1),
+            "p50_ms": percentile(durations, 0.5),
+            "p95_ms": percentile(durations, 0.95),
+            "max_ms": max(durations),
+        } for name, durations in per_method.items()
+    ), key=lambda m: -m["total_ms"])
+
+    def slowest(items):
+        return sorted(items, key=lambda item: -item["duration"])[:top]
+
+    return {
+        "traces": len(traces),
+        "actions": len(all_actions),
+        "requests": len(all_requests),
+        "total_action_ms": round(sum(a["duration"] for a in all_actions), 1),
+        "page_methods": methods,
+        "slowest_actions": slowest([a for a in all_actions if not a["navigation"]]),
+        "slowest_navigations": slowest([a for a in all_actions if a["navigation"]]),
+        "slowest_requests": slowest(all_requests),
+        "tests": [
+            {key: trace[key] for key in ("test", "browser", "wall_start", "duration", "actions")}
+            for trace in sorted(traces, key=lambda t: t["wall_start"] or 0)
+        ],
+    }
+
+
+def _waterfall_html(tests: list) -> str:
+    """One row per test on a shared wall clock axis, one bar per action."""
+    starts = [t["wall_start"] for t in tests if t["wall_start"]]
+    suite_start = min(starts) if starts else 0
+    suite_end = max(((t["wall_start"] or suite_start) + t["duration"] for t in tests), default=1)
+    span = max(suite_end - suite_start, 1)
+
+    rows = []
+    for test in tests:
+        offset = (test["wall_start"] or suite_start) - suite_start
+        bars = []
+        for action in test["actions"]:
+            left = (offset + action["start"]) / span * 100
+            width = max(action["duration"] / span * 100, 0.05)
+            css = "nav" if action["navigation"] else ("err" if action["error"] else "act")
+            label = f"{action['page_method'] or action['api']} {action['duration']} ms"
+            bars.append(f'<i class="{css}" style="left:{left:.3f}%;width:{width:.3f}%" title="{html.escape(label)}"></i>')
+        rows.append(f'<div class="row"><span>{html.escape(test["test"])}</span><div class="lane">{"".join(bars)}</div></div>')
+    return "\n".join(rows)
+
+
+def _table_html(title: str, rows: list, columns: list) -> str:
+    head = "".join(f"<th>{html.escape(label)}</th>" for label, _ in columns)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{html.escape(str(row.get(key) if row.get(key) is not None else ''))}</td>"
+                         for _, key in columns) + "</tr>"
+        for row in rows
+    )
+    return f"<h2>{html.escape(title)}</h2><table><tr>{head}</tr>{body}</table>"
+
+
+def write_report(report: dict, output_dir: str):
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    (output / "report.json").write_text(json.dumps(report, indent=1), encoding="utf-8")
+
+    action_columns = [("ms", "duration"), ("Page object method", "page_method"), ("API", "api"),
+                      ("Selector / URL", "selector"), ("Test", "test")]
+    page = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Trace analytics</title>
+<style>
+body {{ font-family: sans-serif; margin: 20px; }}
+table {{ border-collapse: collapse; margin-bottom: 20px; font-size: 13px; }}
+td, th {{ border: 1px solid #ccc; padding: 3px 8px; text-align: left; }}
+.row {{ display: flex; align-items: center; font-size: 12px; }}
+.row span {{ width: 320px; overflow: hidden; white-space: nowrap; text-overflow: ellipsis; }}
+.lane {{ position: relative; flex: 1; height: 14px; background: #f4f4f4; margin: 1px 0; }}
+.lane i {{ position: absolute; top: 2px; height: 10px; }}
+.act {{ background: #4a90d9; }} .nav {{ background: #e6a23c; }} .err {{ background: #d9534f; }}
+</style></head><body>
+<h1>Trace analytics</h1>
+<p>{report['traces']} traces, {report['actions']} actions ({report['total_action_ms'] / 1000:.1f} s),
+{report['requests']} requests. Blue = action, orange = navigation, red = failed action.</p>
+<h2>Waterfall</h2>
+{_waterfall_html(report['tests'])}
+{_table_html("Page object methods (by total time)", report['page_methods'],
+             [("Method", "method"), ("Calls", "calls"), ("Total ms", "total_ms"), ("p50 ms", "p50_ms"),
+              ("p95 ms", "p95_ms"), ("Max ms", "max_ms")])}
+{_table_html("Slowest actions", report['slowest_actions'], action_columns)}
+{_table_html("Slowest navigations", report['slowest_navigations'], action_columns)}
+{_table_html("Slowest requests", report['slowest_requests'],
+             [("ms", "duration"), ("Method", "method"), ("Status", "status"), ("URL", "url"), ("Test", "test")])}
+</body></html>"""
+    (output / "report.html").write_text(page, encoding="utf-8")
+
+
+def analyse_folder(traces_dir: str, jobs: int = 1) -> list:
+    paths = sorted(str(path) for path in Path(traces_dir).glob("*.zip"))
+    method_index = page_method_index()
+    if jobs <= 1 or len(paths) < 2:
+        return [analyse_trace(path, method_index) for path in paths]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(analyse_trace, paths, [method_index] * len(paths)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suite-wide action waterfall from Playwright trace zips")
+    parser.add_argument("--traces", default="reports/traces", help="Folder with *_trace.zip files")
+    parser.add_argument("--output", default="reports/trace_analytics", help="Output folder (report.html / .json)")
+    parser.add_argument("--top", type=int, default=25, help="Entries in each 'slowest' list")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Parallel processes")
+    args = parser.parse_args(argv)
+
+    traces = analyse_folder(args.traces, args.jobs)
+    if not traces:
+        print(f"[FAIL] No trace archives in {args.traces}")
+        return
+    report = build_report(traces, args.top)
+    write_report(report, args.output)
+    print(f"[OK] {report['traces']} traces, {report['actions']} actions, {report['requests']} requests")
+    for action in report["slowest_actions"][:5]:
+        print(f"     {action['duration']:>8} ms  {action['page_method'] or action['api']}  ({action['test']})")
+    print(f"[OK] Report: {Path(args.output) / 'report.html'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+# Visual regression checks for page objects.
+#
+# A screenshot is compared with a stored baseline in steps, cheapest first:
+#   1. exact:  SHA-1 of the PNG bytes equals the baseline's -> match (microseconds,
+#              the common case for an unchanged page, nothing is decoded)
+#   2. size:   width/height from the PNG header differ from the baseline's -> mismatch
+#   3. hash:   a 64-bit perceptual hash (dHash, from a 9x8 thumbnail) differs
+#              in many bits from the stored one -> clear layout change, mismatch
+#              without decoding the baseline or any threshold tuning
+#   4. pixels: NumPy diff of the whole image, only for near-matches; the share
+#              of pixels whose largest channel difference exceeds the tolerance decides
+# A diff image (changed pixels in red over a faded screenshot) and the actual
+# screenshot are written only on mismatch (the full pixel diff is run for it).
+#
+# Dynamic regions (prices, carousels, the header cart total) are masked while
+# the screenshot is taken, see VISUAL_MASKS in the page objects.
+#
+# Baselines: visual_baselines/<browser>/<name>.png (+ <name>.json with the hashes).
+# Screenshots depend on the machine (fonts, GPU), so the baselines are not in
+# git: keep them per CI runner (e.g. as a cache). Visual tests are opt-in
+# (deselected in pytest.ini), a missing baseline is stored and reported as "new".
+# Re-baseline:
+#   pytest -m visual --visual-update                  # take new baselines for all visual tests
+#   python -m utilities.visual_util --accept          # accept the mismatches of the last run
+#   python -m utilities.visual_util --accept --pattern "chromium/Home*"
+#
+# Needs numpy and Pillow.
+
+import argparse
+import hashlib
+import io
+import json
+import shutil
+import time
+from pathlib import Path
+
+from utilities.log_util import get_logger
+
+logger = get_logger(__name__)
+
+MASK_COLOR = "#FF00FF"
+
+
+def _imaging():
+    """Import numpy and Pillow only when a comparison really needs them."""
+    try:
+        import numpy
+        from PIL import Image
+    except ImportError as e:
+        raise ImportError("[FAIL] Visual checks need numpy and Pillow: pip install numpy Pillow") from e
+    return numpy, Image
+
+
+def decode(png_bytes: bytes):
+    """PNG bytes -> RGB uint8 array (height x width x 3)."""
+    np, Image = _imaging()
+    with Image.open(io.BytesIO(png_bytes)) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def dhash(pixels) -> int:
+    """64-bit difference hash: is each pixel of a 9x8 grayscale thumbnail brighter than its left neighbour."""
+    np, Image = _imaging()
+    if pixels.shape != (8, 9):
+        pixels = np.asarray(Image.fromarray(pixels).convert("L").resize((9, 8), Image.BILINEAR))
+    thumb = pixels.astype(np.int16)
+    bits = (thumb[:, 1:] > thumb[:, :-1]).flatten()
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def png_size(png_bytes: bytes) -> tuple:
+    """(width, height) from the PNG header, without decoding the image."""
+    return int.from_bytes(png_bytes[16:20], "big"), int.from_bytes(png_bytes[20:24], "big")
+
+
+def png_dhash(png_bytes: bytes) -> int:
+    """dHash straight from PNG bytes (no full RGB array is built)."""
+    np, Image = _imaging()
+    with Image.open(io.BytesIO(png_bytes)) as image:
+        return dhash(np.asarray(image.convert("L").resize((9, 8), Image.BILINEAR)))
+
+
+def hash_distance(first: int, second: int) -> int:
+    return bin(first ^ second).count("1")
+
+
+def pixel_diff(actual, baseline, tolerance: int):
+    """
+    Vectorised comparison of two RGB arrays (padded to the same size).
+    Returns (changed pixel mask, share of changed pixels).
+    """
+    np, _ = _imaging()
+    height = max(actual.shape[0], baseline.shape[0])
+    width = max(actual.shape[1], baseline.shape[1])
+    if actual.shape != baseline.shape:
+        padded = []
+        for pixels in (actual, baseline):
+            canvas = np.zeros((height, width, 3), dtype=np.uint8)
+            canvas[:pixels.shape[0], :pixels.shape[1]] = pixels
+            padded.append(canvas)
+        actual, baseline = padded
+
+    # |a - b| in uint8 without overflow, then "any channel above tolerance"
+    # (per-channel comparisons are much faster than max(axis=2) on large images)
+    difference = np.maximum(actual, baseline)
+    difference -= np.minimum(actual, baseline)
+    changed = difference[..., 0] > tolerance
+    changed |= difference[..., 1] > tolerance
+    changed |= difference[..., 2] > tolerance
+    return changed, np.count_nonzero(changed) / changed.size
+
+
+def diff_image(actual, changed) -> bytes:
+    """Faded screenshot with the changed pixels in red, as PNG bytes."""
+    np, Image = _imaging()
+    fade = (np.arange(256) * 3 // 10 + 178).astype(np.uint8)
+    canvas = np.full(changed.shape + (3,), 255, dtype=np.uint8)
+    canvas[:actual.shape[0], :actual.shape[1]] = fade[actual]
+    canvas[changed] = (255, 0, 0)
+    buffer = io.BytesIO()
+    Image.fromarray(canvas).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class VisualChecker:
+    """
+    Compares page screenshots with their baselines.
+
+    Example:
+        checker = VisualChecker(update=False)
+        result = checker.check(page, "HomePage", mask=[page.locator(".price")])
+        assert result["status"] != "mismatch"
+    """
+
+    def __init__(self, baseline_dir: str = "visual_baselines", output_dir: str = "reports/visual",
+                 update: bool = False, pixel_tolerance: int = 16, max_diff_ratio: float = 0.001,
+                 hash_limit: int = 12):
+        self.baseline_dir = Path(baseline_dir)
+        self.output_dir = Path(output_dir)
+        self.update = update
+        self.pixel_tolerance = pixel_tolerance
+        self.max_diff_ratio = max_diff_ratio
+        self.hash_limit = hash_limit
+        self.results = []
+
+    # ===== Capture =====
+
+    def check(self, page, name: str, mask=(), full_page: bool = False) -> dict:
+        """Take a stable screenshot (animations off, masks painted) and compare it."""
+        start = time.perf_counter()
+        png = page.screenshot(
+            full_page=full_page,
+            mask=list(mask),
+            mask_color=MASK_COLOR,
+            animations="disabled",
+            caret="hide",
+        )
+        capture_ms = (time.perf_counter() - start) * 1000
+        browser = page.context.browser.browser_type.name if page.context.browser else "browser"
+        result = self.compare(f"{browser}/{name}", png)
+        result["capture_ms"] = round(capture_ms, 1)
+        return result
+
+    # ===== Comparison =====
+
+    def compare(self, key: str, png: bytes) -> dict:
+        """Compare PNG bytes with the baseline stored under key ("browser/name")."""
+        start = time.perf_counter()
+        baseline_png = self.baseline_dir / f"{key}.png"
+        meta_path = self.baseline_dir / f"{key}.json"
+        result = {"name": key, "status": "match", "path": "exact", "diff_ratio": 0.0, "hash_distance": 0}
+        sha1 = hashlib.sha1(png).hexdigest()
+
+        meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else None
+        if meta is None or self.update:
+            self._save_baseline(baseline_png, meta_path, png, sha1)
+            result["status"] = "updated" if meta else "new"
+            result["path"] = "baseline"
+        elif sha1 != meta["sha1"]:
+            if png_size(png) != (meta["width"], meta["height"]):
+                result["status"], result["path"] = "mismatch", "size"
+            else:
+                result["hash_distance"] = hash_distance(png_dhash(png), int(meta["dhash"], 16))
+                if result["hash_distance"] > self.hash_limit:
+                    result["status"], result["path"] = "mismatch", "hash"
+                else:
+                    result["path"] = "pixels"
+            if result["status"] == "mismatch":
+                # Decided without the pixel diff, which is only needed for the diff image
+                result["compare_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+            # Full decode and pixel diff: near-matches, or the diff image of a mismatch
+            actual = decode(png)
+            changed, ratio = pixel_diff(actual, decode(baseline_png.read_bytes()), self.pixel_tolerance)
+            result["diff_ratio"] = round(ratio, 6)
+            if result["path"] == "pixels" and ratio > self.max_diff_ratio:
+                result["status"] = "mismatch"
+            if result["status"] == "mismatch":
+                self._save_mismatch(key, png, diff_image(actual, changed))
+
+        result.setdefault("compare_ms", round((time.perf_counter() - start) * 1000, 3))
+        self.results.append(result)
+        logger.info("[VISUAL] %s: %s (%s, %.4f%% changed, %s ms)", key, result["status"], result["path"],
+                    result["diff_ratio"] * 100, result["compare_ms"])
+        return result
+
+    def _save_baseline(self, baseline_png: Path, meta_path: Path, png: bytes, sha1: str):
+        baseline_png.parent.mkdir(parents=True, exist_ok=True)
+        baseline_png.write_bytes(png)
+        pixels = decode(png)
+        meta_path.write_text(json.dumps({
+            "sha1": sha1,
+            "dhash": f"{dhash(pixels):016x}",
+            "width": int(pixels.shape[1]),
+            "height": int(pixels.shape[0]),
+        }), encoding="utf-8")
+
+    def _save_mismatch(self, key: str, png: bytes, diff_png: bytes):
+        target = self.output_dir / key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        Path(f"{target}-actual.png").write_bytes(png)
+        Path(f"{target}-diff.png").write_bytes(diff_png)
+
+    # ===== Stats =====
+
+    def stats(self) -> dict:
+        """Counts per status and average compare time per decision path."""
+        by_path = {}
+        for result in self.results:
+            by_path.setdefault(result["path"], []).append(result["compare_ms"])
+        return {
+            "checks": len(self.results),
+            "status": {status: sum(1 for r in self.results if r["status"] == status)
+                       for status in ("match", "mismatch", "new", "updated")},
+            "avg_compare_ms": {path: round(sum(times) / len(times), 3) for path, times in by_path.items()},
+            "results": self.results,
+        }
+
+    def write_stats(self, worker_id: str = "main") -> str:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stats = self.stats()
+        (self.output_dir / f"stats-{worker_id}.json").write_text(json.dumps(stats, indent=1), encoding="utf-8")
+        return (f"[VISUAL] {stats['checks']} checks, {stats['status']['mismatch']} mismatches, "
+                f"avg compare {stats['avg_compare_ms']} ms")
+
+
+# ========================================================================
+# BATCH RE-BASELINING
+# ========================================================================
+
+def accept(output_dir: str = "reports/visual", baseline_dir: str = "visual_baselines", pattern: str = "*") -> list:
+    """Make the actual screenshots of the last run's mismatches the new baselines."""
+    checker = VisualChecker(baseline_dir=baseline_dir, output_dir=output_dir, update=True)
+    accepted = []
+    for actual in sorted(Path(output_dir).glob(f"**/{pattern}-actual.png")):
+        key = actual.relative_to(output_dir).as_posix()[:-len("-actual.png")]
+        checker.compare(key, actual.read_bytes())
+        actual.unlink()
+        Path(str(actual).replace("-actual.png", "-diff.png")).unlink(missing_ok=True)
+        accepted.append(key)
+    return accepted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage visual regression baselines")
+    parser.add_argument("--accept", action="store_true", help="Accept the mismatches of the last run as baselines")
+    parser.add_argument("--pattern", default="*", help='Only these checks, e.g. "chromium/Home*"')
+    parser.add_argument("--output-dir", default="reports/visual")
+    parser.add_argument("--baseline-dir", default="visual_baselines")
+    parser.add_argument("--clear", action="store_true", help="Delete all baselines (next run takes new ones)")
+    args = parser.parse_args(argv)
+
+    if args.clear:
+        shutil.rmtree(args.baseline_dir, ignore_errors=True)
+        print(f"[OK] Deleted {args.baseline_dir}")
+    if args.accept:
+        accepted = accept(args.output_dir, args.baseline_dir, args.pattern)
+        print(f"[OK] {len(accepted)} baselines updated")
+        for key in accepted:
+            print(f"     {key}")
+
+
+if __name__ == "__main__":
+    main()